@@ -2,8 +2,11 @@ from abc import ABC, abstractmethod
 from backend.providers.factory import get_llm_provider
 
 class BaseAgent(ABC):
+    # set False on agents whose prompts must always reach the model
+    use_llm_cache: bool = True
+
     def __init__(self):
-        self.llm = get_llm_provider()
+        self.llm = get_llm_provider(cache=self.use_llm_cache)
 
     @abstractmethod
     def run(self, data: dict) -> dict:
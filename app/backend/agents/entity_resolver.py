@@ -1,17 +1,287 @@
 import json
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
 from .base_agent import BaseAgent
+from backend.config import settings
+from backend.utils.alias_store import AliasIndex, alias_store, dataset_pair_key
+from backend.utils.entity_matching import match_entities, normalize_names
+from backend.utils.json_stream import JSONArrayStream, stream_json_array
+from backend.utils.logger import logger
+from backend.utils.run_registry import run_registry
 
 class EntityResolverAgent(BaseAgent):
+    """
+    Resolves fuzzy entity names (counterparties, vendors, ...) between A and B.
+
+    `entities` lists the entity columns (A or B side names from the schema
+    mapping). Their values are matched locally: exact normalised keys, then
+    blocked TF-IDF / edit-distance similarity. Only pairs in the
+    low-confidence band are sent to the LLM, in small concurrent batches.
+    Entries that are not mapped columns fall back to the free-text prompt.
+
+    Names already resolved in earlier runs of the same dataset pair come
+    from the alias store; only unseen names go through matching, and their
+    results are written back.
+    """
+
     def run(self, data: dict) -> dict:
         entities = data.get("entities") or []
         if not entities:
             return {"pairs": []}
+
+        run_id = data.get("run_id")
+        columns = self._entity_columns(entities, data)
+        free_text = [e for e in entities if e not in {c for pair in columns for c in pair}]
+        alias_key = self._alias_key(data)
+
+        pairs: List[Dict[str, Any]] = []
+        stats: Dict[str, Any] = {}
+        partial = False
+
+        for a_col, b_col in columns:
+            left = data["data_a"][a_col]
+            known: List[Dict[str, Any]] = []
+            if alias_key:
+                try:
+                    index = alias_store.index(alias_key, a_col, b_col)
+                except Exception as e:
+                    logger.warning("EntityResolverAgent alias store read failed: %s", e)
+                    index = AliasIndex({})
+                known, left = self._from_aliases(index, left, a_col, b_col)
+
+            right = data["data_b"][b_col]
+            matched = match_entities(left, right)
+            accepted, col_stats = self._adjudicate(matched, a_col, b_col)
+            if alias_key:
+                self._remember(alias_key, a_col, b_col, left, accepted + [p for p in known if p["method"] == "alias_ngram"])
+            # stored aliases name one B spelling; list the others of this run too
+            known = self._with_variants(known, right)
+
+            pairs.extend(known)
+            pairs.extend(accepted)
+            col_stats["alias_hits"] = len(known)
+            col_stats["unseen"] = int(left.nunique())
+            stats[a_col] = col_stats
+            run_registry.update(run_id, pairs_received=len(pairs))
+
+        if free_text:
+            legacy = self._resolve_free_text(free_text, run_id)
+            pairs.extend(legacy["pairs"])
+            partial = legacy.get("partial", False)
+
+        return {"pairs": pairs, "stats": stats, "partial": partial, "alias_key": alias_key}
+
+    # -------------------------------------------------------
+    # Alias store
+    # -------------------------------------------------------
+    @staticmethod
+    def _alias_key(data: dict) -> Optional[str]:
+        if not settings.alias_store_enabled:
+            return None
+        if data.get("alias_key"):
+            return data["alias_key"]
+        if data.get("dataset_a") and data.get("dataset_b"):
+            return dataset_pair_key(data["dataset_a"], data["dataset_b"])
+        return None
+
+    @staticmethod
+    def _from_aliases(
+        index: AliasIndex, left: pd.Series, a_col: str, b_col: str
+    ) -> Tuple[List[Dict[str, Any]], pd.Series]:
+        """
+        (pairs from stored aliases, distinct left names still to resolve).
+        Exact normalised keys hit the hash map; otherwise a close trigram
+        neighbour of a resolved name lends its alias. Names stored as "no
+        match" are skipped until their entry expires.
+        """
+        values = pd.Series(left.dropna().unique(), dtype=object)
+        if values.empty or not index.by_key:
+            return [], values
+
+        known: List[Dict[str, Any]] = []
+        unseen = []
+        for value, key in zip(values, normalize_names(values)):
+            alias = index.get(key)
+            method, conf = "alias", None
+            if alias is None and key:
+                near = index.nearest(key, settings.alias_ngram_min_jaccard)
+                if near is not None:
+                    alias, j = near
+                    method, conf = "alias_ngram", alias.confidence * j
+            if alias is None:
+                unseen.append(value)
+                continue
+            if alias.right is None:
+                continue
+            known.append({
+                "left": value,
+                "right": alias.right,
+                "confidence": round(float(alias.confidence if conf is None else conf), 4),
+                "method": method,
+                "approved": alias.approved,
+                "a_col": a_col,
+                "b_col": b_col,
+            })
+        return known, pd.Series(unseen, dtype=object)
+
+    @staticmethod
+    def _with_variants(pairs: List[Dict[str, Any]], right: pd.Series) -> List[Dict[str, Any]]:
+        """pairs plus the same pair for every B value sharing the right name's normalised key."""
+        if not pairs:
+            return pairs
+        values = pd.Series(right.dropna().unique(), dtype=object)
+        by_key: Dict[str, List[Any]] = {}
+        for value, key in zip(values, normalize_names(values)):
+            if key:
+                by_key.setdefault(key, []).append(value)
+        keys = normalize_names(pd.Series([str(p["right"]) for p in pairs], dtype=object))
+        out: List[Dict[str, Any]] = []
+        for p, key in zip(pairs, keys):
+            out.append(p)
+            out.extend({**p, "right": v} for v in by_key.get(key, []) if str(v) != str(p["right"]))
+        return out
+
+    @staticmethod
+    def _remember(alias_key: str, a_col: str, b_col: str, resolved: pd.Series, accepted: List[Dict[str, Any]]) -> None:
+        """Write this run's outcome back; resolved names without a match are stored as negatives."""
+        # one alias per left name: any spelling of the entity finds the rest again
+        rows = list({
+            str(p["left"]): {"left": p["left"], "right": p["right"], "confidence": p["confidence"], "method": p["method"]}
+            for p in reversed(accepted)
+        }.values())
+        matched = {str(p["left"]) for p in accepted}
+        rows.extend(
+            {"left": v, "right": None, "confidence": 0.0, "method": "none"}
+            for v in resolved.dropna().unique()
+            if str(v) not in matched
+        )
+        try:
+            alias_store.upsert(alias_key, a_col, b_col, rows)
+        except Exception as e:  # the store is an optimisation; never fail the run on it
+            logger.warning("EntityResolverAgent alias store write failed: %s", e)
+
+    # -------------------------------------------------------
+    # Which entities are mapped columns
+    # -------------------------------------------------------
+    @staticmethod
+    def _entity_columns(entities: List[str], data: dict) -> List[Tuple[str, str]]:
+        df_a, df_b = data.get("data_a"), data.get("data_b")
+        if not isinstance(df_a, pd.DataFrame) or not isinstance(df_b, pd.DataFrame):
+            return []
+
+        matches = (data.get("schema_mapping") or {}).get("matches", [])
+        out: List[Tuple[str, str]] = []
+        for e in entities:
+            for m in matches:
+                a, b = m.get("a_col"), m.get("b_col")
+                if e in (a, b) and a in df_a.columns and b in df_b.columns:
+                    if (a, b) not in out:
+                        out.append((a, b))
+                    break
+        return out
+
+    # -------------------------------------------------------
+    # LLM adjudication of the low-confidence band
+    # -------------------------------------------------------
+    def _adjudicate(self, matched: pd.DataFrame, a_col: str, b_col: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        def pair(row, method: str, confidence: float) -> Dict[str, Any]:
+            return {
+                "left": row.left,
+                "right": row.right,
+                "confidence": round(float(confidence), 4),
+                "method": method,
+                "a_col": a_col,
+                "b_col": b_col,
+            }
+
+        sure = matched[matched["method"] != "review"]
+        review = matched[matched["method"] == "review"]
+        accepted = [pair(r, r.method, r.score) for r in sure.itertuples(index=False)]
+
+        # one question per (left name, right key); the verdict covers all B spellings of that key
+        review = review.assign(rkey=normalize_names(review["right"]))
+        to_ask = review.drop_duplicates(["left", "rkey"]).head(settings.entity_llm_max_pairs)
+        verdicts = self._ask_llm(list(zip(to_ask["left"], to_ask["right"]))) if len(to_ask) else {}
+        for i, (left, rkey) in enumerate(zip(to_ask["left"], to_ask["rkey"])):
+            conf = verdicts.get(i)
+            if conf is not None and conf >= settings.entity_llm_min_confidence:
+                same = review[(review["left"] == left) & (review["rkey"] == rkey)]
+                accepted.extend(pair(r, "llm", conf) for r in same.itertuples(index=False))
+
+        def names(method: str) -> int:
+            return int(matched.loc[matched["method"] == method, "left"].nunique())
+
+        stats = {
+            "exact": names("exact"),
+            "similarity": names("similarity"),
+            "review": names("review"),
+            "llm_checked": int(len(to_ask)),
+            "llm_accepted": len({str(p["left"]) for p in accepted if p["method"] == "llm"}),
+        }
+        return accepted, stats
+
+    def _ask_llm(self, pairs: List[Tuple[Any, Any]]) -> Dict[int, float]:
+        """
+        {pair index: confidence} for pairs the LLM judged to be the same entity.
+        """
+        size = max(1, settings.entity_llm_batch)
+        batches = [list(range(i, min(i + size, len(pairs)))) for i in range(0, len(pairs), size)]
+        prompts = []
+        for idx in batches:
+            lines = "\n".join(f"{i}: {json.dumps(str(pairs[i][0]))} vs {json.dumps(str(pairs[i][1]))}" for i in idx)
+            prompts.append(
+                "Decide whether each numbered pair of names refers to the same real-world entity.\n"
+                f"{lines}\n\n"
+                "Return ONLY a JSON array like:\n"
+                '[{"id": 0, "same": true, "confidence": 0.0}, ...]'
+            )
+
+        out: Dict[int, float] = {}
+        for idx, raw in zip(batches, self.llm.chat_many(prompts, limit=settings.mapper_llm_parallelism)):
+            if isinstance(raw, Exception):
+                logger.error("EntityResolverAgent LLM error: %s", raw)
+                continue
+            allowed = set(idx)
+            for v in JSONArrayStream().feed(raw or ""):
+                try:
+                    i = int(v["id"])
+                    if i in allowed and v.get("same"):
+                        out[i] = float(v.get("confidence", 0.0))
+                except (KeyError, TypeError, ValueError):
+                    continue
+        return out
+
+    # -------------------------------------------------------
+    # Free-text entity lists (legacy single prompt)
+    # -------------------------------------------------------
+    def _resolve_free_text(self, entities: List[str], run_id: Optional[str]) -> dict:
         prompt = f"""Resolve fuzzy textual entity names across two systems.
 Return JSON: {{"pairs":[{{"left":"","right":"","confidence":0.0}}]}}.
 Entities: {json.dumps(entities)}
 """
-        raw = self.llm.chat(prompt)
-        try:
-            return json.loads(raw)
-        except Exception:
-            return {"pairs": []}
+        if not settings.llm_streaming:
+            raw = self.llm.chat(prompt)
+            try:
+                return json.loads(raw)
+            except Exception:
+                return {"pairs": []}
+
+        # pairs are parsed as they stream in; a slow completion is cut off
+        # at the deadline and what arrived so far is still used
+        pairs = []
+
+        def on_pair(p):
+            if isinstance(p, dict):
+                pairs.append(p)
+                run_registry.update(run_id, pairs_received=len(pairs))
+
+        res = stream_json_array(
+            self.llm.stream(prompt),
+            deadline_s=settings.llm_stream_deadline_s,
+            on_item=on_pair,
+        )
+        if res.error is not None:
+            logger.error("EntityResolverAgent LLM error: %s", res.error)
+        return {"pairs": pairs, "partial": not res.complete}
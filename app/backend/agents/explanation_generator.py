@@ -1,99 +1,83 @@
 import json
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
 
 from .base_agent import BaseAgent
-from backend.connectors.bigquery_connector import BigQueryConnector
+from backend.config import settings
+from backend.utils.diagnostics import diagnose, render_findings
+from backend.utils.logger import logger
 
 
 class ExplanationGeneratorAgent(BaseAgent):
     """
     ExplanationGeneratorAgent
 
-    Backward-compatible with the existing orchestrator, but enhanced to:
-      - Execute the generated reconciliation SQL in BigQuery
-      - Return the full result rows (list[dict]) in 'result'
-      - Update 'bq_status' with a simple status string
-      - Provide a compact 'summary' object for debugging / logging
+    Explains the mismatch rows already fetched by node_exec; it does not run
+    SQL. The explanation is built from deterministic diagnostics (offsets,
+    rounding, sign flips, unit scaling, timezone shifts, key clusters). The
+    LLM is only asked to reword those findings, and only when requested.
 
     Inputs (from node_explain or equivalent):
       data: {
-        "sql": str | None,
+        "result_df": pd.DataFrame | None,   # rows returned by node_exec
+        "pairs": [(a_col, b_col), ...],     # mapped column pairs
+        "key_cols": [a_col, ...],           # join key columns (A side)
         "bq_status": str | None,
-        "extra": dict (optional, any metadata you pass along)
+        "phrase": bool (optional, default settings.explain_llm_phrasing)
       }
 
     Outputs (merged into ReconState by the graph):
       {
         "explanation": str,     # used by node_explain and UI
+        "diagnostics": dict,    # {"rows", "sampled", "findings": [...]}
         "summary": dict,        # node_explain can fall back to this if needed
-        "bq_status": str,       # ReconState.bq_status
-        "result": list[dict],   # ReconState.result (JSON-serialisable rows)
       }
     """
 
     def run(self, data: dict) -> dict:
-        # ------ 1) Extract inputs safely ------
-        sql: str = (data.get("sql") or "").strip()
-        previous_bq_status: Optional[str] = data.get("bq_status")
-        extra: Dict[str, Any] = data.get("extra") or {}
+        df: Optional[pd.DataFrame] = data.get("result_df")
+        pairs: List[Tuple[str, str]] = [tuple(p) for p in data.get("pairs") or []]
 
-        rows: List[Dict[str, Any]] = []
-        bq_status: Optional[str] = previous_bq_status
+        diag = diagnose(df, pairs, data.get("key_cols"))
+        explanation = render_findings(diag)
 
-        # ------ 2) Execute the SQL in BigQuery, if present ------
-        if sql:
+        phrase = data.get("phrase", settings.explain_llm_phrasing)
+        if phrase and diag["findings"]:
             try:
-                bq = BigQueryConnector()
-
-                # Your connector implements:
-                #   def run_query(self, query: str) -> pd.DataFrame
-                df = bq.run_query(sql)
-
-                if df is not None:
-                    rows = df.to_dict(orient="records")
-
-                bq_status = f"OK: {len(rows)} row(s)"
+                explanation = self.phrase(diag)
             except Exception as e:
-                # Do not raise – we still want to return an explanation and payload
-                bq_status = f"ERROR: {str(e)}"
-                extra["bq_error"] = str(e)
-        else:
-            # No SQL provided at all
-            if not bq_status:
-                bq_status = "NO_SQL"
+                logger.error("ExplanationGeneratorAgent LLM error: %s", e)
 
-        # ------ 3) Build a compact summary (for logging / LLM context) ------
-        summary: Dict[str, Any] = {
-            # Shortened SQL preview to avoid over-long prompts
-            "sql_preview": sql[:400],
-            "row_count": len(rows),
-            "bq_status": bq_status,
+        return {
+            "explanation": explanation,
+            "diagnostics": diag,
+            "summary": {
+                "row_count": diag["rows"],
+                "bq_status": data.get("bq_status"),
+                "findings": len(diag["findings"]),
+            },
         }
 
-        # ------ 4) Ask the LLM for a human-readable explanation ------
-        prompt = f"""You are a reconciliation analyst.
-Given the job summary, explain likely causes of mismatches and remediation steps.
-Write 4–6 short bullet points.
-
-Summary: {json.dumps(summary, default=str)}
+    # -------------------------------------------------------
+    # Optional LLM wording of the findings
+    # -------------------------------------------------------
+    @staticmethod
+    def _phrase_prompt(diag: Dict[str, Any]) -> str:
+        findings = [
+            {k: f[k] for k in ("kind", "a_col", "b_col", "rows", "share", "detail")}
+            for f in diag["findings"][: 2 * settings.diagnostics_top_n]
+        ]
+        return f"""You are a reconciliation analyst.
+The findings below were computed from {diag['rows']} mismatched rows. Explain them
+as 4-6 short bullet points with a likely cause and a remediation for each.
+Do not invent findings that are not listed.
+
+Findings: {json.dumps(findings, default=str)}
 """
-        explanation_text = self.llm.chat(prompt)
 
-        # ------ 5) Return fields that the orchestrator already understands ------
-        # node_explain does:
-        #   state.explanation = eg_result.get("explanation") or eg_result.get("summary") or ...
-        #
-        # ReconState has:
-        #   bq_status: str | None
-        #   result: Any | None
-        #
-        # LangGraph merges this dict into the state, so no ReconState changes are required.
-        return {
-            "explanation": explanation_text,
-            "summary": summary,
-            "bq_status": bq_status,
-            "result": rows,
-        }
+    def phrase(self, diag: Dict[str, Any]) -> str:
+        return self.llm.chat(self._phrase_prompt(diag))
 
     # Some graph setups call agents as callables; keep this for safety.
     def __call__(self, data: dict) -> dict:
@@ -5,6 +5,9 @@ from __future__ import annotations
 from typing import Any, Dict, List, Tuple
 
 from .base_agent import BaseAgent
+from backend.utils.column_profile import TableProfile
+from backend.utils.join_keys import rank_join_keys
+from backend.utils.logger import logger
 from backend.utils.sql_templates import basic_reconciliation_sql
 
 
@@ -27,6 +30,9 @@ class QuerySynthesizerAgent(BaseAgent):
             "table_b": "project.dataset.table_b",
             "columns_a": [...],   # list[str] from df_a.columns
             "columns_b": [...],   # list[str] from df_b.columns
+            "profile_a": TableProfile | None,   # optional, from the profile stage
+            "profile_b": TableProfile | None,
+            "crosswalks": {(a_col, b_col): "<relation>"},  # optional entity aliases
           }
         """
 
@@ -44,20 +50,53 @@ class QuerySynthesizerAgent(BaseAgent):
         array_cols: List[str] = mapping.get("array_cols", []) or []
         string_cols: List[str] = mapping.get("string_cols", []) or []
 
+        profile_a: TableProfile | None = data.get("profile_a")
+        profile_b: TableProfile | None = data.get("profile_b")
+
+        # Mapping without type lists (e.g. hand-written): fall back to A's profile
+        if profile_a and not (numeric_cols or array_cols or string_cols):
+            numeric_cols = profile_a.cols_of_kind("numeric")
+            array_cols = profile_a.cols_of_kind("array")
+            string_cols = profile_a.cols_of_kind("string")
+
         # ------------------------------------------------------------------
         # 1) Build candidate join pairs from matches
+        #    Data-driven: rank by uniqueness + A/B value overlap from profiles.
+        #    Name heuristic only when no profiles are available.
         # ------------------------------------------------------------------
         join_candidates: List[Tuple[str, str]] = []
+        join_keys: Dict[str, Any] = {"method": "name_heuristic"}
+
+        if profile_a is not None and profile_b is not None:
+            ranked = rank_join_keys(matches, profile_a, profile_b)
+            if ranked and ranked[0].score > 0:
+                best = ranked[0]
+                join_candidates = list(best.pairs)
+                join_keys = {
+                    "method": "profile",
+                    "chosen": best.to_dict(),
+                    "candidates": [c.to_dict() for c in ranked[:5]],
+                }
+                logger.info(
+                    "QuerySynthesizerAgent: join key %s (score=%.3f, est_fanout=%.2f)",
+                    best.pairs, best.score, best.est_fanout,
+                )
+                if best.est_fanout > 10:
+                    logger.warning(
+                        "QuerySynthesizerAgent: join key %s fans out ~%.1fx; expect a large result",
+                        best.pairs, best.est_fanout,
+                    )
 
-        for m in matches:
-            a = m.get("a_col")
-            b = m.get("b_col")
-            if not a or not b:
-                continue
+        if not join_candidates:
+            for m in matches:
+                a = m.get("a_col")
+                b = m.get("b_col")
+                if not a or not b:
+                    continue
 
-            # Heuristic: consider it a join key if either side looks like an id
-            if "id" in a.lower() or "id" in b.lower():
-                join_candidates.append((a, b))
+                # Heuristic: consider it a join key if either side looks like an id
+                if "id" in a.lower() or "id" in b.lower():
+                    join_candidates.append((a, b))
 
         # Fallback: first matched pair if no obvious ID-like columns
         if not join_candidates and matches:
@@ -108,12 +147,28 @@ class QuerySynthesizerAgent(BaseAgent):
                 continue
 
             if a in numeric_set:
-                numeric_pairs.append((a, b))
+                # B side profiled as non-numeric (e.g. amounts stored as text):
+                # ABS(a - b) would fail in BigQuery, compare as strings instead
+                b_kind = profile_b.kind_of(b) if profile_b else None
+                if b_kind is not None and b_kind != "numeric":
+                    logger.info(
+                        "QuerySynthesizerAgent: %s is numeric but %s is %s; comparing as string",
+                        a, b, b_kind,
+                    )
+                    string_pairs.append((a, b))
+                else:
+                    numeric_pairs.append((a, b))
             elif a in array_set:
                 array_pairs.append((a, b))
             elif a in string_set:
                 string_pairs.append((a, b))
 
+        # Entity crosswalks only matter where A values are joined or compared as text
+        usable = set(valid_join_pairs) | set(string_pairs)
+        crosswalks = {
+            pair: rel for pair, rel in (data.get("crosswalks") or {}).items() if tuple(pair) in usable
+        }
+
         # ------------------------------------------------------------------
         # 3) Build SQL using valid join pairs and metric pairs
         # ------------------------------------------------------------------
@@ -125,6 +180,10 @@ class QuerySynthesizerAgent(BaseAgent):
             thresholds=thresholds,
             array_pairs=array_pairs,
             string_pairs=string_pairs,
+            crosswalks=crosswalks,
         )
 
-        return {"sql": sql}
+        if "chosen" not in join_keys:
+            join_keys["chosen"] = {"pairs": [{"a_col": a, "b_col": b} for a, b in valid_join_pairs]}
+
+        return {"sql": sql, "join_keys": join_keys}
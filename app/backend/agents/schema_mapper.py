@@ -3,41 +3,30 @@
 from __future__ import annotations
 
 from .base_agent import BaseAgent
-from backend.utils.similarity import name_similarity
-from backend.utils.similarity import normalize
-from backend.providers.factory import get_llm_provider
+from backend.utils.similarity_matrix import name_similarity_matrix
 
 import json
-import re
-from typing import Any, Dict, List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 from backend.providers.factory import get_llm_provider
+from backend.config import settings
+from backend.utils.assignment import max_weight_assignment
+from backend.utils.async_utils import with_context
+from backend.utils.column_profile import TableProfile, profile_dataframe
+from backend.utils.json_stream import stream_json_array
 from backend.utils.logger import logger
+from backend.utils.mapping_cache import ORIGIN_MAPPER, mapping_cache, mapping_fingerprint
+from backend.utils.run_registry import run_registry
+from backend.utils.value_matching import value_match_scores
 
 LLM_THRESHOLD = 0.65      # Used for deterministic fallback
 FINAL_MATCH_THRESHOLD = 0.55  # LLM confidence cutoff
 
-def _tokenize(name: str) -> set[str]:
-    # Split on non-alphanumeric, lowercase, drop empties
-    tokens = re.split(r"[^a-z0-9]+", name.lower())
-    return {t for t in tokens if t}
-
-
-def _name_similarity(a: str, b: str) -> float:
-    """
-    Very simple Jaccard-like similarity on name tokens.
-    Returns value in [0, 1].
-    """
-    ta = _tokenize(a)
-    tb = _tokenize(b)
-    if not ta or not tb:
-        return 0.0
-    inter = len(ta & tb)
-    union = len(ta | tb)
-    return inter / union
-
 class SchemaMapperAgent(BaseAgent):
     """
     Hybrid schema mapper:
@@ -49,7 +38,7 @@ class SchemaMapperAgent(BaseAgent):
     def __init__(self):
         super().__init__()
         # use the provider factory – this stays extensible (openai / gemini / mock)
-        self.llm = get_llm_provider()
+        self.llm = get_llm_provider(cache=self.use_llm_cache)
 
     def run(self, data: Dict[str, Any]) -> Dict[str, Any]:
         # Support both df_a/df_b and data_a/data_b
@@ -74,105 +63,70 @@ class SchemaMapperAgent(BaseAgent):
         cols_a = df_a.columns.tolist()
         cols_b = df_b.columns.tolist()
 
-        # classify A-side types
-        numeric_a = set(df_a.select_dtypes(include=["number"]).columns.tolist())
-        array_a = {
-            c
-            for c in df_a.select_dtypes(include=["object"]).columns
-            if df_a[c].apply(lambda x: isinstance(x, list)).any()
-        }
-        string_a = set(df_a.select_dtypes(include=["object"]).columns.tolist()) - array_a
+        # Column profiles (from the graph's profile stage when available)
+        profile_a: TableProfile = data.get("profile_a") or profile_dataframe(df_a)
+        profile_b: TableProfile = data.get("profile_b") or profile_dataframe(df_b)
 
-        # -------------------------------------------------------
-        # 1) Ask LLM for semantic mapping suggestions
-        # -------------------------------------------------------
-        llm_prompt = (
-            "You are a schema alignment expert.\n"
-            "Given two column lists, produce the closest matching pairs.\n\n"
-            f"Columns A: {cols_a}\n"
-            f"Columns B: {cols_b}\n"
-            "Return ONLY a JSON array of objects like:\n"
-            '[{\"a\": \"colA\", \"b\": \"colB\", \"confidence\": 0.0 }, ...]'
-        )
+        # classify A-side types from the profile (sampled, vectorised)
+        numeric_a = set(profile_a.cols_of_kind("numeric"))
+        array_a = set(profile_a.cols_of_kind("array"))
+        string_a = set(profile_a.cols_of_kind("string"))
 
-        try:
-            raw_text = self.llm.chat(llm_prompt)
-        except Exception as e:
-            logger.error("SchemaMapperAgent LLM error: %s", e, exc_info=True)
-            raw_text = ""
-
-        llm_pairs = self._safe_extract_llm_pairs(raw_text)
-
-        # index LLM suggestions (kept for any other usage)
-        llm_map = {(p["a"], p["b"]): p["confidence"] for p in llm_pairs}
+        strategy = (data.get("match_strategy") or settings.schema_match_strategy).lower()
+        if strategy != "greedy":
+            strategy = "assignment"
 
         # -------------------------------------------------------
-        # 2) Deterministic fallback matching (thresholded)
+        # 0) Mapping cache: recurring source pairs skip the LLM entirely
         # -------------------------------------------------------
-        det_candidates: List[Dict[str, Any]] = []
-        for a_col in cols_a:
-            best_b = None
-            best_score = 0.0
-            for b_col in cols_b:
-                s = name_similarity(a_col, b_col)
-                if s > best_score:
-                    best_b = b_col
-                    best_score = s
-
-            if best_b and best_score >= LLM_THRESHOLD:
-                det_candidates.append({
-                    "a": a_col,
-                    "b": best_b,
-                    "confidence": best_score,
-                })
+        use_cache = settings.mapping_cache_enabled and data.get("use_mapping_cache", True)
+        cache_key = mapping_fingerprint(profile_a, profile_b, strategy)
+        if use_cache:
+            try:
+                hit = mapping_cache.get(cache_key)
+            except Exception as e:
+                logger.error("SchemaMapperAgent mapping cache error: %s", e)
+                hit = None
+            if hit is not None:
+                logger.info("SchemaMapperAgent: mapping cache hit (%s)", hit["origin"])
+                return {
+                    **hit["mapping"],
+                    "provenance": {
+                        "source": "cache",
+                        "origin": hit["origin"],
+                        "cached_at": hit["created_at"],
+                        "hits": hit["hits"],
+                        "key": cache_key,
+                    },
+                }
 
         # -------------------------------------------------------
-        # 3) Merge LLM + deterministic
+        # 1) Deterministic scores
+        #    One |A| x |B| matrix (name similarity fused with content
+        #    evidence) feeds blocking and both strategies below.
         # -------------------------------------------------------
-        final_pairs: List[Dict[str, Any]] = []
-
-        for a_col in cols_a:
-            # LLM match?
-            llm_match = [p for p in llm_pairs if p["a"] == a_col]
-            if llm_match:
-                best = max(llm_match, key=lambda x: x["confidence"])
-                if best["confidence"] >= FINAL_MATCH_THRESHOLD:
-                    final_pairs.append(best)
-                    continue  # skip fallback
-
-            # deterministic fallback
-            det_match = [p for p in det_candidates if p["a"] == a_col]
-            if det_match:
-                final_pairs.append(det_match[0])
+        value_scores = value_match_scores(profile_a, profile_b, cols_a, cols_b)
+        scores = self._score_matrix(cols_a, cols_b, value_scores)
 
         # -------------------------------------------------------
-        # 3b) NEW: ensure every A column gets *some* match
-        #      (without breaking existing LLM + threshold behaviour)
+        # 2) Ask LLM only about ambiguous A columns, each with its own
+        #    short list of B candidates, in small parallel prompts
         # -------------------------------------------------------
-        final_by_a: dict[str, Dict[str, Any]] = {p["a"]: p for p in final_pairs}
-
-        for a_col in cols_a:
-            if a_col in final_by_a:
-                continue  # already matched via LLM/thresholded deterministic
+        blocks = self._ambiguous_blocks(cols_a, cols_b, scores)
+        llm_pairs = self._llm_pairs_for_blocks(blocks, run_id=data.get("run_id"))
 
-            # best similarity match on B for this A
-            best_b = None
-            best_score = 0.0
-            for b_col in cols_b:
-                s = name_similarity(a_col, b_col)
-                if s > best_score:
-                    best_b = b_col
-                    best_score = s
-
-            if best_b and best_score > 0.0:
-                final_by_a[a_col] = {
-                    "a": a_col,
-                    "b": best_b,
-                    "confidence": float(best_score),
-                }
+        # index LLM suggestions (used by the assignment strategy)
+        llm_map = {(p["a"], p["b"]): p["confidence"] for p in llm_pairs}
 
-        # Replace final_pairs with the enriched mapping
-        final_pairs = list(final_by_a.values())
+        # -------------------------------------------------------
+        # 3) Combine with LLM suggestions
+        #    "assignment": global one-to-one matching (default)
+        #    "greedy":     best B per A column independently
+        # -------------------------------------------------------
+        if strategy == "greedy":
+            final_pairs = self._greedy_pairs(cols_a, cols_b, scores, llm_pairs)
+        else:
+            final_pairs = self._assigned_pairs(cols_a, cols_b, scores, llm_map)
 
         # -------------------------------------------------------
         # 4) Classify final pairs (numeric / array / string)
@@ -199,40 +153,299 @@ class SchemaMapperAgent(BaseAgent):
             else:
                 t = "string"
 
-            matches.append({
+            match = {
                 "a_col": a,
                 "b_col": b,
                 "confidence": conf,
                 "type": t,
-            })
+            }
+            if "gap" in p:
+                match["gap"] = p["gap"]
+            matches.append(match)
 
-        return {
+        mapping = {
             "matches": matches,
             "numeric_cols": sorted(set(numeric_cols)),
             "array_cols": sorted(set(array_cols)),
             "string_cols": sorted(set(string_cols)),
+            "strategy": strategy,
+            "llm_columns": len(blocks),
         }
 
+        if use_cache:
+            try:
+                mapping_cache.put(cache_key, mapping, origin=ORIGIN_MAPPER)
+            except Exception as e:
+                logger.error("SchemaMapperAgent mapping cache error: %s", e)
+
+        mapping["provenance"] = {"source": "computed", "origin": ORIGIN_MAPPER, "key": cache_key}
+        return mapping
+
+    # -------------------------------------------------------
+    # Blocking: which A columns need the LLM, and against which B columns
+    # -------------------------------------------------------
+    def _ambiguous_blocks(
+        self,
+        cols_a: List[str],
+        cols_b: List[str],
+        scores: np.ndarray,
+    ) -> Dict[str, List[str]]:
+        """
+        {a_col: [top-k B candidates]} for A columns whose best deterministic
+        score is weak, or too close to the runner-up to call. Confident
+        columns never reach the LLM.
+        """
+        if not cols_a or not cols_b:
+            return {}
+
+        k = min(settings.mapper_llm_candidates, len(cols_b))
+        cand = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        cand_s = np.take_along_axis(scores, cand, axis=1)
+        order = np.argsort(-cand_s, axis=1)
+        cand = np.take_along_axis(cand, order, axis=1)
+        cand_s = np.take_along_axis(cand_s, order, axis=1)
+
+        best = cand_s[:, 0]
+        second = cand_s[:, 1] if k > 1 else np.zeros(len(cols_a))
+        ambiguous = (best < settings.mapper_confident_score) | (best - second < settings.mapper_ambiguity_margin)
+
+        return {
+            cols_a[i]: [cols_b[j] for j in cand[i]]
+            for i in np.flatnonzero(ambiguous)
+        }
+
+    def _llm_pairs_for_blocks(
+        self,
+        blocks: Dict[str, List[str]],
+        run_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        One prompt per chunk of ambiguous A columns, sent concurrently.
+        With llm_streaming, pairs are parsed as they arrive and a chunk that
+        overruns llm_stream_deadline_s keeps what it received so far.
+        Suggestions outside a column's candidate list are discarded.
+        """
+        if not blocks:
+            return []
+
+        items = list(blocks.items())
+        size = max(1, settings.mapper_llm_chunk_cols)
+        chunks = [dict(items[i:i + size]) for i in range(0, len(items), size)]
+        prompts = [self._chunk_prompt(chunk) for chunk in chunks]
+
+        run_registry.update(run_id, chunks_total=len(chunks), chunks_done=0, pairs_received=0)
+
+        if settings.llm_streaming:
+            results = self._stream_chunks(prompts, run_id)
+        else:
+            results = [
+                raw if isinstance(raw, Exception) else self._safe_extract_llm_pairs(raw)
+                for raw in self.llm.chat_many(prompts, limit=settings.mapper_llm_parallelism)
+            ]
+
+        merged: List[Dict[str, Any]] = []
+        for chunk, pairs in zip(chunks, results):
+            if isinstance(pairs, Exception):
+                logger.error("SchemaMapperAgent LLM error: %s", pairs)
+                continue
+            for p in pairs:
+                if p["b"] in chunk.get(p["a"], ()):
+                    merged.append(p)
+        return merged
+
+    def _stream_chunks(self, prompts: List[str], run_id: Optional[str]) -> List[Any]:
+        counters = {"chunks_done": 0, "pairs_received": 0, "partial_chunks": 0}
+        lock = threading.Lock()
+
+        def on_item(_item: Any) -> None:
+            with lock:
+                counters["pairs_received"] += 1
+                run_registry.update(run_id, pairs_received=counters["pairs_received"])
+
+        def one(prompt: str) -> Any:
+            res = stream_json_array(
+                self.llm.stream(prompt),
+                deadline_s=settings.llm_stream_deadline_s,
+                on_item=on_item,
+            )
+            with lock:
+                counters["chunks_done"] += 1
+                if not res.complete:
+                    counters["partial_chunks"] += 1
+                run_registry.update(run_id, **counters)
+            if res.error is not None and not res.items:
+                return res.error
+            if not res.complete:
+                logger.warning(
+                    "SchemaMapperAgent: LLM chunk cut off after %.0fs, keeping %d pair(s)",
+                    settings.llm_stream_deadline_s, len(res.items),
+                )
+            return self._clean_pairs(res.items)
+
+        with ThreadPoolExecutor(max_workers=max(1, settings.mapper_llm_parallelism)) as pool:
+            return list(pool.map(with_context(one), prompts))
+
+    @staticmethod
+    def _chunk_prompt(chunk: Dict[str, List[str]]) -> str:
+        lines = "\n".join(f"- {a}: {cands}" for a, cands in chunk.items())
+        return (
+            "You are a schema alignment expert.\n"
+            "For each column of table A below, pick the closest matching column of table B "
+            "from its candidate list, or skip it if none matches.\n\n"
+            f"A column: [B candidates]\n{lines}\n\n"
+            "Return ONLY a JSON array of objects like:\n"
+            '[{\"a\": \"colA\", \"b\": \"colB\", \"confidence\": 0.0 }, ...]'
+        )
+
+    # -------------------------------------------------------
+    # Greedy: best B per A column, independently (legacy mode)
+    # -------------------------------------------------------
+    def _greedy_pairs(
+        self,
+        cols_a: List[str],
+        cols_b: List[str],
+        scores: np.ndarray,
+        llm_pairs: List[Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        idx_b = {c: j for j, c in enumerate(cols_b)}
+
+        best_j = scores.argmax(axis=1) if cols_b else np.zeros(len(cols_a), dtype=np.int64)
+        best_s = scores[np.arange(len(cols_a)), best_j] if cols_b else np.zeros(len(cols_a))
+
+        det_candidates: List[Dict[str, Any]] = []
+        for i, a_col in enumerate(cols_a):
+            if cols_b and best_s[i] >= LLM_THRESHOLD:
+                det_candidates.append({
+                    "a": a_col,
+                    "b": cols_b[best_j[i]],
+                    "confidence": float(best_s[i]),
+                })
+
+        # Merge LLM + deterministic
+        final_pairs: List[Dict[str, Any]] = []
+
+        for i, a_col in enumerate(cols_a):
+            # LLM match?
+            llm_match = [p for p in llm_pairs if p["a"] == a_col]
+            if llm_match:
+                best = max(llm_match, key=lambda x: x["confidence"])
+                if best["confidence"] >= FINAL_MATCH_THRESHOLD:
+                    # content evidence can only raise the LLM's confidence
+                    j = idx_b.get(best["b"])
+                    if j is not None:
+                        best = {**best, "confidence": max(best["confidence"], float(scores[i, j]))}
+                    final_pairs.append(best)
+                    continue  # skip fallback
+
+            # deterministic fallback
+            det_match = [p for p in det_candidates if p["a"] == a_col]
+            if det_match:
+                final_pairs.append(det_match[0])
+
+        # Ensure every A column gets *some* match
+        # (without breaking existing LLM + threshold behaviour)
+        final_by_a: dict[str, Dict[str, Any]] = {p["a"]: p for p in final_pairs}
+
+        for i, a_col in enumerate(cols_a):
+            if a_col in final_by_a:
+                continue  # already matched via LLM/thresholded deterministic
+
+            # best similarity match on B for this A (same matrix row)
+            if cols_b and best_s[i] > 0.0:
+                final_by_a[a_col] = {
+                    "a": a_col,
+                    "b": cols_b[best_j[i]],
+                    "confidence": float(best_s[i]),
+                }
+
+        return list(final_by_a.values())
+
+    # -------------------------------------------------------
+    # Global one-to-one assignment over the combined matrix
+    # -------------------------------------------------------
+    def _assigned_pairs(
+        self,
+        cols_a: List[str],
+        cols_b: List[str],
+        scores: np.ndarray,
+        llm_map: Dict[tuple, float],
+    ) -> List[Dict[str, Any]]:
+        """
+        Maximum-weight bipartite matching over name + value + LLM scores, so
+        no B column is claimed by two A columns. Each pair reports its
+        confidence gap to the best competing alternative.
+        """
+        combined = scores.copy()
+        idx_a = {c: i for i, c in enumerate(cols_a)}
+        idx_b = {c: j for j, c in enumerate(cols_b)}
+        for (a, b), conf in llm_map.items():
+            i, j = idx_a.get(a), idx_b.get(b)
+            if i is not None and j is not None and conf >= FINAL_MATCH_THRESHOLD:
+                combined[i, j] = max(combined[i, j], conf)
+
+        return [
+            {
+                "a": cols_a[m.i],
+                "b": cols_b[m.j],
+                "confidence": m.weight,
+                "gap": round(m.gap, 6),
+            }
+            for m in max_weight_assignment(combined)
+        ]
+
+    # -------------------------------------------------------
+    # Helper: fused deterministic score matrix
+    # -------------------------------------------------------
+    def _score_matrix(
+        self,
+        cols_a: List[str],
+        cols_b: List[str],
+        value_scores: Dict[tuple, float],
+    ) -> np.ndarray:
+        """
+        |A| x |B| matrix: name similarity, raised by content evidence where the
+        value matcher proposed the pair (max(name, w*value + (1-w)*name)).
+        """
+        scores = np.array(name_similarity_matrix(cols_a, cols_b), dtype=np.float64)
+        if not value_scores:
+            return scores
+
+        idx_a = {c: i for i, c in enumerate(cols_a)}
+        idx_b = {c: j for j, c in enumerate(cols_b)}
+        w = settings.value_match_weight
+        for (a, b), v in value_scores.items():
+            i, j = idx_a.get(a), idx_b.get(b)
+            if i is None or j is None:
+                continue
+            name_s = scores[i, j]
+            scores[i, j] = max(name_s, w * v + (1.0 - w) * name_s)
+        return scores
+
     # -------------------------------------------------------
     # Helper: parse JSON from LLM safely
     # -------------------------------------------------------
     def _safe_extract_llm_pairs(self, content: str) -> List[Dict[str, Any]]:
-        import json
-
         try:
             parsed = json.loads(content)
             if isinstance(parsed, list):
-                # ensure proper shape
-                cleaned = []
-                for p in parsed:
-                    if "a" in p and "b" in p:
-                        cleaned.append({
-                            "a": p["a"],
-                            "b": p["b"],
-                            "confidence": float(p.get("confidence", 0.0))
-                        })
-                return cleaned
+                return self._clean_pairs(parsed)
         except Exception:
             pass
 
         return []  # fallback
+
+    @staticmethod
+    def _clean_pairs(parsed: List[Any]) -> List[Dict[str, Any]]:
+        # ensure proper shape
+        cleaned = []
+        for p in parsed:
+            try:
+                if "a" in p and "b" in p:
+                    cleaned.append({
+                        "a": p["a"],
+                        "b": p["b"],
+                        "confidence": float(p.get("confidence", 0.0))
+                    })
+            except (TypeError, ValueError):
+                continue
+        return cleaned
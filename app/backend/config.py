@@ -17,8 +17,118 @@ class Settings(BaseSettings):
     vertex_location: str = "us-central1"
     gemini_model: str = "gemini-1.5-pro"
 
+    # LLM calls: timeouts, retries, process-wide concurrency cap
+    llm_timeout_s: float = 60.0
+    llm_connect_timeout_s: float = 10.0
+    llm_max_retries: int = 3
+    llm_retry_base_delay_s: float = 0.5
+    llm_retry_max_delay_s: float = 8.0
+    llm_max_concurrency: int = 8
+    llm_queue_timeout_s: float = 120.0        # max wait for a free slot
+    llm_http_max_connections: int = 20
+    llm_streaming: bool = True                # parse JSON arrays as they stream in
+    llm_stream_deadline_s: float = 90.0       # keep partial results after this
+
     BQ_STAGING_DATASET: str = "recon_staging"  # set via env var in Cloud Run
 
+    # Column profiling (schema mapping / join keys / SQL synthesis)
+    profile_sample_rows: int = 100_000
+    profile_batch_rows: int = 25_000
+    profile_hll_precision: int = 12
+    profile_minhash_bins: int = 128
+    profile_cache_size: int = 32
+    profile_cache_ttl_s: int = 900
+
+    # Join-key discovery
+    join_key_top_singles: int = 6          # singles considered for composite keys
+    join_key_composite_below: float = 0.98  # try composites when best uniqueness is lower
+
+    # Value-based (content) column matching
+    value_match_lsh_bands: int = 32           # 128 MinHash bins -> 32 bands x 4 rows
+    value_match_bucket_cap: int = 250_000     # max A x B pairs drawn from one bucket
+    value_match_distribution_weight: float = 0.8
+    value_match_min_score: float = 0.3
+    value_match_top_k: int = 5                # B candidates kept per A column
+    value_match_weight: float = 0.7           # share of value evidence in the fused score
+
+    # Schema mapping: "assignment" (one-to-one) | "greedy" (best B per A column)
+    schema_match_strategy: str = "assignment"
+
+    # LLM column mapping: only ambiguous A columns are sent, in chunks
+    mapper_confident_score: float = 0.9       # best score at/above this ...
+    mapper_ambiguity_margin: float = 0.1      # ... and this far ahead of the runner-up skips the LLM
+    mapper_llm_candidates: int = 8            # B candidates listed per A column
+    mapper_llm_chunk_cols: int = 25           # A columns per prompt
+    mapper_llm_parallelism: int = 4
+
+    # Entity resolution (local matching; LLM only for the review band)
+    entity_block_cap: int = 10_000            # max left x right pairs drawn from one block
+    entity_min_cosine: float = 0.3
+    entity_top_k: int = 3                     # candidates per name scored with edit distance
+    entity_cosine_weight: float = 0.6         # TF-IDF cosine vs edit similarity
+    entity_accept_score: float = 0.85
+    entity_review_score: float = 0.6          # [review, accept) goes to the LLM
+    entity_llm_max_pairs: int = 500
+    entity_llm_batch: int = 40
+    entity_llm_min_confidence: float = 0.5
+    crosswalk_inline_max_rows: int = 2_000    # larger crosswalks are staged as a BQ table
+
+    # Mismatch diagnostics over the result set
+    diagnostics_max_rows: int = 200_000       # larger results are sampled
+    diagnostics_min_share: float = 0.25       # share of differing rows a pattern must explain
+    diagnostics_top_n: int = 5
+    explain_llm_phrasing: bool = False        # let the LLM reword the deterministic findings
+    explain_async: bool = True                # explain after the rows are returned
+    explain_workers: int = 2
+    stream_run_workers: int = 4               # concurrent /reconcile/stream runs; further ones queue
+
+    # Name similarity matrix
+    name_sim_refine_top_k: int = 16           # exact name_similarity for top-k B per A column
+    name_sim_cache_size: int = 16
+
+    # Before approval only a bounded sample of each source is read
+    mapping_sample_rows: int = 5_000
+    source_io_workers: int = 4                # parallel full loads + background staging
+    bq_preview_rows: int = 1_000              # free tabledata.list rows for BigQuery sources (0: schema only)
+
+    # Per-run artifact store: source / result frames kept out of graph state
+    artifact_dir: str = "/tmp/recon_artifacts"
+    artifact_memory_bytes: int = 2 * 1024 ** 3       # all runs; beyond this frames spill to Parquet
+    artifact_run_memory_bytes: int = 512 * 1024 ** 2  # one run
+    artifact_ttl_s: int = 6 * 3600
+
+    # Persistent schema-mapping cache (SQLite)
+    mapping_cache_enabled: bool = True
+    mapping_cache_path: str = "/tmp/recon_cache/mappings.sqlite"
+    mapping_cache_ttl_s: int = 30 * 24 * 3600
+    mapping_cache_max_entries: int = 1000
+
+    # LLM response cache (in-memory LRU + SQLite); path "" disables the disk tier
+    llm_cache_enabled: bool = True
+    llm_cache_memory_size: int = 256
+    llm_cache_path: str = "/tmp/recon_cache/llm_responses.sqlite"
+    llm_cache_ttl_s: int = 7 * 24 * 3600
+    llm_cache_max_disk_entries: int = 10_000
+
+    # Persistent entity alias store (SQLite), reused across runs of a dataset pair
+    alias_store_enabled: bool = True
+    alias_store_path: str = "/tmp/recon_cache/entity_aliases.sqlite"
+    alias_negative_ttl_s: int = 7 * 24 * 3600  # "no match" entries are retried after this
+    alias_ngram_min_jaccard: float = 0.8       # trigram overlap to reuse a near-variant's alias
+
+    # OpenTelemetry tracing: "" (off), "console", "file" (JSON lines) or "otlp"
+    tracing_exporter: str = ""
+    tracing_file_path: str = "/tmp/recon_traces.jsonl"
+    otlp_endpoint: str = ""                   # default OTLP/HTTP endpoint when empty
+    tracing_service_name: str = "recon-backend"
+
+    # On-demand per-run profiling (profile=cprofile|sample on /reconcile)
+    profiling_enabled: bool = True
+    profile_dir: str = "/tmp/recon_profiles"
+    profile_max_files: int = 200              # oldest profiles are deleted beyond this
+    profile_sample_interval_s: float = 0.005
+    admin_token: str = ""                     # X-Admin-Token for /admin/*; empty disables those routes
+
     class Config:
         env_file = ".env"
 
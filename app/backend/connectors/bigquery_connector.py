@@ -1,10 +1,17 @@
+import logging
+
 import pandas as pd
-from typing import Optional
+from typing import Optional, Tuple
+
+from backend.utils.metrics import record_bq_job, record_rows
+from backend.utils.tracing import span
 try:
     from google.cloud import bigquery
 except Exception:
     bigquery = None
 
+logger = logging.getLogger(__name__)
+
 
 def _ensure_list(val):
     """
@@ -23,6 +30,39 @@ def _ensure_list(val):
     return []
 
 
+# BigQuery column type -> pandas dtype for frames typed from a table schema
+_PANDAS_DTYPES = {
+    "INTEGER": "Int64",
+    "INT64": "Int64",
+    "FLOAT": "float64",
+    "FLOAT64": "float64",
+    "NUMERIC": "float64",
+    "BIGNUMERIC": "float64",
+    "BOOLEAN": "boolean",
+    "BOOL": "boolean",
+    "TIMESTAMP": "datetime64[ns, UTC]",
+    "DATETIME": "datetime64[ns]",
+    "DATE": "datetime64[ns]",
+}
+
+
+def _job_stats(job) -> dict:
+    """Id and cost counters of a finished query job (missing ones are None)."""
+    return {
+        "job_id": getattr(job, "job_id", None),
+        "bytes_processed": getattr(job, "total_bytes_processed", None),
+        "bytes_billed": getattr(job, "total_bytes_billed", None),
+        "slot_ms": getattr(job, "slot_millis", None),
+        "cache_hit": getattr(job, "cache_hit", None),
+    }
+
+
+def _set_job_attributes(sp, stats: dict) -> None:
+    for k, v in stats.items():
+        if v is not None:
+            sp.set_attribute(f"bq.{k}", v)
+
+
 class BigQueryConnector:
     """
     Unified BigQuery connector used by:
@@ -39,6 +79,7 @@ class BigQueryConnector:
         """
         self.project_id = project_id
         self.client = None   # lazy init
+        self.last_job_stats: dict = {}
 
     # -----------------------------------------------------
     # Lazy BigQuery client creation
@@ -58,8 +99,16 @@ class BigQueryConnector:
     # -----------------------------------------------------
     def run_query(self, query: str) -> pd.DataFrame:
         client = self._client()
-        job = client.query(query)
-        return job.result().to_dataframe()
+        with span("bigquery.run_query", **{"db.system": "bigquery", "db.statement.chars": len(query)}) as sp:
+            job = client.query(query)
+            sp.set_attribute("bq.job_id", getattr(job, "job_id", None) or "")
+            df = job.result().to_dataframe()
+            self.last_job_stats = _job_stats(job)
+            _set_job_attributes(sp, self.last_job_stats)
+            sp.set_attribute("rows", len(df))
+        record_bq_job(self.last_job_stats)
+        record_rows(rows_in=len(df))
+        return df
 
     # Backwards compatible alias
     def run_query_to_df(self, query: str) -> pd.DataFrame:
@@ -73,7 +122,8 @@ class BigQueryConnector:
         Load selected columns from an existing BigQuery table.
         cfg = {
             "table_fqn": "project.dataset.table",
-            "columns": ["colA", "colB"]
+            "columns": ["colA", "colB"],
+            "distinct": False          # SELECT DISTINCT (e.g. entity values)
         }
         """
         client = self._client()
@@ -85,12 +135,70 @@ class BigQueryConnector:
         cols_cfg = cfg.get("columns")
         cols = _ensure_list(cols_cfg)
 
+        select = "SELECT DISTINCT" if cfg.get("distinct") else "SELECT"
         if not cols:
-            sql = f"SELECT * FROM `{table}`"
+            sql = f"{select} * FROM `{table}`"
         else:
-            sql = f"SELECT {', '.join(cols)} FROM `{table}`"
+            sql = f"{select} {', '.join(cols)} FROM `{table}`"
+
+        with span("bigquery.load", **{"db.system": "bigquery", "bq.table": table}) as sp:
+            job = client.query(sql)
+            df = job.to_dataframe()
+            stats = _job_stats(job)
+            _set_job_attributes(sp, stats)
+            sp.set_attribute("rows", len(df))
+        record_bq_job(stats)
+        return df
+
+    # -----------------------------------------------------
+    # Metadata + first rows of a table without a query job
+    # -----------------------------------------------------
+    def introspect(self, cfg: dict, preview_rows: int = 0) -> Tuple[pd.DataFrame, dict]:
+        """
+        (frame, metadata) for an existing table from its metadata alone:
+        schema, row / byte counts, partitioning and clustering (tables.get),
+        plus its first `preview_rows` rows through tabledata.list. No query
+        job runs and nothing is billed. With preview_rows=0 the frame is
+        empty but typed from the schema. Same cfg as load().
+        """
+        client = self._client()
+
+        table = cfg.get("table_fqn") or cfg.get("table")
+        if not table:
+            raise ValueError("BigQuery cfg missing 'table' or 'table_fqn'.")
+        cols = _ensure_list(cfg.get("columns"))
+
+        with span("bigquery.introspect", **{"db.system": "bigquery", "bq.table": table}) as sp:
+            tbl = client.get_table(table)
+            fields = [f for f in tbl.schema if f.name in cols] if cols else list(tbl.schema)
+            if preview_rows > 0:
+                df = client.list_rows(tbl, max_results=preview_rows, selected_fields=fields).to_dataframe()
+            else:
+                df = pd.DataFrame({
+                    f.name: pd.Series(dtype="object" if f.mode == "REPEATED" else _PANDAS_DTYPES.get(f.field_type, "object"))
+                    for f in fields
+                })
+            sp.set_attribute("rows", len(df))
+
+        tp, rp = tbl.time_partitioning, getattr(tbl, "range_partitioning", None)
+        partitioning = None
+        if tp is not None:
+            partitioning = {"type": tp.type_, "field": tp.field}
+        elif rp is not None:
+            partitioning = {"type": "RANGE", "field": rp.field}
+        meta = {
+            "table": table,
+            "columns": [{"name": f.name, "type": f.field_type, "mode": f.mode} for f in fields],
+            "num_rows": tbl.num_rows,
+            "num_bytes": tbl.num_bytes,
+            "partitioning": partitioning,
+            "clustering": list(tbl.clustering_fields or []),
+        }
+        return df, meta
 
-        return client.query(sql).to_dataframe()
+    def preview(self, cfg: dict, max_results: int) -> pd.DataFrame:
+        """First `max_results` rows of an existing table (tabledata.list, free)."""
+        return self.introspect(cfg, preview_rows=max_results)[0]
 
     # -----------------------------------------------------
     # Upload a DataFrame to BigQuery (used for file sources)
@@ -105,8 +213,13 @@ class BigQueryConnector:
         project = client.project
         table_id = f"{project}.{dataset}.{table}"
 
-        load_job = client.load_table_from_dataframe(df, table_id)
-        load_job.result()  # wait for load completion
+        with span("bigquery.load_dataframe_to_table", **{"db.system": "bigquery", "bq.table": table_id,
+                                                          "rows": len(df)}) as sp:
+            load_job = client.load_table_from_dataframe(df, table_id)
+            sp.set_attribute("bq.job_id", getattr(load_job, "job_id", None) or "")
+            load_job.result()  # wait for load completion
+            sp.set_attribute("bq.output_bytes", getattr(load_job, "output_bytes", None) or 0)
+        record_rows(rows_out=len(df))
 
         return table_id
 
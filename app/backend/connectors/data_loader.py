@@ -1,5 +1,5 @@
 # backend/data_loader.py
-from typing import Dict
+from typing import Dict, Optional, Tuple
 import uuid
 import pandas as pd
 
@@ -9,15 +9,21 @@ from backend.connectors.oracle_connector import load_oracle_data
 from backend.connectors.file_connector import FileConnector
 from backend.connectors.bigquery_connector import BigQueryConnector
 from backend.config import settings
+from backend.utils.metrics import record_rows
+from backend.utils.tracing import span
 
 file_connector = FileConnector()
 bigquery_connector = BigQueryConnector(project_id=None)  # or your project id
 
 
-def load_source_data(cfg: Dict) -> pd.DataFrame:
+def load_source_data(cfg: Dict, limit: Optional[int] = None) -> pd.DataFrame:
     """
     Dispatch to the right connector based on cfg["type"].
 
+    limit: bounded sample instead of a full extraction - the first rows of
+    files (first Parquet batch), LIMIT / FETCH FIRST for SQL sources, and
+    the free tabledata.list for BigQuery tables.
+
     cfg examples:
       {"type": "file", "path": "...", "format": "csv"}
       {"type": "postgres", "host": "...", "database": "...", "user": "...", ...}
@@ -30,26 +36,50 @@ def load_source_data(cfg: Dict) -> pd.DataFrame:
 
     src_type = (cfg.get("type") or "").lower()
 
-    if src_type == "file":
-        return file_connector.load(cfg)
-    elif src_type == "postgres":
-        return load_postgres_data(cfg)
-    elif src_type == "hive":
-        return load_hive_data(cfg)
-    elif src_type == "oracle":
-        return load_oracle_data(cfg)
-    elif src_type == "bigquery":
-        return bigquery_connector.load(cfg)
-    else:
-        raise ValueError(f"Unsupported source type: {src_type}")
-
-def materialize_to_bigquery(cfg: Dict, label: str) -> str:
+    with span(f"load_{src_type or 'unknown'}_data", **{"source.type": src_type, "limit": limit}) as sp:
+        if src_type == "file":
+            df = file_connector.load(cfg, nrows=limit)
+        elif src_type == "postgres":
+            df = load_postgres_data(cfg, limit=limit)
+        elif src_type == "hive":
+            df = load_hive_data(cfg, limit=limit)
+        elif src_type == "oracle":
+            df = load_oracle_data(cfg, limit=limit)
+        elif src_type == "bigquery":
+            df = bigquery_connector.load(cfg) if limit is None else bigquery_connector.preview(cfg, limit)
+        else:
+            raise ValueError(f"Unsupported source type: {src_type}")
+        sp.set_attribute("rows", len(df))
+        sp.set_attribute("columns", len(df.columns))
+
+    record_rows(rows_in=len(df))
+    return df
+
+def is_bigquery_source(cfg: Optional[Dict]) -> bool:
+    return bool(cfg) and (cfg.get("type") or "").lower() == "bigquery"
+
+
+def introspect_bigquery_source(cfg: Dict, preview_rows: Optional[int] = None) -> Tuple[pd.DataFrame, Dict]:
+    """
+    Columns and types of a type=bigquery source from table metadata, plus
+    its first bq_preview_rows rows via tabledata.list: no query job and no
+    full download. BigQuery sources are queried in place, never staged.
+    Returns (typed preview frame, {"num_rows", "num_bytes", "partitioning", ...}).
+    """
+    n = settings.bq_preview_rows if preview_rows is None else preview_rows
+    df, meta = bigquery_connector.introspect(cfg, preview_rows=n)
+    record_rows(rows_in=len(df))
+    return df, meta
+
+
+def materialize_to_bigquery(cfg: Dict, label: str, df: Optional[pd.DataFrame] = None) -> str:
     """
     Ensure the given source is available as a BigQuery table.
     Returns fully-qualified table id: project.dataset.table
 
     - If type=bigquery -> just returns cfg["table"] / ["table_fqn"]
     - If type=file / oracle / postgres / hive -> loads into recon_staging.<label>_<uuid>
+      (df, when given, is the already extracted source and is not read again)
     """
     src_type = (cfg.get("type") or "").lower()
 
@@ -61,7 +91,8 @@ def materialize_to_bigquery(cfg: Dict, label: str) -> str:
         return table
 
     # For all other types we go via DataFrame -> staging dataset
-    df = load_source_data(cfg)
+    if df is None:
+        df = load_source_data(cfg)
 
     dataset = settings.BQ_STAGING_DATASET  # e.g. "recon_staging"
     if not dataset:
@@ -1,28 +1,40 @@
 # backend/connectors/file_connector.py
 
 import os
+from itertools import islice
+from typing import Optional
+
 import pandas as pd
 import fastavro
 
 
 class FileConnector:
-    def load(self, cfg: dict) -> pd.DataFrame:
+    def load(self, cfg: dict, nrows: Optional[int] = None) -> pd.DataFrame:
         """
         cfg structure:
             {
               "type": "file",
               "path": "/tmp/recon_uploads/fileA.csv",
               "format": "csv" | "json" | "parquet" | "avro" | "xlsx" | None,
-              "lines": True/False    # optional for JSON
+              "lines": True/False,   # optional for JSON
+              "columns": ["colA", "colB"]   # optional projection
             }
 
         If 'format' is provided explicitly (via UI upload), it takes precedence
         over file extension.
+
+        nrows: read only the first rows (Parquet batches are read until there
+        are enough, across row groups); plain JSON documents are parsed whole and then cut.
         """
 
         path = cfg["path"]
         explicit_format = (cfg.get("format") or "").lower()
         json_lines = cfg.get("lines", False)
+        columns = cfg.get("columns") or None
+
+        def project(df: pd.DataFrame) -> pd.DataFrame:
+            # requested order; also the projection for formats read whole
+            return df[columns] if columns else df
 
         # 1. Determine format: explicit > file extension
         if explicit_format:
@@ -38,25 +50,46 @@ class FileConnector:
 
         # CSV
         if fmt in ["csv"]:
-            return pd.read_csv(path)
+            df = pd.read_csv(path, nrows=nrows, usecols=columns)
+            return project(df)
 
         # JSON
         if fmt in ["json"]:
-            return pd.read_json(path, lines=json_lines)
+            if json_lines:
+                return project(pd.read_json(path, lines=True, nrows=nrows))
+            df = project(pd.read_json(path))
+            return df if nrows is None else df.head(nrows)
 
         # Parquet
         if fmt in ["parquet", "pq"]:
-            return pd.read_parquet(path)
+            if nrows is None:
+                return pd.read_parquet(path, columns=columns)
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            pf = pq.ParquetFile(path)
+            # a batch never spans row groups, so one may hold fewer than nrows
+            batches, got = [], 0
+            for batch in pf.iter_batches(batch_size=nrows, columns=columns):
+                batches.append(batch)
+                got += batch.num_rows
+                if got >= nrows:
+                    break
+            if not batches:
+                return project(pf.schema_arrow.empty_table().to_pandas())
+            return pa.Table.from_batches(batches).slice(0, nrows).to_pandas()
 
         # Avro
         if fmt in ["avro"]:
             with open(path, "rb") as f:
                 reader = fastavro.reader(f)
-                return pd.DataFrame(list(reader))
+                if columns:
+                    reader = ({c: rec.get(c) for c in columns} for rec in reader)
+                return pd.DataFrame(list(islice(reader, nrows)), columns=columns)
 
         # Excel
         if fmt in ["xlsx", "xls", "excel"]:
-            return pd.read_excel(path)
+            return project(pd.read_excel(path, nrows=nrows, usecols=columns))
 
         # If unsupported
         raise ValueError(f"Unsupported file format '{fmt}' for path={path}")
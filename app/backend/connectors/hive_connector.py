@@ -5,15 +5,16 @@ import pandas as pd
 from pyhive import hive
 
 
-def _build_select(table: str, columns: Optional[list]) -> str:
+def _build_select(table: str, columns: Optional[list], limit: Optional[int] = None) -> str:
     if columns:
         cols_sql = ", ".join(columns)
     else:
         cols_sql = "*"
-    return f"SELECT {cols_sql} FROM {table}"
+    sql = f"SELECT {cols_sql} FROM {table}"
+    return sql if limit is None else f"{sql} LIMIT {int(limit)}"
 
 
-def load_hive_data(cfg: Dict) -> pd.DataFrame:
+def load_hive_data(cfg: Dict, limit: Optional[int] = None) -> pd.DataFrame:
     host = cfg.get("host") or os.getenv("HIVE_HOST")
     port = int(cfg.get("port") or os.getenv("HIVE_PORT", 10000))
     username = cfg.get("user") or os.getenv("HIVE_USERNAME")
@@ -35,8 +36,11 @@ def load_hive_data(cfg: Dict) -> pd.DataFrame:
 
     if custom_query:
         query = custom_query
+        if columns or limit is not None:
+            # project / cut the custom query as a subquery
+            query = _build_select(f"({custom_query}) recon_src", columns, limit)
     elif table:
-        query = _build_select(table, columns)
+        query = _build_select(table, columns, limit)
     else:
         raise ValueError("Hive source requires either 'table' or 'custom_query'.")
 
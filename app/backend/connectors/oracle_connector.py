@@ -16,12 +16,13 @@ def _ensure_list(val) -> Optional[List[str]]:
   raise ValueError(f"Unsupported columns type: {type(val)}")
 
 
-def _build_select(table: str, columns: Optional[List[str]]) -> str:
+def _build_select(table: str, columns: Optional[List[str]], limit: Optional[int] = None) -> str:
   if columns:
     cols_sql = ", ".join(columns)
   else:
     cols_sql = "*"
-  return f"SELECT {cols_sql} FROM {table}"
+  sql = f"SELECT {cols_sql} FROM {table}"
+  return sql if limit is None else f"{sql} FETCH FIRST {int(limit)} ROWS ONLY"
 
 
 def build_oracle_dsn(cfg: Dict) -> str:
@@ -36,13 +37,15 @@ def build_oracle_dsn(cfg: Dict) -> str:
   return oracledb.makedsn(host, port, service_name=service)
 
 
-def load_oracle_data(cfg: Dict) -> pd.DataFrame:
+def load_oracle_data(cfg: Dict, limit: Optional[int] = None) -> pd.DataFrame:
   """
   cfg keys (from UI + normalizeSource):
     - host, port, service
     - user, password
     - table (or custom_query)
     - columns: list[str] or comma-separated string
+
+  limit: fetch only the first rows (FETCH FIRST, Oracle 12c+)
   """
   user = cfg.get("user") or os.getenv("ORACLE_USER")
   password = cfg.get("password") or os.getenv("ORACLE_PASSWORD")
@@ -61,8 +64,11 @@ def load_oracle_data(cfg: Dict) -> pd.DataFrame:
 
   if custom_query:
     query = custom_query
+    if columns or limit is not None:
+      # project / cut the custom query as a subquery
+      query = _build_select(f"({custom_query}) recon_src", columns, limit)
   elif table:
-    query = _build_select(table, columns)
+    query = _build_select(table, columns, limit)
   else:
     raise ValueError("Oracle source requires either 'table' or 'custom_query'.")
 
@@ -18,15 +18,16 @@ def build_postgres_url(cfg: Dict) -> str:
     return f"postgresql+psycopg2://{user}:{password}@{host}:{port}/{database}"
 
 
-def _build_select(table: str, columns: Optional[list]) -> str:
+def _build_select(table: str, columns: Optional[list], limit: Optional[int] = None) -> str:
     if columns:
         cols_sql = ", ".join(columns)
     else:
         cols_sql = "*"
-    return f"SELECT {cols_sql} FROM {table}"
+    sql = f"SELECT {cols_sql} FROM {table}"
+    return sql if limit is None else f"{sql} LIMIT {int(limit)}"
 
 
-def load_postgres_data(cfg: Dict) -> pd.DataFrame:
+def load_postgres_data(cfg: Dict, limit: Optional[int] = None) -> pd.DataFrame:
     url = build_postgres_url(cfg)
     engine = create_engine(url)
 
@@ -35,9 +36,12 @@ def load_postgres_data(cfg: Dict) -> pd.DataFrame:
     columns = cfg.get("columns")  # this will already be a list after frontend normalization
 
     if custom_query:
+        if columns or limit is not None:
+            # project / cut the custom query as a subquery
+            custom_query = _build_select(f"({custom_query}) AS recon_src", columns, limit)
         query = text(custom_query)
     elif table:
-        query = text(_build_select(table, columns))
+        query = text(_build_select(table, columns, limit))
     else:
         raise ValueError("Postgres source requires either 'table' or 'custom_query'.")
 
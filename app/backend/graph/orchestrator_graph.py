@@ -1,5 +1,5 @@
 from pydantic import BaseModel, ValidationError
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from langgraph.graph import StateGraph, START, END
 
 from backend.agents.schema_mapper import SchemaMapperAgent
@@ -9,11 +9,26 @@ from backend.agents.explanation_generator import ExplanationGeneratorAgent
 from backend.config import settings
 from backend.connectors.data_loader import load_source_data
 from backend.connectors.bigquery_connector import bigquery, BigQueryConnector
-from backend.connectors.data_loader import materialize_to_bigquery
-
+from backend.connectors.data_loader import (
+    introspect_bigquery_source,
+    is_bigquery_source,
+    materialize_to_bigquery,
+)
+from backend.utils.column_profile import get_or_build_profile
+from backend.utils.artifact_store import artifact_store
+from backend.utils.crosswalk import build_crosswalks, crosswalk_relations
+from backend.utils.mapping_cache import seed_approved_mapping
+from backend.utils.metrics import measure_node
+from backend.utils.async_utils import with_context
+from backend.utils.tracing import span, trace_ids
+from backend.utils.run_registry import run_registry
+
+
+import time
 
 import pandas as pd
 from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 
 import logging
 logger = logging.getLogger(__name__)
@@ -26,6 +41,9 @@ class Approval(BaseModel):
     approved_matches: List[ColumnMapping]
 
 class ReconState(BaseModel):
+    # progress is published under this id (GET /api/runs/{run_id})
+    run_id: str | None = None
+
     # input configs
     dataset_a: Dict[str, Any] | None = None
     dataset_b: Dict[str, Any] | None = None
@@ -38,23 +56,36 @@ class ReconState(BaseModel):
     df_a_sample: Any | None = None
     df_b_sample: Any | None = None
     schema_mapping: Dict[str, Any] | None = None
+    # JSON summaries of the column profiles: {"a": {...}, "b": {...}}
+    profiles: Dict[str, Any] | None = None
     entity_res: Dict[str, Any] | None = None
+    # chosen join key + ranked alternatives with estimated fan-out
+    join_keys: Dict[str, Any] | None = None
+    # entity crosswalks applied in the SQL: {a_col: {"b_col", "rows", "source"}}
+    crosswalks: Dict[str, Any] | None = None
     sql: str | None = None
     bq_status: str | None = None
+    # recon query job: {"job_id", "bytes_processed", "bytes_billed", "slot_ms", "cache_hit"}
+    bq_job: Dict[str, Any] | None = None
     explanation: str | None = None
+    # per-node wall time, memory, rows, BigQuery bytes and LLM tokens
+    metrics: Dict[str, Any] | None = None
+    # PENDING while the background explanation runs, then READY / FAILED
+    explanation_status: str | None = None
+    # structured mismatch findings: {"rows", "sampled", "findings": [...]}
+    diagnostics: Dict[str, Any] | None = None
     status: str | None = None
 
     entity_resolved: Dict[str, Any] | None = None
 
-    # --- NEW: STORE RAW DATAFRAMES FOR JOIN-KEY VALIDATION ---
-    data_a: Any | None = None
-    data_b: Any | None = None
+    # Source and result frames live in the artifact store; state only holds
+    # their handles: {"a" | "b" | "result": {"handle", "rows", "bytes", "location"}}
+    artifacts: Dict[str, Dict[str, Any]] | None = None
 
     # --- NEW: STORE COLUMN LISTS ---
     columns_a: List[str] | None = None
     columns_b: List[str] | None = None
 
-    result_df: Any | None = None     # internal only
     result: Any | None = None        # JSON serializable output
 
 sm = SchemaMapperAgent()
@@ -62,65 +93,156 @@ er = EntityResolverAgent()
 qs = QuerySynthesizerAgent()
 eg = ExplanationGeneratorAgent()
 
-def materialize_sources(state: ReconState) -> ReconState:
-    # Dataset A
-    if state.dataset_a:
-        fqn_a = materialize_to_bigquery(state.dataset_a, "a")
-        state.dataset_a["table_fqn"] = fqn_a
+def _frame(state: Any, role: str) -> Optional[pd.DataFrame]:
+    """The run's "a" / "b" / "result" frame from the artifact store (None if absent)."""
+    artifacts = state.get("artifacts") if isinstance(state, Mapping) else state.artifacts
+    return artifact_store.get(((artifacts or {}).get(role) or {}).get("handle"))
+
+
+def _store_frame(state: ReconState, role: str, df: pd.DataFrame, **extra: Any) -> None:
+    meta = artifact_store.put(state.run_id, role, df)
+    ref = {k: meta[k] for k in ("handle", "rows", "bytes", "location")}
+    state.artifacts = {**(state.artifacts or {}), role: {**ref, **extra}}
+
 
-    # Dataset B
-    if state.dataset_b:
-        fqn_b = materialize_to_bigquery(state.dataset_b, "b")
-        state.dataset_b["table_fqn"] = fqn_b
+def _sources(state: ReconState) -> List[Tuple[str, Dict[str, Any]]]:
+    return [(role, cfg) for role, cfg in (("a", state.dataset_a), ("b", state.dataset_b)) if cfg]
 
+
+# full extractions and their staging uploads, started by node_extract on
+# the approved pass; staging futures are collected by materialize_sources
+_source_pool = ThreadPoolExecutor(max_workers=settings.source_io_workers, thread_name_prefix="source-io")
+_staging: Dict[Tuple[str, str], Any] = {}
+
+
+def _cancel_staging(run_id: str | None) -> None:
+    for key in [k for k in _staging if k[0] == run_id]:
+        _staging.pop(key).cancel()
+
+
+def materialize_sources(state: ReconState) -> ReconState:
+    """
+    Make both sources available as BigQuery tables. Staging normally
+    started in the background when node_extract extracted them; this waits
+    for it (or stages now if it was not started).
+    """
+    for role, cfg in _sources(state):
+        staged = _staging.pop((state.run_id, role), None)
+        if staged is not None:
+            cfg["table_fqn"] = staged.result()
+        else:
+            cfg["table_fqn"] = materialize_to_bigquery(cfg, role, _frame(state, role))
     return state
 
 def node_load(state: ReconState) -> ReconState:
-    # --- Load Dataset A ---
-    if state.dataset_a:
-        df_a = load_source_data(state.dataset_a)
-        state.data_a = df_a   # keep copy for error reporting
-        state.columns_a = df_a.columns.tolist()  # <-- NEW
-        # materialize into BigQuery after this, in materialize_sources()
-
-    # --- Load Dataset B ---
-    if state.dataset_b:
-        df_b = load_source_data(state.dataset_b)
-        state.data_b = df_b
-        state.columns_b = df_b.columns.tolist()  # <-- NEW
+    """
+    Read a bounded sample of each source (schema mapping needs names, types
+    and a few values), on both passes: the approved pass then maps the
+    same sample, so it hits the mapping cache under the same key. The full
+    extraction waits for the approved mapping (node_extract).
+
+    BigQuery sources are never downloaded: their columns and types come
+    from table metadata plus a free preview.
+    """
+    for role, cfg in _sources(state):
+        if is_bigquery_source(cfg):
+            df, table = introspect_bigquery_source(cfg)
+            table = {k: table[k] for k in ("num_rows", "num_bytes", "partitioning", "clustering")}
+            _store_frame(state, role, df, sample_rows=len(df), table=table)
+            setattr(state, f"columns_{role}", df.columns.tolist())
+
+    n = settings.mapping_sample_rows
+    for role, cfg in _sources(state):
+        if not is_bigquery_source(cfg):
+            df = load_source_data(cfg, limit=n)
+            _store_frame(state, role, df, sample_rows=n)
+            setattr(state, f"columns_{role}", df.columns.tolist())
+    return state
+
+def _projection(state: ReconState, role: str) -> List[str]:
+    """
+    Columns of one side the approved mapping needs: join keys are chosen
+    among the mapped pairs, so the mapped columns cover keys, compared
+    columns and entity columns.
+    """
+    matches = (state.schema_mapping or {}).get("matches") or []
+    return list(dict.fromkeys(m[f"{role}_col"] for m in matches if m.get(f"{role}_col")))
+
+def node_extract(state: ReconState) -> ReconState:
+    """
+    Approved pass: extract both sources in parallel, projected to the
+    approved columns (pushed into the connector query / file reader), and
+    stage each into BigQuery in the background while entity resolution
+    runs. BigQuery sources are left where they are.
+    """
+    extract = []
+    for role, cfg in _sources(state):
+        if not is_bigquery_source(cfg):
+            # an empty projection (nothing approved) reads everything
+            extract.append((role, {**cfg, "columns": _projection(state, role) or cfg.get("columns")}))
+
+    loads = {role: _source_pool.submit(with_context(load_source_data), cfg) for role, cfg in extract}
+    for role, cfg in extract:
+        df = loads[role].result()
+        _store_frame(state, role, df, columns=cfg["columns"])
+        # staged from the projected copy: the node owns state.dataset_*
+        _staging[(state.run_id, role)] = _source_pool.submit(
+            with_context(materialize_to_bigquery), cfg, role, df
+        )
+    return state
 
+def node_profile(state: ReconState) -> ReconState:
+    """
+    Profile both sources once (dtype, null rate, HLL distinct count, min/max,
+    value lengths, array detection). The profile objects are cached per source
+    and reused by mapping, join-key selection and SQL synthesis; state only
+    carries the JSON summary.
+    """
+    state.profiles = {
+        role[-1]: prof.to_dict() for role, prof in _profiles_for(state).items()
+    }
     return state
 
+def _profiles_for(state: ReconState) -> Dict[str, Any]:
+    """
+    Cached TableProfile objects for the loaded sources (empty if not loaded).
+    Frames are only fetched from the artifact store on a profile cache miss.
+    """
+    out: Dict[str, Any] = {}
+    for role, cfg in _sources(state):
+        ref = (state.artifacts or {}).get(role)
+        if ref:
+            # never let a sample's (or a projection's) profile stand in for the full source
+            cfg = {**cfg, **{k: ref[k] for k in ("sample_rows", "columns") if ref.get(k)}}
+            # BigQuery previews are scaled to the table's row count
+            total_rows = (ref.get("table") or {}).get("num_rows")
+            out[f"profile_{role}"] = get_or_build_profile(
+                cfg, lambda role=role: _frame(state, role), total_rows=total_rows
+            )
+    return out
+
 def node_map(state: ReconState) -> ReconState:
     """
     Run schema mapping to propose column matches.
 
-    Prefer full DataFrames from state (data_a / data_b or df_a / df_b).
+    Prefer the loaded frames from the artifact store.
     Fall back to df_a_sample / df_b_sample only if full data is missing.
     """
 
     # ---- pick df_a ----
-    df_a = None
-    if getattr(state, "data_a", None) is not None:
-        df_a = state.data_a
-    elif getattr(state, "df_a", None) is not None:
-        df_a = state.df_a
-    elif getattr(state, "df_a_sample", None) is not None:
+    df_a = _frame(state, "a")
+    if df_a is None and getattr(state, "df_a_sample", None) is not None:
         df_a = pd.DataFrame(state.df_a_sample)
 
     # ---- pick df_b ----
-    df_b = None
-    if getattr(state, "data_b", None) is not None:
-        df_b = state.data_b
-    elif getattr(state, "df_b", None) is not None:
-        df_b = state.df_b
-    elif getattr(state, "df_b_sample", None) is not None:
+    df_b = _frame(state, "b")
+    if df_b is None and getattr(state, "df_b_sample", None) is not None:
         df_b = pd.DataFrame(state.df_b_sample)
 
     # Defensive: if still missing, return empty mapping
     if df_a is None or df_b is None:
         logger.error(
-            "node_map: missing data_a/data_b and df_a_sample/df_b_sample; "
+            "node_map: missing loaded sources and df_a_sample/df_b_sample; "
             "cannot compute schema mapping."
         )
         state.schema_mapping = {
@@ -131,8 +253,9 @@ def node_map(state: ReconState) -> ReconState:
         }
         return state
 
-    sm = SchemaMapperAgent()
-    state.schema_mapping = sm.run({"df_a": df_a, "df_b": df_b})
+    state.schema_mapping = sm.run(
+        {"df_a": df_a, "df_b": df_b, "run_id": state.run_id, **_profiles_for(state)}
+    )
 
     # Columns for UI
     state.columns_a = df_a.columns.tolist()
@@ -165,6 +288,8 @@ def node_approval(state: ReconState) -> ReconState:
                 for m in original_matches
                 if (m.get("a_col"), m.get("b_col")) in approved_pairs
             ]
+            # the next run over the same column sets reuses this mapping
+            seed_approved_mapping(state.schema_mapping)
     except Exception as e:
         logger.error("Error applying approval to schema_mapping: %s", e)
 
@@ -181,13 +306,13 @@ def decide_after_approval(state: ReconState) -> str:
 
     - When called from /reconcile/approve:
       routes will set status="APPROVED" and include an approval payload,
-      so we route to "entity_resolve" to continue the pipeline.
+      so we route to "extract" to continue the pipeline.
     """
 
     status = getattr(state, "status", None)
 
     if status == "APPROVED":
-        return "entity_resolve"
+        return "extract"
 
     # Default (PENDING_APPROVAL or anything else) → stop at "await"
     return "await"
@@ -197,6 +322,25 @@ def node_await(state: ReconState) -> ReconState:
     # Pause here; client inspects mapping and calls again with approval set
     return state
 
+def _entity_frame(state: ReconState, role: str) -> Optional[pd.DataFrame]:
+    """
+    Source frame for entity resolution. BigQuery sources only hold a
+    preview, so the distinct values of their mapped entity columns are
+    fetched (one narrow query) instead.
+    """
+    cfg = getattr(state, f"dataset_{role}")
+    entities = set(state.entities or [])
+    if not entities or not is_bigquery_source(cfg):
+        return _frame(state, role)
+    cols = sorted({
+        m[f"{role}_col"] for m in (state.schema_mapping or {}).get("matches") or []
+        if m.get(f"{role}_col") and (m.get("a_col") in entities or m.get("b_col") in entities)
+    })
+    if not cols:
+        return _frame(state, role)
+    return load_source_data({**cfg, "columns": cols, "distinct": True})
+
+
 def node_entity_resolve(state: ReconState) -> ReconState:
     """
     Run entity resolution after schema mapping.
@@ -204,14 +348,15 @@ def node_entity_resolve(state: ReconState) -> ReconState:
     """
 
     payload = {
-        "data_a": state.data_a,
-        "data_b": state.data_b,
+        "data_a": _entity_frame(state, "a"),
+        "data_b": _entity_frame(state, "b"),
         "schema_mapping": state.schema_mapping,
         # extra context in case EntityResolverAgent uses it
         "thresholds": getattr(state, "thresholds", None),
         "entities": getattr(state, "entities", []) or [],
         "dataset_a": getattr(state, "dataset_a", None),
         "dataset_b": getattr(state, "dataset_b", None),
+        "run_id": state.run_id,
     }
 
     result = er.run(payload)
@@ -223,16 +368,20 @@ def node_entity_resolve(state: ReconState) -> ReconState:
     else:
         state.entity_resolved = result
 
-    # Re-capture columns in case entity resolver changed anything
-    if state.data_a is not None:
-        state.columns_a = state.data_a.columns.tolist()
-    if state.data_b is not None:
-        state.columns_b = state.data_b.columns.tolist()
-
     return state
 
 
 
+def _stage_crosswalk(df: pd.DataFrame, label: str) -> str:
+    """Load a large entity crosswalk into the staging dataset."""
+    from backend.connectors.data_loader import bigquery_connector
+    import uuid
+
+    dataset = settings.BQ_STAGING_DATASET
+    bigquery_connector.ensure_dataset(dataset)
+    return bigquery_connector.load_dataframe_to_table(df, dataset, f"{label}_{uuid.uuid4().hex[:8]}")
+
+
 def node_sql(state: ReconState) -> ReconState:
     """
     Node: SQL Synthesis
@@ -249,6 +398,12 @@ def node_sql(state: ReconState) -> ReconState:
     table_a = state.dataset_a.get("table_fqn")
     table_b = state.dataset_b.get("table_fqn")
 
+    # resolved entity pairs -> crosswalk relations joined inside the recon SQL
+    crosswalks, state.crosswalks = crosswalk_relations(
+        build_crosswalks((state.entity_resolved or {}).get("pairs") or []),
+        stage=_stage_crosswalk,
+    )
+
     qs_payload = {
         "schema_mapping": schema_mapping,
         "thresholds": state.thresholds,
@@ -260,6 +415,8 @@ def node_sql(state: ReconState) -> ReconState:
         "columns_b": getattr(state, "columns_b", []),
         "entities": getattr(state, "entities", []) or [],
         "approval": getattr(state, "approval", None),
+        "crosswalks": crosswalks,
+        **_profiles_for(state),
     }
 
     logger.info("[node_sql] Invoking QuerySynthesizerAgent with payload keys: %s",
@@ -274,6 +431,7 @@ def node_sql(state: ReconState) -> ReconState:
     sql = None
     if isinstance(result, dict):
         sql = result.get("sql")
+        state.join_keys = result.get("join_keys")
 
     if not sql:
         raise RuntimeError("[node_sql] Synthesized SQL is empty!")
@@ -289,17 +447,16 @@ def decide_after_sql(state: ReconState) -> str:
     Decide what happens after SQL synthesis.
 
     Typical behaviour:
-    - Normal mode: run "exec" to execute the SQL, then "explain".
-    - Dry-run mode (if you ever support it): skip exec and go straight to "explain".
-
-    For now we assume normal mode unless a specific flag is set.
+    - Normal mode: run "exec" to execute the SQL; the graph ends there and
+      the explanation is produced in the background (see run_graph).
+    - Dry-run mode (if you ever support it): skip exec and end.
     """
 
     # Example optional flag on state: dry_run: bool = False
     dry_run = getattr(state, "dry_run", False)
 
     if dry_run:
-        return "explain"
+        return "end"
 
     return "exec"
 
@@ -307,13 +464,12 @@ def decide_after_sql(state: ReconState) -> str:
 def node_exec(state: ReconState) -> ReconState:
     """
     Node: Execute SQL on BigQuery.
-    Stores DataFrame in state.result_df.
+    Stores the rows as the run's "result" artifact.
     """
 
     sql = state.sql
     if not sql:
         logger.error("[node_exec] No SQL provided in state.sql")
-        state.result_df = None
         return state
 
     logger.info("[node_exec] Running SQL on BigQuery...")
@@ -335,39 +491,37 @@ def node_exec(state: ReconState) -> ReconState:
     except Exception as e:
         logger.error("[node_exec] Error executing BigQuery SQL: %s",
                      e, exc_info=True)
-        state.result_df = None
+        state.bq_status = f"ERROR: {e}"
         return state
 
-    state.result_df = df
+    _store_frame(state, "result", df)
+    state.bq_status = f"OK: {len(df)} row(s)"
+    state.bq_job = dict(getattr(bq, "last_job_stats", None) or {}) or None
     return state
 
+def _diagnostic_pairs(state: ReconState) -> List[Tuple[str, str]]:
+    matches = (state.schema_mapping or {}).get("matches") or []
+    return [(m["a_col"], m["b_col"]) for m in matches if m.get("a_col") and m.get("b_col")]
+
+
+def _join_key_cols(state: ReconState) -> List[str]:
+    chosen = (state.join_keys or {}).get("chosen") or {}
+    return [p["a_col"] for p in chosen.get("pairs") or [] if p.get("a_col")]
+
+
 def node_explain(state: ReconState) -> ReconState:
     """
-    Generate a natural language explanation of the reconciliation results
-    using ExplanationGeneratorAgent, and make sure any rows returned by
-    the agent are copied into state.result.
+    Diagnose the mismatch rows fetched by node_exec (no second query) and
+    turn the findings into the explanation.
     """
 
-    df = getattr(state, "result_df", None)
-
-    # Try to build a small sample of results for context; safe even if df is None
-    try:
-        if df is not None and not df.empty:
-            sample_records = df.head(20).to_dict(orient="records")
-        else:
-            sample_records = []
-    except Exception:
-        sample_records = []
+    df = _frame(state, "result")
 
     payload = {
-        "sql": state.sql,
+        "result_df": df,
+        "pairs": _diagnostic_pairs(state),
+        "key_cols": _join_key_cols(state),
         "bq_status": state.bq_status,
-        "extra": {
-            "schema_mapping": state.schema_mapping,
-            "thresholds": state.thresholds,
-            "entities": state.entities or [],
-            "sample_records": sample_records,
-        },
     }
 
     try:
@@ -388,159 +542,277 @@ def node_explain(state: ReconState) -> ReconState:
             )
         return state
 
-    if isinstance(eg_result, dict):
-        base_no_rows_msg = (
-            "No reconciliation differences were found, or the query returned no rows."
-        )
-
-        # 1) Explanation (preserves your previous behaviour)
-        state.explanation = (
-            eg_result.get("explanation")
-            or eg_result.get("summary")
-            or state.explanation
-            or (base_no_rows_msg if (df is None or getattr(df, "empty", False)) else "Reconciliation completed.")
-        )
-
-        # 2) BigQuery execution status, if returned
-        if "bq_status" in eg_result and eg_result["bq_status"] is not None:
-            state.bq_status = eg_result["bq_status"]
+    state.explanation = eg_result.get("explanation") or state.explanation
+    state.diagnostics = eg_result.get("diagnostics")
+    return state
 
-        # 3) Full reconciliation result rows from ExplanationGeneratorAgent
-        if "result" in eg_result and eg_result["result"] is not None:
-            state.result = eg_result["result"]
 
-        # 4) Optional metrics (only if you later add ReconState.metrics)
-        if "metrics" in eg_result and hasattr(state, "metrics"):
-            state.metrics = eg_result["metrics"]
-    else:
-        # Very defensive fallback
-        state.explanation = str(eg_result)
+def _node_stats(name: str, state: Any) -> Dict[str, Any]:
+    """Row counts / bytes worth reporting when a node finishes."""
+    get = state.get if isinstance(state, Mapping) else (lambda k: getattr(state, k, None))
+    artifacts = get("artifacts") or {}
+
+    def rows(role: str) -> int | None:
+        return (artifacts.get(role) or {}).get("rows")
+
+    if name in ("load", "extract"):
+        return {"rows_a": rows("a"), "rows_b": rows("b")}
+    if name == "map":
+        return {"matches": len((get("schema_mapping") or {}).get("matches") or [])}
+    if name == "entity_resolve":
+        return {"pairs": len((get("entity_resolved") or {}).get("pairs") or [])}
+    if name == "exec":
+        job = get("bq_job") or {}
+        return {"rows": rows("result"), "bytes_processed": job.get("bytes_processed"),
+                "job_id": job.get("job_id")}
+    return {}
+
+
+def _with_metrics(state: ReconState, out: Any, name: str, node_metrics: Dict[str, Any]) -> Any:
+    """Add one node's metrics to state.metrics = {"nodes": {...}, "totals": {...}}."""
+    metrics = dict(state.metrics or {})
+    nodes = {**(metrics.get("nodes") or {}), name: node_metrics}
+    totals: Dict[str, Any] = {}
+    for m in nodes.values():
+        for k, v in m.items():
+            if isinstance(v, (int, float)) and not k.endswith("_delta_bytes"):
+                totals[k] = round(totals.get(k, 0) + v, 1)
+    metrics.update(nodes=nodes, totals=totals)
+    if isinstance(out, Mapping):
+        return {**out, "metrics": metrics}
+    out.metrics = metrics
+    return out
+
+
+def _tracked(name, fn):
+    """
+    Publish the node as the run's current stage before it starts, and emit
+    node_start / node_end (or node_error) events with its duration. Wall
+    time, RSS growth, connector rows, BigQuery bytes / slot-ms and LLM
+    tokens are measured per node and kept in state.metrics.
+    """
+    def wrapper(state: ReconState) -> ReconState:
+        run_registry.update(state.run_id, stage=name)
+        run_registry.emit(state.run_id, "node_start", node=name)
+        t0 = time.perf_counter()
+        try:
+            with span(f"node.{name}", **{"recon.run_id": state.run_id, "recon.node": name}) as sp:
+                with measure_node(name) as m:
+                    out = fn(state)
+                for k, v in m.to_dict().items():
+                    if v is not None:
+                        sp.set_attribute(f"recon.{k}", v)
+        except Exception as e:
+            run_registry.emit(state.run_id, "node_error", node=name,
+                              duration_ms=round((time.perf_counter() - t0) * 1000, 1), error=str(e))
+            raise
+        node_metrics = m.to_dict()
+        run_registry.emit(state.run_id, "node_end", node=name,
+                          duration_ms=node_metrics["wall_ms"],
+                          **_node_stats(name, out), metrics=node_metrics)
+        return _with_metrics(state, out, name, node_metrics)
 
-    return state
+    wrapper.__name__ = getattr(fn, "__name__", name)
+    return wrapper
 
 
 def build_graph():
     g = StateGraph(ReconState)
 
     # Nodes
-    g.add_node("load", node_load)
-    g.add_node("materialize_sources", materialize_sources)  # stays
-    g.add_node("map", node_map)
-    g.add_node("approval_node", node_approval)
-    g.add_node("await", node_await)               # used for PENDING_APPROVAL stop
-    g.add_node("entity_resolve", node_entity_resolve)
-    g.add_node("sql_node", node_sql)              # just builds SQL via qs
-    g.add_node("exec", node_exec)                 # runs SQL on BQ, sets result_df
-    g.add_node("explain", node_explain)
+    g.add_node("load", _tracked("load", node_load))
+    g.add_node("profile", _tracked("profile", node_profile))
+    g.add_node("materialize_sources", _tracked("materialize_sources", materialize_sources))  # waits for staging
+    g.add_node("map", _tracked("map", node_map))
+    g.add_node("approval_node", _tracked("approval_node", node_approval))
+    g.add_node("await", _tracked("await", node_await))               # used for PENDING_APPROVAL stop
+    g.add_node("extract", _tracked("extract", node_extract))         # projected full extraction + staging
+    g.add_node("entity_resolve", _tracked("entity_resolve", node_entity_resolve))
+    g.add_node("sql_node", _tracked("sql_node", node_sql))              # just builds SQL via qs
+    g.add_node("exec", _tracked("exec", node_exec))                 # runs SQL on BQ, stores the result artifact
 
     # Edges
     g.add_edge(START, "load")
 
-    # load -> materialize_sources -> map
-    g.add_edge("load", "materialize_sources")
-    g.add_edge("materialize_sources", "map")
+    # load -> profile -> map (on the bounded samples, both passes)
+    g.add_edge("load", "profile")
+    g.add_edge("profile", "map")
 
     # map -> approval
     g.add_edge("map", "approval_node")
 
     # After approval:
     # - First call (/reconcile): status=PENDING_APPROVAL → go to "await" → END (front-end shows mapping)
-    # - Second call (/reconcile/approve): status=APPROVED → go to "entity_resolve"
+    # - Second call (/reconcile/approve): status=APPROVED → go to "extract"
     g.add_conditional_edges(
         "approval_node",
         decide_after_approval,
         {
-            "entity_resolve": "entity_resolve",
+            "extract": "extract",
             "await": "await",
         },
     )
 
     g.add_edge("await", END)
 
-    # After entity resolution, always go to SQL synthesis node
-    g.add_edge("entity_resolve", "sql_node")
+    # extraction of the approved columns starts staging in the background
+    g.add_edge("extract", "entity_resolve")
+
+    # After entity resolution, wait for the staged tables, then SQL synthesis
+    g.add_edge("entity_resolve", "materialize_sources")
+    g.add_edge("materialize_sources", "sql_node")
 
     # After SQL synthesis:
-    # - Normal flow: run exec first, then explain
-    # - Optional: if you ever support a "dry run" mode, you can jump straight to explain
+    # - Normal flow: run exec, then return the rows right away; the
+    #   explanation is generated off the request path (see run_graph)
+    # - Optional: if you ever support a "dry run" mode, end without exec
     g.add_conditional_edges(
         "sql_node",
         decide_after_sql,
         {
             "exec": "exec",
-            "explain": "explain",
+            "end": END,
         },
     )
 
-    g.add_edge("exec", "explain")
-    g.add_edge("explain", END)
+    g.add_edge("exec", END)
 
     return g.compile()
 
 
 graph = build_graph()
 
+# explanations run here, after the rows have been returned
+_explain_pool = ThreadPoolExecutor(max_workers=settings.explain_workers, thread_name_prefix="explain")
+
+
+def _explain_in_background(state: ReconState) -> None:
+    try:
+        with span("recon.explain", **{"recon.run_id": state.run_id}):
+            node_explain(state)
+        run_registry.annotate(state.run_id, explanation={
+            "status": "READY",
+            "explanation": state.explanation,
+            "diagnostics": state.diagnostics,
+        })
+    except Exception as e:
+        logger.error("[explain] background explanation failed: %s", e, exc_info=True)
+        run_registry.annotate(state.run_id, explanation={"status": "FAILED", "error": str(e)})
+    finally:
+        # the result rows stay for GET /runs/{run_id}/result until the run is evicted
+        _drop_sources(state.artifacts)
+
+
+def _drop_sources(artifacts: Optional[Dict[str, Any]]) -> None:
+    for role in ("a", "b"):
+        artifact_store.drop(((artifacts or {}).get(role) or {}).get("handle") or "")
+
+
+def _field(final: Any, name: str) -> Any:
+    return final.get(name) if isinstance(final, Mapping) else getattr(final, name, None)
+
+
+def _start_explanation(final: Any) -> Dict[str, Any]:
+    """
+    Explain the run's mismatches. With explain_async (the default) this is
+    queued and the caller gets explanation_status=PENDING; the text arrives
+    at GET /api/runs/{run_id}/explanation. Runs that stopped before SQL
+    synthesis (pending approval) are not explained.
+    """
+    state = final if isinstance(final, ReconState) else ReconState(**dict(final))
+    if not state.sql:
+        return {}
+
+    result_rows = ((state.artifacts or {}).get("result") or {}).get("rows")
+    if settings.explain_async and result_rows:
+        run_registry.annotate(state.run_id, explanation={"status": "PENDING"})
+        # carries the run's trace context into the pool thread
+        _explain_pool.submit(with_context(_explain_in_background), state)
+        return {"explanation_status": "PENDING"}
+
+    node_explain(state)
+    run_registry.annotate(state.run_id, explanation={
+        "status": "READY",
+        "explanation": state.explanation,
+        "diagnostics": state.diagnostics,
+    })
+    return {"explanation_status": "READY", "explanation": state.explanation, "diagnostics": state.diagnostics}
+
 def run_graph(payload: dict) -> dict:
     logger.info("RUN_GRAPH_VERSION: 2025-12-04-REV3")
 
+    payload = {**payload, "run_id": payload.get("run_id") or run_registry.new_id()}
+    # metrics and artifact handles are the server's; never start from ones
+    # echoed back by a client (e.g. the previous result posted to /reconcile/approve)
+    payload.pop("metrics", None)
+    payload.pop("artifacts", None)
     try:
         state = ReconState(**payload)
     except ValidationError as e:
         logger.error("ReconState validation error: %s", e.json())
         raise
 
-    # Run the graph →
-    final = graph.invoke(state)
-
-    # ---------------------------------------------------------
-    # REMOVE ALL DATAFRAMES (any possible location)
-    # ---------------------------------------------------------
-
+    run_registry.start(state.run_id)
 
-    # Remove full DataFrames
-    for attr in ["data_a", "data_b", "df_a_sample", "df_b_sample",
-                 "entity_resolved"]:
-        if hasattr(final, attr):
-            val = getattr(final, attr)
-            if isinstance(val, pd.DataFrame):
-                setattr(final, attr, None)
-            elif isinstance(val, dict):
-                # If dict contains DFs (entity_resolved often does)
-                for k, v in list(val.items()):
-                    if isinstance(v, pd.DataFrame):
-                        val[k] = None
-                setattr(final, attr, val)
-
-
-    # Convert result_df → result list
-    if hasattr(final, "result_df") and isinstance(final.result_df, pd.DataFrame):
+    # Run the graph → (streamed; every chunk is the full state after a step)
+    with span("recon.run", **{"recon.run_id": state.run_id}) as root:
+        run_registry.annotate(state.run_id, **trace_ids())
         try:
-            final.result = final.result_df.to_dict(orient="records")
+            final = state
+            for final in graph.stream(state, stream_mode="values"):
+                pass
         except Exception as e:
-            logger.error("[run_graph] DF → JSON conversion failed: %s", e)
-            final.result = []
-        final.result_df = None
-
-    # ---------------------------------------------------------
-    # Handle Pydantic vs AddableValuesDict
-    # ---------------------------------------------------------
-
-    if hasattr(final, "dict"):
-        result = final.dict()
-    else:
-        result = dict(final)
-
-    # Absolute safety: RE-SCAN for any leftover DataFrames (deep)
-    def df_sanitizer(obj):
-        if isinstance(obj, pd.DataFrame):
-            return None
-        if isinstance(obj, list):
-            return [df_sanitizer(x) for x in obj]
-        if isinstance(obj, dict):
-            return {k: df_sanitizer(v) for k, v in obj.items()}
-        return obj
+            _cancel_staging(state.run_id)
+            artifact_store.drop_run(state.run_id)
+            run_registry.finish(state.run_id, "FAILED", error=str(e))
+            raise
+        # e.g. a dry run that never reached materialize_sources
+        _cancel_staging(state.run_id)
+        root.set_attribute("recon.status", str(_field(final, "status")))
+
+        # ---------------------------------------------------------
+        # Handle Pydantic vs AddableValuesDict
+        # ---------------------------------------------------------
+
+        if hasattr(final, "dict"):
+            result = final.dict()
+        else:
+            result = dict(final)
+
+        # Result artifact → result list (state itself holds no DataFrames);
+        # read before a background explanation can release it
+        result_df = _frame(result, "result")
+        if result_df is not None:
+            try:
+                result["result"] = result_df.to_dict(orient="records")
+            except Exception as e:
+                logger.error("[run_graph] DF → JSON conversion failed: %s", e)
+                result["result"] = []
+
+        explained = _start_explanation(final)
+    result.update(explained)
+
+    # sources are done with once any background explanation ran; the result
+    # rows stay in the artifact store (spilled to disk under memory pressure)
+    # until the registry evicts the run
+    if explained.get("explanation_status") != "PENDING":
+        _drop_sources(result.get("artifacts"))
+
+    # the registry keeps the result without its rows (see stored_result)
+    summary = {k: v for k, v in result.items() if k != "result"}
+    run_registry.finish(result.get("run_id"), result.get("status") or "DONE", result=summary)
+    return result
 
-    result = df_sanitizer(result)
 
-    return result
+def stored_result(run_id: str) -> Optional[dict]:
+    """
+    A finished run's result as run_graph returned it, with the rows read
+    back from the artifact store (result=None once they have expired).
+    None for an unknown or unfinished run.
+    """
+    summary = run_registry.result(run_id)
+    if summary is None:
+        return None
+    df = _frame(summary, "result")
+    return {**summary, "result": df.to_dict(orient="records") if df is not None else None}
 
@@ -2,6 +2,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from backend.routes import router  # whatever you already have
+from backend.providers.factory import close_llm_providers
 
 app = FastAPI(title="Agentic AI Reconciliation v3")
 
@@ -24,6 +25,13 @@ app.add_middleware(
 
 app.include_router(router, prefix="/api")
 
+
+@app.on_event("shutdown")
+def shutdown():
+    # LLM connection pools are long-lived; close them explicitly
+    close_llm_providers()
+
+
 @app.get("/api/health")
 def health():
     return {"status": "ok"}
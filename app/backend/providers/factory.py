@@ -1,22 +1,50 @@
 # providers/factory.py
+import threading
+from typing import Dict, Tuple
+
 from backend.config import settings
 
+from .llm_provider import LLMProvider
 from .openai_provider import OpenAILLM
 from .mock_provider import MockLLM
 from .gemini_provider import GeminiLLM
+from .llm_cache import CachedLLM
 
+# one provider (and thus one underlying client) per process and configuration
+_PROVIDERS: Dict[Tuple[str, bool], LLMProvider] = {}
+_PROVIDERS_LOCK = threading.Lock()
 
-def get_llm_provider():
-    provider = settings.recon_model_provider.lower()
 
+def _build(provider: str, cache: bool) -> LLMProvider:
     if provider == "openai":
-        return OpenAILLM()
-
-    if provider == "gemini":
-        return GeminiLLM()
-
-    if provider == "mock":
+        llm = OpenAILLM()
+    elif provider == "gemini":
+        llm = GeminiLLM()
+    elif provider == "mock":
         return MockLLM()
+    else:
+        raise ValueError(f"Unknown LLM provider: {provider}")
+
+    if cache and settings.llm_cache_enabled:
+        return CachedLLM(llm)
+    return llm
 
-    raise ValueError(f"Unknown LLM provider: {provider}")
 
+def get_llm_provider(cache: bool = True) -> LLMProvider:
+    provider = settings.recon_model_provider.lower()
+    key = (provider, cache)
+
+    with _PROVIDERS_LOCK:
+        llm = _PROVIDERS.get(key)
+        if llm is None:
+            llm = _PROVIDERS[key] = _build(provider, cache)
+    return llm
+
+
+def close_llm_providers() -> None:
+    """Close every provider's clients; the next get_llm_provider builds fresh ones."""
+    with _PROVIDERS_LOCK:
+        providers = list(_PROVIDERS.values())
+        _PROVIDERS.clear()
+    for llm in providers:
+        llm.close()
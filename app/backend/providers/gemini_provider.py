@@ -1,18 +1,66 @@
+import asyncio
+import threading
+import time
+
 from .llm_provider import LLMProvider
 from backend.config import settings
+from backend.utils.async_utils import run_sync
+
+try:
+    from google.api_core import exceptions as google_exceptions
+except ImportError:  # pragma: no cover - optional dependency
+    google_exceptions = None
+
+
+def _retryable_errors():
+    if google_exceptions is None:
+        return ()
+    return (
+        google_exceptions.TooManyRequests,
+        google_exceptions.ResourceExhausted,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.InternalServerError,
+    )
+
+
+async def _vertex_deadline(aw, timeout: float):
+    """
+    The Vertex SDK takes no per-request timeout (AI Studio's
+    request_options does): bound the call here and surface it as the same
+    DeadlineExceeded, so it is retried like one.
+    """
+    try:
+        return await asyncio.wait_for(aw, max(timeout, 0.0))
+    except asyncio.TimeoutError:
+        raise google_exceptions.DeadlineExceeded(
+            f"Vertex call exceeded llm_timeout_s={settings.llm_timeout_s}"
+        ) from None
 
 
 class GeminiLLM(LLMProvider):
+    name = "gemini"
     _client = None
     _mode = None  # "vertex" or "api"
+    _initialised = False
+    _init_lock = threading.Lock()
+
+    retryable_errors = _retryable_errors()
 
     @classmethod
     def init_client(cls):
         """
-        Auto-select client:
+        Auto-select client (once per process):
         - Vertex AI if GOOGLE_PROJECT_ID is set
         - Google AI Studio if GOOGLE_API_KEY is set
         """
+        with cls._init_lock:
+            if not cls._initialised:
+                cls._init_client()
+                cls._initialised = True
+
+    @classmethod
+    def _init_client(cls):
         # Prefer Vertex mode
         if settings.google_project_id:
             try:
@@ -49,7 +97,43 @@ class GeminiLLM(LLMProvider):
         cls._client = None
         cls._mode = None
 
-    def chat(self, prompt: str) -> str:
+    def identity(self):
+        if not GeminiLLM._initialised:
+            GeminiLLM.init_client()
+        if GeminiLLM._client is None:
+            return "mock", ""
+        return f"{self.name}-{GeminiLLM._mode}", settings.gemini_model
+
+    @staticmethod
+    def _full_prompt(prompt: str) -> str:
+        # Build system + user message (Gemini supports "messages" but via different API)
+        system_instruction = "Be precise, return JSON when asked, no markdown."
+        return f"{system_instruction}\n\nUser: {prompt}"
+
+    @staticmethod
+    def _text(response) -> str:
+        if hasattr(response, "text"):
+            return response.text
+
+        # fallback if vertex response is structured differently
+        try:
+            cand = response.candidates[0]
+            part = cand.content.parts[0]
+            return part.text
+        except Exception:
+            raise RuntimeError(
+                "GeminiLLM (Vertex): unexpected response structure."
+            )
+
+    def _usage(self, response) -> None:
+        meta = getattr(response, "usage_metadata", None)
+        if meta is not None:
+            self._record_usage(
+                getattr(meta, "prompt_token_count", None),
+                getattr(meta, "candidates_token_count", None),
+            )
+
+    def _chat(self, prompt: str) -> str:
         """
         Mirror OpenAILLM behaviour:
         - If client missing → fallback to MockLLM
@@ -58,37 +142,106 @@ class GeminiLLM(LLMProvider):
         """
 
         # Init client if needed
-        if GeminiLLM._client is None:
+        if not GeminiLLM._initialised:
             GeminiLLM.init_client()
 
         # If still no client → mock fallback
         if GeminiLLM._client is None:
             from .mock_provider import MockLLM
-            return MockLLM().chat(prompt)
+            return MockLLM()._chat(prompt)
 
-        # Build system + user message (Gemini supports "messages" but via different API)
-        system_instruction = "Be precise, return JSON when asked, no markdown."
-        full_prompt = f"{system_instruction}\n\nUser: {prompt}"
+        full_prompt = self._full_prompt(prompt)
 
         # ---- Vertex AI mode ----
         if GeminiLLM._mode == "vertex":
-            response = GeminiLLM._client.generate_content(full_prompt)
-            if hasattr(response, "text"):
-                return response.text
-
-            # fallback if vertex response is structured differently
-            try:
-                cand = response.candidates[0]
-                part = cand.content.parts[0]
-                return part.text
-            except Exception:
-                raise RuntimeError(
-                    "GeminiLLM (Vertex): unexpected response structure."
-                )
+            # sync callers run the async call on the shared loop, under the deadline
+            response = run_sync(_vertex_deadline(
+                GeminiLLM._client.generate_content_async(full_prompt), settings.llm_timeout_s
+            ))
+            self._usage(response)
+            return self._text(response)
 
         # ---- Google AI Studio API mode ----
         if GeminiLLM._mode == "api":
-            response = GeminiLLM._client.generate_content(full_prompt)
+            response = GeminiLLM._client.generate_content(
+                full_prompt,
+                request_options={"timeout": settings.llm_timeout_s},
+            )
+            self._usage(response)
+            return response.text
+
+        raise RuntimeError("GeminiLLM: invalid internal mode state.")
+
+    def _stream(self, prompt: str):
+        if not GeminiLLM._initialised:
+            GeminiLLM.init_client()
+
+        if GeminiLLM._client is None:
+            from .mock_provider import MockLLM
+            yield from MockLLM()._stream(prompt)
+            return
+
+        if GeminiLLM._mode == "vertex":
+            chunks = self._vertex_stream(self._full_prompt(prompt))
+        else:
+            chunks = GeminiLLM._client.generate_content(
+                self._full_prompt(prompt),
+                stream=True,
+                request_options={"timeout": settings.llm_timeout_s},
+            )
+        last = None
+        for chunk in chunks:
+            last = chunk
+            text = getattr(chunk, "text", None)
+            if text:
+                yield text
+        # cumulative usage is reported on the last chunk
+        if last is not None:
+            self._usage(last)
+
+    @staticmethod
+    def _vertex_stream(full_prompt: str):
+        """Vertex streamed chunks, the whole stream bounded by llm_timeout_s."""
+        deadline = time.monotonic() + settings.llm_timeout_s
+        stream = run_sync(_vertex_deadline(
+            GeminiLLM._client.generate_content_async(full_prompt, stream=True), settings.llm_timeout_s
+        ))
+        it = stream.__aiter__()
+        end = object()
+        try:
+            while True:
+                chunk = run_sync(_vertex_deadline(anext(it, end), deadline - time.monotonic()))
+                if chunk is end:
+                    return
+                yield chunk
+        finally:
+            if hasattr(it, "aclose"):
+                run_sync(it.aclose())
+
+    async def _achat(self, prompt: str) -> str:
+        """Native async variant (generate_content_async in both modes)."""
+        if not GeminiLLM._initialised:
+            GeminiLLM.init_client()
+
+        if GeminiLLM._client is None:
+            from .mock_provider import MockLLM
+            return MockLLM()._chat(prompt)
+
+        full_prompt = self._full_prompt(prompt)
+
+        if GeminiLLM._mode == "vertex":
+            response = await _vertex_deadline(
+                GeminiLLM._client.generate_content_async(full_prompt), settings.llm_timeout_s
+            )
+            self._usage(response)
+            return self._text(response)
+
+        if GeminiLLM._mode == "api":
+            response = await GeminiLLM._client.generate_content_async(
+                full_prompt,
+                request_options={"timeout": settings.llm_timeout_s},
+            )
+            self._usage(response)
             return response.text
 
         raise RuntimeError("GeminiLLM: invalid internal mode state.")
@@ -0,0 +1,235 @@
+# providers/llm_cache.py
+"""
+Content-addressed cache for LLM responses.
+
+Key = sha256(provider, model, prompt). Two tiers:
+  - in-process LRU (hot prompts within a worker)
+  - SQLite on local disk (shared across runs / workers on the same host)
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from backend.config import settings
+from backend.utils.logger import logger
+
+from .llm_provider import LLMProvider, LLMStream
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    key        TEXT PRIMARY KEY,
+    provider   TEXT NOT NULL,
+    model      TEXT NOT NULL,
+    response   TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used  REAL NOT NULL
+)
+"""
+
+
+def prompt_key(provider: str, model: str, prompt: str) -> str:
+    h = hashlib.sha256()
+    for part in (provider, model, prompt):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class LLMResponseCache:
+    def __init__(self, path: Optional[str], memory_size: int, ttl_s: int, max_disk_entries: int):
+        self.path = path
+        self.memory_size = memory_size
+        self.ttl_s = ttl_s
+        self.max_disk_entries = max_disk_entries
+        self._mem: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (response, created_at)
+        self._lock = threading.Lock()
+        self._ready = False
+        self._stats: Dict[str, int] = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "errors": 0}
+
+    # ---- disk tier ----
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            if not self._ready:
+                conn.execute(_SCHEMA)
+                self._ready = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _disk_get(self, key: str, now: float) -> Optional[tuple]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_s:
+                conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE llm_responses SET last_used = ? WHERE key = ?", (now, key))
+        return row[0], row[1]
+
+    def _disk_put(self, key: str, provider: str, model: str, response: str, now: float) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, provider, model, response, created_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, provider, model, response, now, now),
+            )
+            conn.execute(
+                "DELETE FROM llm_responses WHERE key IN ("
+                " SELECT key FROM llm_responses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,),
+            )
+
+    # ---- memory tier ----
+    def _mem_put(self, key: str, entry: tuple) -> None:
+        self._mem[key] = entry
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.memory_size:
+            self._mem.popitem(last=False)
+
+    # ---- public ----
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._mem.get(key)
+            if entry is not None and now - entry[1] <= self.ttl_s:
+                self._mem.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return entry[0]
+            if entry is not None:
+                del self._mem[key]
+
+        entry = None
+        if self.path:
+            try:
+                entry = self._disk_get(key, now)
+            except Exception as e:
+                logger.error("llm_cache: disk read failed: %s", e)
+                with self._lock:
+                    self._stats["errors"] += 1
+
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._mem_put(key, entry)
+        return entry[0]
+
+    def put(self, key: str, provider: str, model: str, response: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._mem_put(key, (response, now))
+            self._stats["stores"] += 1
+        if self.path:
+            try:
+                self._disk_put(key, provider, model, response, now)
+            except Exception as e:
+                logger.error("llm_cache: disk write failed: %s", e)
+                with self._lock:
+                    self._stats["errors"] += 1
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            out: Dict[str, float] = dict(self._stats)
+            out["memory_entries"] = len(self._mem)
+        lookups = out["memory_hits"] + out["disk_hits"] + out["misses"]
+        out["hit_rate"] = round((out["memory_hits"] + out["disk_hits"]) / lookups, 4) if lookups else 0.0
+        return out
+
+
+llm_cache = LLMResponseCache(
+    path=settings.llm_cache_path or None,
+    memory_size=settings.llm_cache_memory_size,
+    ttl_s=settings.llm_cache_ttl_s,
+    max_disk_entries=settings.llm_cache_max_disk_entries,
+)
+
+
+class CachedLLM(LLMProvider):
+    """
+    Transparent caching wrapper: identical (provider, model, prompt) triples
+    are answered from llm_cache. Errors and empty responses are not cached.
+    """
+
+    def __init__(self, inner: LLMProvider, cache: LLMResponseCache = llm_cache):
+        self.inner = inner
+        self.cache = cache
+        self.name = inner.name
+
+    def identity(self):
+        return self.inner.identity()
+
+    def close(self) -> None:
+        self.inner.close()
+
+    def _chat(self, prompt: str) -> str:
+        return self.inner.chat(prompt)
+
+    async def _achat(self, prompt: str) -> str:
+        return await self.inner.achat(prompt)
+
+    def chat(self, prompt: str) -> str:
+        provider, model = self.inner.identity()
+        key = prompt_key(provider, model, prompt)
+
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+
+        response = self._chat(prompt)
+        if response:
+            self.cache.put(key, provider, model, response)
+        return response
+
+    async def achat(self, prompt: str) -> str:
+        provider, model = self.inner.identity()
+        key = prompt_key(provider, model, prompt)
+
+        hit = self.cache.get(key)
+        if hit is not None:
+            return hit
+
+        response = await self._achat(prompt)
+        if response:
+            self.cache.put(key, provider, model, response)
+        return response
+
+    def stream(self, prompt: str) -> LLMStream:
+        provider, model = self.inner.identity()
+        key = prompt_key(provider, model, prompt)
+
+        hit = self.cache.get(key)
+        if hit is not None:
+            return LLMStream(iter([hit]))
+
+        inner = self.inner.stream(prompt)
+
+        def chunks():
+            parts = []
+            try:
+                for chunk in inner:
+                    parts.append(chunk)
+                    yield chunk
+            finally:
+                inner.close()
+            # only completions that streamed to the end are cached
+            response = "".join(parts)
+            if response and not inner.cancelled:
+                self.cache.put(key, provider, model, response)
+
+        return LLMStream(chunks(), on_cancel=inner.cancel)
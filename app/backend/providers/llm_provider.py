@@ -1,6 +1,358 @@
+import asyncio
+import random
+import threading
+import time
 from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from backend.config import settings
+from backend.utils.async_utils import bounded_gather, on_shared_loop, run_sync, submit
+from backend.utils.logger import logger
+from backend.utils.metrics import record_llm_tokens
+from backend.utils.tracing import set_attributes, span, start_span
+
+class _Slots:
+    """
+    Process-wide cap on in-flight LLM calls, shared by sync and async
+    callers: throttled or slow providers make callers wait here (up to
+    llm_queue_timeout_s) instead of piling up requests. Waiters are served
+    in arrival order; release() hands the slot straight to the next one
+    (an Event for threads, a future completed on its loop for coroutines).
+    """
+
+    def __init__(self, n: int):
+        self._free = n
+        self._lock = threading.Lock()
+        # each waiter's wake() takes over a freed slot; False if it cannot
+        self._waiters: Deque[Callable[[], bool]] = deque()
+
+    def acquire(self, timeout: float) -> bool:
+        got = threading.Event()
+
+        def wake() -> bool:
+            got.set()
+            return True
+
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return True
+            self._waiters.append(wake)
+        if got.wait(timeout):
+            return True
+        with self._lock:
+            if wake in self._waiters:
+                self._waiters.remove(wake)
+                return False
+        return True  # handed over just as the wait timed out
+
+    async def aacquire(self, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+
+        def wake() -> bool:
+            try:
+                loop.call_soon_threadsafe(self._granted, fut)
+                return True
+            except RuntimeError:  # its loop is closed
+                return False
+
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return True
+            self._waiters.append(wake)
+        timer = loop.call_later(timeout, lambda: fut.done() or fut.set_result(False))
+        granted = False
+        try:
+            granted = await fut
+            return granted
+        finally:
+            timer.cancel()
+            if not granted:
+                with self._lock:
+                    queued = wake in self._waiters
+                    if queued:
+                        self._waiters.remove(wake)
+                # handed over but not taken (timed out / cancelled): give it back,
+                # unless _granted is still pending and will do so itself
+                if not queued and fut.done() and not fut.cancelled() and fut.result():
+                    self.release()
+
+    def _granted(self, fut: "asyncio.Future[bool]") -> None:
+        # runs on the waiter's loop
+        if fut.done():
+            self.release()  # it gave up meanwhile
+        else:
+            fut.set_result(True)
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                if self._waiters.popleft()():
+                    return
+            self._free += 1
+
+
+_LLM_SLOTS = _Slots(settings.llm_max_concurrency)
+
+
+class _SlotHold:
+    """One stream's LLM slot: released at most once, by the stream's end or a cancel."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._held = False
+
+    def acquire(self, timeout: float) -> bool:
+        ok = _LLM_SLOTS.acquire(timeout)
+        if ok:
+            with self._lock:
+                self._held = True
+        return ok
+
+    def release(self) -> None:
+        with self._lock:
+            if not self._held:
+                return
+            self._held = False
+        _LLM_SLOTS.release()
+
+
+class LLMStream:
+    """
+    Iterator over a streamed completion's text chunks.
+
+    cancel() may be called from any thread (e.g. by a consumer whose
+    deadline passed while the reader is blocked on the next chunk): it frees
+    the LLM slot at once. The blocked read returns on its own (next chunk,
+    or llm_timeout_s), after which the stream stops and closes.
+    """
+
+    def __init__(self, chunks: Iterator[str], on_cancel: Optional[Callable[[], None]] = None):
+        self._chunks = chunks
+        self._on_cancel = on_cancel
+        self.cancelled = False
+
+    def __iter__(self) -> "LLMStream":
+        return self
+
+    def __next__(self) -> str:
+        if self.cancelled:
+            self.close()
+            raise StopIteration
+        return next(self._chunks)
+
+    def close(self) -> None:
+        close = getattr(self._chunks, "close", None)
+        if close is not None:
+            close()
+
+    def cancel(self) -> None:
+        self.cancelled = True
+        if self._on_cancel is not None:
+            self._on_cancel()
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for retry number `attempt` (0-based)."""
+    delay = min(settings.llm_retry_max_delay_s, settings.llm_retry_base_delay_s * (2 ** attempt))
+    return delay * random.uniform(0.5, 1.0)
+
+
+# -------------------------------------------------------
+# Per-call latency
+# -------------------------------------------------------
+class LLMCallStats:
+    """Latency of completed provider calls (including retries), per provider."""
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._window = window
+        self._latency: Dict[str, deque] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+
+    def record(self, provider: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            self._latency.setdefault(provider, deque(maxlen=self._window)).append(seconds)
+            c = self._counts.setdefault(provider, {"calls": 0, "errors": 0})
+            c["calls"] += 1
+            if not ok:
+                c["errors"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            out: Dict[str, Dict[str, Any]] = {}
+            for provider, lat in self._latency.items():
+                xs = sorted(lat)
+                out[provider] = {
+                    **self._counts[provider],
+                    "latency_p50_s": round(xs[len(xs) // 2], 4),
+                    "latency_p95_s": round(xs[min(len(xs) - 1, int(len(xs) * 0.95))], 4),
+                    "latency_max_s": round(xs[-1], 4),
+                }
+            return out
+
+
+call_stats = LLMCallStats()
+
 
 class LLMProvider(ABC):
-    @abstractmethod
+    name = "base"
+
+    # transient errors worth retrying (provider specific)
+    retryable_errors: Tuple[Type[BaseException], ...] = ()
+
     def chat(self, prompt: str) -> str:
+        """
+        Bounded, retried call into the provider's _chat.
+        """
+        if not _LLM_SLOTS.acquire(timeout=settings.llm_queue_timeout_s):
+            raise RuntimeError(
+                f"{type(self).__name__}: no free LLM slot after {settings.llm_queue_timeout_s}s"
+            )
+        started, ok = time.perf_counter(), False
+        try:
+            with self._span("llm.chat", prompt) as sp:
+                attempt = 0
+                while True:
+                    try:
+                        out = self._chat(prompt)
+                        ok = True
+                        sp.set_attribute("llm.attempts", attempt + 1)
+                        return out
+                    except self.retryable_errors as e:
+                        if attempt >= settings.llm_max_retries:
+                            raise
+                        delay = self._log_retry(e, attempt)
+                        time.sleep(delay)
+                        attempt += 1
+        finally:
+            _LLM_SLOTS.release()
+            call_stats.record(self.identity()[0], time.perf_counter() - started, ok)
+
+    async def achat(self, prompt: str) -> str:
+        """
+        Async counterpart of chat(): same retry policy and the same
+        process-wide slots. Runs on the shared loop, where the providers'
+        async clients live; awaiting it from another loop hops over.
+        """
+        if not on_shared_loop():
+            return await asyncio.wrap_future(submit(self.achat(prompt)))
+        if not await _LLM_SLOTS.aacquire(settings.llm_queue_timeout_s):
+            raise RuntimeError(
+                f"{type(self).__name__}: no free LLM slot after {settings.llm_queue_timeout_s}s"
+            )
+        started, ok = time.perf_counter(), False
+        try:
+            with self._span("llm.achat", prompt) as sp:
+                attempt = 0
+                while True:
+                    try:
+                        out = await self._achat(prompt)
+                        ok = True
+                        sp.set_attribute("llm.attempts", attempt + 1)
+                        return out
+                    except self.retryable_errors as e:
+                        if attempt >= settings.llm_max_retries:
+                            raise
+                        delay = self._log_retry(e, attempt)
+                        await asyncio.sleep(delay)
+                        attempt += 1
+        finally:
+            _LLM_SLOTS.release()
+            call_stats.record(self.identity()[0], time.perf_counter() - started, ok)
+
+    async def achat_many(self, prompts: Sequence[str], limit: Optional[int] = None) -> List[Any]:
+        """
+        Concurrent achat over prompts, at most `limit` in flight. Returns
+        responses in input order, with exceptions in place of failed calls.
+        """
+        limit = limit or settings.llm_max_concurrency
+        return await bounded_gather([lambda p=p: self.achat(p) for p in prompts], limit)
+
+    def chat_many(self, prompts: Sequence[str], limit: Optional[int] = None) -> List[Any]:
+        """Synchronous entry point for achat_many, run on the shared loop."""
+        if not prompts:
+            return []
+        return run_sync(self.achat_many(prompts, limit))
+
+    def stream(self, prompt: str) -> LLMStream:
+        """
+        Streamed completion as text chunks. Holds an LLM slot until the
+        stream is exhausted, closed or cancelled; transient errors are
+        retried only before the first chunk arrives.
+        """
+        slot = _SlotHold()
+        return LLMStream(self._held_stream(prompt, slot), on_cancel=slot.release)
+
+    def _held_stream(self, prompt: str, slot: _SlotHold) -> Iterator[str]:
+        if not slot.acquire(timeout=settings.llm_queue_timeout_s):
+            raise RuntimeError(
+                f"{type(self).__name__}: no free LLM slot after {settings.llm_queue_timeout_s}s"
+            )
+        started, ok = time.perf_counter(), False
+        provider, model = self.identity()
+        sp = start_span("llm.stream", **{"llm.provider": provider, "llm.model": model, "llm.prompt_chars": len(prompt)})
+        try:
+            attempt = 0
+            while True:
+                chunks = self._stream(prompt)
+                try:
+                    first = next(chunks, None)
+                    break
+                except self.retryable_errors as e:
+                    if attempt >= settings.llm_max_retries:
+                        raise
+                    time.sleep(self._log_retry(e, attempt))
+                    attempt += 1
+            if first is not None:
+                yield first
+                yield from chunks
+            ok = True
+        finally:
+            sp.set_attribute("llm.ok", ok)
+            sp.end()
+            slot.release()
+            call_stats.record(self.identity()[0], time.perf_counter() - started, ok)
+
+    def _log_retry(self, e: BaseException, attempt: int) -> float:
+        delay = backoff_delay(attempt)
+        logger.warning(
+            "%s: transient error (%s), retry %d/%d in %.2fs",
+            type(self).__name__, type(e).__name__, attempt + 1, settings.llm_max_retries, delay,
+        )
+        return delay
+
+    @abstractmethod
+    def _chat(self, prompt: str) -> str:
         ...
+
+    async def _achat(self, prompt: str) -> str:
+        # providers without a native async client run the sync call in a thread
+        return await asyncio.to_thread(self._chat, prompt)
+
+    def _stream(self, prompt: str) -> Iterator[str]:
+        # providers without native streaming yield the whole completion once
+        yield self._chat(prompt)
+
+    def close(self) -> None:
+        """Release the provider's clients / connection pools (process shutdown)."""
+
+    def identity(self) -> Tuple[str, str]:
+        """
+        (provider, model) that will actually answer the next call; used to
+        key response caches. Providers that fall back to the mock report it.
+        """
+        return self.name, ""
+
+    def _span(self, name: str, prompt: str):
+        provider, model = self.identity()
+        return span(name, **{"llm.provider": provider, "llm.model": model, "llm.prompt_chars": len(prompt)})
+
+    def _record_usage(self, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+        """Token counts reported by the provider, for node metrics, /metrics and the call's span."""
+        provider, model = self.identity()
+        record_llm_tokens(provider, model, prompt_tokens, completion_tokens)
+        set_attributes(**{"llm.prompt_tokens": prompt_tokens, "llm.completion_tokens": completion_tokens})
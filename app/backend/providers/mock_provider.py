@@ -1,5 +1,15 @@
 from .llm_provider import LLMProvider
 
 class MockLLM(LLMProvider):
-    def chat(self, prompt: str) -> str:
+    name = "mock"
+
+    def _chat(self, prompt: str) -> str:
         return "MOCK_RESPONSE: " + prompt[:400]
+
+    async def _achat(self, prompt: str) -> str:
+        return self._chat(prompt)
+
+    def _stream(self, prompt: str):
+        text = self._chat(prompt)
+        for i in range(0, len(text), 32):
+            yield text[i:i + 32]
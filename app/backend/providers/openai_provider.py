@@ -1,28 +1,142 @@
+import threading
+
+import httpx
+import openai
+from openai import AsyncOpenAI, OpenAI
+
 from .llm_provider import LLMProvider
 from backend.config import settings
-from openai import OpenAI
+from backend.utils.async_utils import run_sync
 
 class OpenAILLM(LLMProvider):
+    name = "openai"
     _client = None
+    # lives on the shared event loop, where every async call runs (see achat)
+    _async_client = None
+    _init_lock = threading.Lock()
+
+    retryable_errors = (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )
 
     @classmethod
     def init_client(cls):
-        if settings.openai_api_key:
-            cls._client = OpenAI(
-                api_key=settings.openai_api_key,
-                base_url=settings.openai_base_url or "https://api.openai.com/v1"
-            )
+        """
+        One client per process: a pooled httpx transport with explicit
+        timeouts. Retries are handled by LLMProvider.chat, not the SDK.
+        """
+        with cls._init_lock:
+            if cls._client is not None or not settings.openai_api_key:
+                return
+            cls._client = OpenAI(**cls._client_kwargs(), http_client=httpx.Client(limits=cls._limits()))
+
+    @staticmethod
+    def _client_kwargs() -> dict:
+        return {
+            "api_key": settings.openai_api_key,
+            "base_url": settings.openai_base_url or "https://api.openai.com/v1",
+            "timeout": httpx.Timeout(settings.llm_timeout_s, connect=settings.llm_connect_timeout_s),
+            "max_retries": 0,
+        }
+
+    @staticmethod
+    def _limits() -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=settings.llm_http_max_connections,
+            max_keepalive_connections=settings.llm_http_max_connections,
+        )
+
+    @classmethod
+    def async_client(cls):
+        """The pooled AsyncOpenAI client (None without an API key)."""
+        if not settings.openai_api_key:
+            return None
+        with cls._init_lock:
+            if cls._async_client is None:
+                cls._async_client = AsyncOpenAI(
+                    **cls._client_kwargs(), http_client=httpx.AsyncClient(limits=cls._limits())
+                )
+            return cls._async_client
+
+    def close(self) -> None:
+        with OpenAILLM._init_lock:
+            client, OpenAILLM._client = OpenAILLM._client, None
+            aclient, OpenAILLM._async_client = OpenAILLM._async_client, None
+        if client is not None:
+            client.close()
+        if aclient is not None:
+            run_sync(aclient.close())
+
+    @staticmethod
+    def _messages(prompt: str) -> list:
+        return [
+            {"role": "system", "content": "Be precise, return JSON when asked, no markdown."},
+            {"role": "user", "content": prompt},
+        ]
+
+    def _usage(self, resp) -> None:
+        usage = getattr(resp, "usage", None)
+        if usage is not None:
+            self._record_usage(usage.prompt_tokens, usage.completion_tokens)
+
+    def identity(self):
+        if OpenAILLM._client is None:
+            OpenAILLM.init_client()
+        if OpenAILLM._client is None:
+            return "mock", ""
+        return self.name, settings.openai_model
+
+    def _chat(self, prompt: str) -> str:
+        if OpenAILLM._client is None:
+            OpenAILLM.init_client()
 
-    def chat(self, prompt: str) -> str:
         if not OpenAILLM._client:
             from .mock_provider import MockLLM
-            return MockLLM().chat(prompt)
+            return MockLLM()._chat(prompt)
+
+        resp = OpenAILLM._client.chat.completions.create(
+            model=settings.openai_model,
+            messages=self._messages(prompt),
+        )
+        self._usage(resp)
+        return resp.choices[0].message.content
+
+    def _stream(self, prompt: str):
+        if OpenAILLM._client is None:
+            OpenAILLM.init_client()
+
+        if not OpenAILLM._client:
+            from .mock_provider import MockLLM
+            yield from MockLLM()._stream(prompt)
+            return
+
+        stream = OpenAILLM._client.chat.completions.create(
+            model=settings.openai_model,
+            messages=self._messages(prompt),
+            stream=True,
+            # usage arrives in a final chunk without choices
+            stream_options={"include_usage": True},
+        )
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                self._usage(chunk)
+        finally:
+            stream.close()
+
+    async def _achat(self, prompt: str) -> str:
+        client = OpenAILLM.async_client()
+        if client is None:
+            from .mock_provider import MockLLM
+            return MockLLM()._chat(prompt)
 
-        resp = OpenAI(api_key=settings.openai_api_key).chat.completions.create(
+        resp = await client.chat.completions.create(
             model=settings.openai_model,
-            messages=[
-                {"role": "system", "content": "Be precise, return JSON when asked, no markdown."},
-                {"role": "user", "content": prompt},
-            ],
+            messages=self._messages(prompt),
         )
+        self._usage(resp)
         return resp.choices[0].message.content
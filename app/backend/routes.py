@@ -1,12 +1,23 @@
 # backend/routes.py
+import hmac
 import json
 import os
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Optional
 
-from fastapi import APIRouter, Form, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Form, File, UploadFile, HTTPException, Header
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from backend.graph.orchestrator_graph import run_graph
+from backend.config import settings
+from backend.graph.orchestrator_graph import run_graph, stored_result
+from backend.providers.llm_cache import llm_cache
+from backend.providers.llm_provider import call_stats
+from backend.utils.alias_store import alias_store, dataset_pair_key
+from backend.utils.metrics import render_prometheus
+from backend.utils.profiling import MODES as PROFILE_MODES, find_profile, profile_path, profile_run, top_functions
+from backend.utils.run_registry import run_registry
 
 router = APIRouter()
 
@@ -14,20 +25,15 @@ UPLOAD_DIR = os.getenv("UPLOAD_DIR", "/tmp/recon_uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
 
-@router.post("/reconcile")
-async def reconcile(
-    dataset_a: str = Form(...),
-    dataset_b: str = Form(...),
-    thresholds: str = Form(...),
-    entities: str = Form("[]"),
-    fileA: Optional[UploadFile] = File(None),
-    fileB: Optional[UploadFile] = File(None),
-):
-    """
-    Supports both:
-    - Pure config (no files)
-    - Config + uploaded files for dataset A/B
-    """
+async def _payload_from_form(
+    dataset_a: str,
+    dataset_b: str,
+    thresholds: str,
+    entities: str,
+    run_id: Optional[str],
+    fileA: Optional[UploadFile],
+    fileB: Optional[UploadFile],
+) -> dict:
     try:
         src_a = json.loads(dataset_a)
         src_b = json.loads(dataset_b)
@@ -65,13 +71,274 @@ async def reconcile(
         "dataset_b": src_b,
         "thresholds": thresholds_obj,
         "entities": entities_obj,
+        "run_id": run_id,
     }
+    return payload
+
+
+@router.post("/reconcile")
+async def reconcile(
+    dataset_a: str = Form(...),
+    dataset_b: str = Form(...),
+    thresholds: str = Form(...),
+    entities: str = Form("[]"),
+    run_id: Optional[str] = Form(None),
+    profile: Optional[str] = Form(None),
+    fileA: Optional[UploadFile] = File(None),
+    fileB: Optional[UploadFile] = File(None),
+):
+    """
+    Supports both:
+    - Pure config (no files)
+    - Config + uploaded files for dataset A/B
 
-    result = run_graph(payload)
+    Pass a client-generated run_id to follow the run while the request is
+    open: GET /runs/{run_id} (progress) or GET /runs/{run_id}/events (SSE).
+    The graph runs in a worker thread, so these are answered meanwhile.
+    profile=cprofile|sample profiles the run;
+    download it from GET /admin/runs/{run_id}/profile.
+    """
+    payload = await _payload_from_form(dataset_a, dataset_b, thresholds, entities, run_id, fileA, fileB)
+    payload["profile"] = profile
+
+    # the graph run is blocking; keep the event loop free for progress polls
+    result = await run_in_threadpool(_run_graph, payload)
     # result is assumed to already be JSON serialisable
     return JSONResponse(content=result, status_code=200)
 
+
+# -------------------------------------------------------
+# Profiling
+# -------------------------------------------------------
+def _profile_mode(payload: dict) -> Optional[str]:
+    """Pop and validate the opt-in profile flag; assigns a run_id when set."""
+    mode = payload.pop("profile", None) or None
+    if mode is None:
+        return None
+    if mode not in PROFILE_MODES:
+        raise HTTPException(status_code=400, detail=f"profile must be one of: {', '.join(PROFILE_MODES)}")
+    payload["run_id"] = payload.get("run_id") or run_registry.new_id()
+    try:
+        profile_path(payload["run_id"], mode)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return mode
+
+
+def _run_graph(payload: dict, mode: Optional[str] = None) -> dict:
+    """run_graph, wrapped in the requested profiler (payload["profile"])."""
+    payload = dict(payload)
+    mode = mode or _profile_mode(payload)
+    if mode is None:
+        return run_graph(payload)
+
+    result, info = None, {}
+    try:
+        with profile_run(payload["run_id"], mode) as info:
+            result = run_graph(payload)
+    finally:
+        if info:
+            profile = {k: v for k, v in info.items() if k != "path"}
+            profile["download"] = f"/api/admin/runs/{payload['run_id']}/profile"
+            run_registry.annotate(payload["run_id"], profile=profile)
+            if result is not None:
+                result["profile"] = profile
+    return result
+
+
+def _require_admin(token: Optional[str]) -> None:
+    # fail closed: without a configured token the admin routes are off
+    if not settings.admin_token or not hmac.compare_digest(token or "", settings.admin_token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+@router.get("/admin/runs/{run_id}/profile")
+def run_profile(run_id: str, view: str = "raw", x_admin_token: Optional[str] = Header(None)):
+    """
+    Stored profile of a run: the .pstats (cProfile) or .collapsed (sampled
+    stacks, for flamegraph.pl / speedscope) file. view=top renders the
+    pstats top functions by cumulative time as text.
+    """
+    _require_admin(x_admin_token)
+    found = find_profile(run_id)
+    if found is None:
+        raise HTTPException(status_code=404, detail=f"No profile for run_id: {run_id}")
+    if view == "top" and found["mode"] == "cprofile":
+        return PlainTextResponse(top_functions(found["path"]))
+    return FileResponse(found["path"], media_type="application/octet-stream",
+                        filename=os.path.basename(found["path"]))
+
+
+# -------------------------------------------------------
+# Server-Sent Events
+# -------------------------------------------------------
+_SSE_KEEPALIVE_S = 15.0
+_SSE_REGISTER_WAIT_S = 10.0
+
+# streamed runs execute here; beyond stream_run_workers they wait their turn
+_stream_pool = ThreadPoolExecutor(max_workers=settings.stream_run_workers, thread_name_prefix="stream-run")
+
+
+def _sse_frame(event: dict) -> str:
+    return f"id: {event['seq']}\nevent: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def _sse(run_id: str, after: int = -1) -> Iterator[str]:
+    """
+    Follow a run's event log: node_start / node_end events with durations,
+    row counts and bytes, explanation updates, then run_end and a final
+    "result" event carrying the same payload as /reconcile.
+    """
+    waited = 0.0
+    while True:
+        got = run_registry.wait_events(run_id, after, timeout=_SSE_KEEPALIVE_S)
+        if got is None:
+            if waited >= _SSE_REGISTER_WAIT_S:
+                yield f"event: error\ndata: {json.dumps({'error': f'Unknown run_id: {run_id}'})}\n\n"
+                return
+            time.sleep(0.1)
+            waited += 0.1
+            continue
+        events, done = got
+        for e in events:
+            after = e["seq"]
+            yield _sse_frame(e)
+        if done:
+            result = stored_result(run_id)
+            if result is not None:
+                yield f"event: result\ndata: {json.dumps(result, default=str)}\n\n"
+            return
+        if not events:
+            yield ": keepalive\n\n"
+
+
+def _stream_run(payload: dict) -> StreamingResponse:
+    payload = dict(payload)
+    mode = _profile_mode(payload)
+    run_id = payload.get("run_id") or run_registry.new_id()
+    payload["run_id"] = run_id
+    run_registry.start(run_id)
+
+    def target():
+        try:
+            _run_graph(payload, mode)
+        except Exception as e:
+            # graph errors are already recorded; one raised before the graph
+            # started (e.g. an invalid payload) would leave the run RUNNING
+            if (run_registry.get(run_id) or {}).get("status") == "RUNNING":
+                run_registry.finish(run_id, "FAILED", error=str(e))
+
+    run_registry.update(run_id, stage="queued")
+    _stream_pool.submit(target)
+    return StreamingResponse(
+        _sse(run_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no", "X-Run-Id": run_id},
+    )
+
+
+@router.post("/reconcile/stream")
+async def reconcile_stream(
+    dataset_a: str = Form(...),
+    dataset_b: str = Form(...),
+    thresholds: str = Form(...),
+    entities: str = Form("[]"),
+    run_id: Optional[str] = Form(None),
+    profile: Optional[str] = Form(None),
+    fileA: Optional[UploadFile] = File(None),
+    fileB: Optional[UploadFile] = File(None),
+):
+    """Same inputs as /reconcile, answered as an SSE stream of run events."""
+    payload = await _payload_from_form(dataset_a, dataset_b, thresholds, entities, run_id, fileA, fileB)
+    payload["profile"] = profile
+    return _stream_run(payload)
+
+
+@router.post("/reconcile/approve/stream")
+def reconcile_approve_stream(payload: dict):
+    """Same input as /reconcile/approve, answered as an SSE stream of run events."""
+    return _stream_run(payload)
+
+
+@router.get("/runs/{run_id}/events")
+def run_events(run_id: str, after: int = -1, last_event_id: Optional[str] = Header(None)):
+    """
+    Re-attach to a run's event stream (e.g. after a dropped connection);
+    resumes after Last-Event-ID or ?after=<seq>.
+    """
+    if run_registry.get(run_id) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run_id: {run_id}")
+    if last_event_id is not None and last_event_id.isdigit():
+        after = int(last_event_id)
+    return StreamingResponse(_sse(run_id, after), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+@router.get("/runs/{run_id}/result")
+def run_result(run_id: str):
+    result = stored_result(run_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"No result for run_id: {run_id}")
+    return JSONResponse(content=result, status_code=200)
+
 @router.post("/reconcile/approve")
 def reconcile_approve(payload: dict):
-    result = run_graph(payload)   # result is already a dict
+    result = _run_graph(payload)  # result is already a dict
     return result                 # FastAPI will serialize it to JSON
+
+
+@router.get("/runs/{run_id}")
+def run_progress(run_id: str):
+    run = run_registry.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run_id: {run_id}")
+    return run
+
+
+@router.get("/runs/{run_id}/explanation")
+def run_explanation(run_id: str):
+    """
+    Explanation of a finished run: {"status": PENDING | READY | FAILED, ...}.
+    It is generated after the /reconcile response, so poll until READY.
+    """
+    run = run_registry.get(run_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Unknown run_id: {run_id}")
+    return run.get("explanation") or {"status": "NONE"}
+
+
+@router.get("/metrics")
+def metrics():
+    """Prometheus scrape endpoint: node durations, rows, BigQuery bytes / slot-ms, LLM tokens."""
+    body, content_type = render_prometheus()
+    return Response(content=body, media_type=content_type)
+
+
+@router.get("/llm/cache/stats")
+def llm_cache_stats():
+    return llm_cache.stats()
+
+
+@router.get("/llm/stats")
+def llm_stats():
+    return {"calls": call_stats.snapshot(), "cache": llm_cache.stats()}
+
+
+@router.post("/entities/aliases")
+def approve_alias(payload: dict):
+    """
+    Approve (or reject, with right=null) an entity alias for a dataset pair.
+    Identify the pair with `alias_key` from a previous run's entity
+    resolution, or with the same `dataset_a` / `dataset_b` configs.
+    """
+    key = payload.get("alias_key")
+    if not key and payload.get("dataset_a") and payload.get("dataset_b"):
+        key = dataset_pair_key(payload["dataset_a"], payload["dataset_b"])
+    missing = [f for f in ("a_col", "b_col", "left") if not payload.get(f)]
+    if not key or missing:
+        raise HTTPException(status_code=400, detail="alias_key (or dataset_a/dataset_b), a_col, b_col and left are required")
+    alias_store.set_approval(
+        key, payload["a_col"], payload["b_col"], payload["left"], payload.get("right"),
+        approved=bool(payload.get("approved", True)),
+    )
+    return {"alias_key": key, "status": "ok"}
@@ -0,0 +1,194 @@
+# backend/utils/alias_store.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from backend.config import settings
+from backend.utils.entity_matching import normalize_names
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entity_aliases (
+    pair_key   TEXT NOT NULL,
+    a_col      TEXT NOT NULL,
+    b_col      TEXT NOT NULL,
+    left_key   TEXT NOT NULL,
+    left_val   TEXT NOT NULL,
+    right_val  TEXT,               -- NULL: resolved to "no match"
+    confidence REAL NOT NULL,
+    method     TEXT NOT NULL,
+    approved   INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (pair_key, a_col, b_col, left_key)
+)
+"""
+
+# source config keys that identify a dataset (volatile ones like table_fqn,
+# file stats or credentials are left out so daily runs share one key)
+_IDENTITY_KEYS = ("type", "table", "path", "query", "host", "port", "database", "schema", "service")
+
+
+def dataset_pair_key(cfg_a: Optional[Dict[str, Any]], cfg_b: Optional[Dict[str, Any]]) -> str:
+    ident = [
+        {k: (cfg or {}).get(k) for k in _IDENTITY_KEYS if (cfg or {}).get(k) is not None}
+        for cfg in (cfg_a, cfg_b)
+    ]
+    return hashlib.sha256(json.dumps(ident, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:32]
+
+
+def _trigrams(key: str) -> Set[str]:
+    s = f" {key} "
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+@dataclass
+class Alias:
+    left: str
+    right: Optional[str]
+    confidence: float
+    method: str
+    approved: bool
+    updated_at: float
+
+
+class AliasIndex:
+    """
+    In-memory view of one (dataset pair, column pair): normalised-key hash
+    map for exact lookups plus a trigram index for near-variants of names
+    resolved in earlier runs.
+    """
+
+    def __init__(self, entries: Dict[str, Alias]):
+        self.by_key = entries
+        self._grams: Dict[str, Set[str]] = {}
+        self._index: Dict[str, Set[str]] = defaultdict(set)
+        for key, alias in entries.items():
+            if alias.right is None:
+                continue
+            g = _trigrams(key)
+            self._grams[key] = g
+            for t in g:
+                self._index[t].add(key)
+
+    def get(self, key: str) -> Optional[Alias]:
+        return self.by_key.get(key)
+
+    def nearest(self, key: str, min_jaccard: float) -> Optional[Tuple[Alias, float]]:
+        g = _trigrams(key)
+        counts: Dict[str, int] = defaultdict(int)
+        for t in g:
+            for k in self._index.get(t, ()):
+                counts[k] += 1
+        best, best_j = None, 0.0
+        for k, inter in counts.items():
+            j = inter / (len(g) + len(self._grams[k]) - inter)
+            if j > best_j:
+                best, best_j = k, j
+        if best is None or best_j < min_jaccard:
+            return None
+        return self.by_key[best], best_j
+
+
+class AliasStore:
+    """
+    SQLite-backed entity alias store keyed by dataset pair and column pair.
+    User-approved aliases are never overwritten by automatic results.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            if not self._ready:
+                conn.execute(_SCHEMA)
+                self._ready = True
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def index(self, pair_key: str, a_col: str, b_col: str) -> AliasIndex:
+        """
+        Usable aliases for a column pair. Negative ("no match") entries
+        expire after alias_negative_ttl_s so new B names get a chance,
+        unless a user approved them.
+        """
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            rows = conn.execute(
+                "SELECT left_key, left_val, right_val, confidence, method, approved, updated_at "
+                "FROM entity_aliases WHERE pair_key = ? AND a_col = ? AND b_col = ?",
+                (pair_key, a_col, b_col),
+            ).fetchall()
+        entries = {
+            r[0]: Alias(left=r[1], right=r[2], confidence=r[3], method=r[4], approved=bool(r[5]), updated_at=r[6])
+            for r in rows
+            if r[2] is not None or r[5] or now - r[6] <= settings.alias_negative_ttl_s
+        }
+        return AliasIndex(entries)
+
+    def upsert(self, pair_key: str, a_col: str, b_col: str, rows: List[Dict[str, Any]]) -> int:
+        """
+        rows: {"left", "right" (None = no match), "confidence", "method"}.
+        Returns the number of rows written.
+        """
+        if not rows:
+            return 0
+        now = time.time()
+        keys = normalize_names(pd.Series([str(r["left"]) for r in rows], dtype=object)).tolist()
+        params = [
+            (pair_key, a_col, b_col, k, str(r["left"]),
+             None if r.get("right") is None else str(r["right"]),
+             float(r.get("confidence") or 0.0), r.get("method") or "auto", now)
+            for k, r in zip(keys, rows)
+            if k
+        ]
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO entity_aliases "
+                "(pair_key, a_col, b_col, left_key, left_val, right_val, confidence, method, approved, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0, ?) "
+                "ON CONFLICT (pair_key, a_col, b_col, left_key) DO UPDATE SET "
+                " left_val = excluded.left_val, right_val = excluded.right_val, "
+                " confidence = excluded.confidence, method = excluded.method, updated_at = excluded.updated_at "
+                "WHERE entity_aliases.approved = 0",
+                params,
+            )
+        return len(params)
+
+    def set_approval(
+        self, pair_key: str, a_col: str, b_col: str, left: str, right: Optional[str], approved: bool = True
+    ) -> None:
+        """Record a user decision; approved aliases pin `right` for future runs."""
+        key = normalize_names(pd.Series([str(left)], dtype=object)).iloc[0]
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO entity_aliases "
+                "(pair_key, a_col, b_col, left_key, left_val, right_val, confidence, method, approved, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, 1.0, 'user', ?, ?) "
+                "ON CONFLICT (pair_key, a_col, b_col, left_key) DO UPDATE SET "
+                " right_val = excluded.right_val, confidence = 1.0, method = 'user', "
+                " approved = excluded.approved, updated_at = excluded.updated_at",
+                (pair_key, a_col, b_col, key, str(left), right, int(approved), time.time()),
+            )
+
+
+alias_store = AliasStore(settings.alias_store_path)
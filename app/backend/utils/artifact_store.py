@@ -0,0 +1,232 @@
+# backend/utils/artifact_store.py
+"""
+Per-run store for the heavy data of a reconciliation run (source frames,
+result rows), so graph state only carries handles and metadata.
+
+Two tiers:
+  - in-process LRU bounded in bytes, overall and per run
+  - Parquet files under artifact_dir for whatever does not fit (pickle for
+    frames Arrow cannot encode, e.g. mixed-type object columns)
+
+Frames are stored as-is and returned by reference from memory: treat them
+as read-only, or put() a modified copy under a new name.
+"""
+from __future__ import annotations
+
+import hashlib
+import itertools
+import os
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.config import settings
+from backend.utils.logger import logger
+
+
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+
+def _run_key(run_id: str) -> str:
+    # run ids can come from clients; never let one name a path outside root
+    if _SAFE_ID.match(run_id) and run_id not in (".", ".."):
+        return run_id
+    return hashlib.sha256(run_id.encode("utf-8")).hexdigest()[:32]
+
+
+def _nbytes(df: pd.DataFrame) -> int:
+    # deep=True walks every object cell; the shallow size is a fine budget
+    return int(df.memory_usage(index=True, deep=False).sum())
+
+
+class ArtifactStore:
+    def __init__(self, root: str, memory_bytes: int, run_memory_bytes: int, ttl_s: int):
+        self.root = root
+        self.memory_bytes = memory_bytes
+        self.run_memory_bytes = run_memory_bytes
+        self.ttl_s = ttl_s
+        self._mem: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        # frames on their way to disk: still served from memory, no longer counted
+        self._spilling: Dict[str, pd.DataFrame] = {}
+        self._meta: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._stats: Dict[str, int] = {"puts": 0, "memory_hits": 0, "disk_hits": 0, "spills": 0}
+
+    @staticmethod
+    def handle(run_id: str, name: str) -> str:
+        return f"{_run_key(run_id)}/{name}"
+
+    # ---- disk tier ----
+    def _path(self, handle: str, fmt: str) -> str:
+        # unique per spill, so a slow write never lands on a newer artifact's file
+        run_id, name = handle.split("/", 1)
+        return os.path.join(self.root, run_id, f"{name}.{next(self._seq)}.{fmt}")
+
+    def _mark_spill(self, handle: str, df: pd.DataFrame) -> Tuple[str, Dict[str, Any], pd.DataFrame]:
+        # caller holds self._lock; the write itself happens in _spill, outside it
+        meta = self._meta[handle]
+        meta["location"] = "spilling"
+        self._spilling[handle] = df
+        return handle, meta, df
+
+    def _spill(self, victims: List[Tuple[str, Dict[str, Any], pd.DataFrame]]) -> None:
+        """Write marked frames to disk without holding the store lock."""
+        for handle, meta, df in victims:
+            path = self._path(handle, "parquet")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                df.to_parquet(path, index=True)
+            except Exception:
+                path = path[: -len("parquet")] + "pkl"
+                df.to_pickle(path)
+            with self._lock:
+                current = self._meta.get(handle) is meta
+                if current:
+                    meta.update(location="disk", path=path)
+                    self._stats["spills"] += 1
+                if self._spilling.get(handle) is df:
+                    del self._spilling[handle]
+            if not current:
+                # dropped or replaced while it was being written
+                try:
+                    os.remove(path)
+                    os.rmdir(os.path.dirname(path))  # only if that left it empty
+                except OSError:
+                    pass
+
+    def _load(self, meta: Dict[str, Any]) -> pd.DataFrame:
+        path = meta["path"]
+        if not path.endswith(".parquet"):
+            return pd.read_pickle(path)
+        df = pd.read_parquet(path)
+        # Arrow hands list cells back as numpy arrays; keep them JSON-friendly lists
+        for col in df.columns[df.dtypes == object]:
+            first = df[col].dropna().head(1)
+            if len(first) and isinstance(first.iloc[0], np.ndarray):
+                df[col] = df[col].map(lambda v: v.tolist() if isinstance(v, np.ndarray) else v)
+        return df
+
+    def _fit(self, run_id: str) -> List[Tuple[str, Dict[str, Any], pd.DataFrame]]:
+        # caller holds self._lock; marks least recently used frames for spilling
+        def used(prefix: str = "") -> int:
+            return sum(self._meta[h]["bytes"] for h in self._mem if h.startswith(prefix))
+
+        victims = []
+        prefix = _run_key(run_id) + "/"
+        for h in [h for h in self._mem if h.startswith(prefix)]:
+            if used(prefix) <= self.run_memory_bytes:
+                break
+            victims.append(self._mark_spill(h, self._mem.pop(h)))
+        for h in list(self._mem):
+            if used() <= self.memory_bytes:
+                break
+            victims.append(self._mark_spill(h, self._mem.pop(h)))
+        return victims
+
+    # ---- public ----
+    def put(self, run_id: str, name: str, df: pd.DataFrame) -> Dict[str, Any]:
+        """Store df under <run_id>/<name>; returns its metadata incl. the handle."""
+        handle = self.handle(run_id, name)
+        self.drop(handle)
+        meta = {
+            "handle": handle,
+            "rows": int(len(df)),
+            "columns": [str(c) for c in df.columns],
+            "bytes": _nbytes(df),
+            "location": "memory",
+            "created_at": time.time(),
+        }
+        with self._lock:
+            self._meta[handle] = meta
+            self._stats["puts"] += 1
+            if meta["bytes"] > min(self.memory_bytes, self.run_memory_bytes):
+                victims = [self._mark_spill(handle, df)]
+            else:
+                self._mem[handle] = df
+                victims = self._fit(run_id)
+        self._spill(victims)
+        with self._lock:
+            out = dict(meta)
+        self._expire()
+        return out
+
+    def get(self, handle: Optional[str]) -> Optional[pd.DataFrame]:
+        if not handle:
+            return None
+        with self._lock:
+            df = self._mem.get(handle)
+            if df is not None:
+                self._mem.move_to_end(handle)
+                self._stats["memory_hits"] += 1
+                return df
+            df = self._spilling.get(handle)
+            if df is not None:
+                self._stats["memory_hits"] += 1
+                return df
+            meta = self._meta.get(handle)
+            if meta is None or not meta.get("path"):
+                return None
+            self._stats["disk_hits"] += 1
+        # disk reads stay on disk: re-caching would just evict a hotter frame
+        return self._load(meta)
+
+    def meta(self, handle: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            meta = self._meta.get(handle)
+            return dict(meta) if meta else None
+
+    def drop(self, handle: str) -> None:
+        with self._lock:
+            self._mem.pop(handle, None)
+            self._spilling.pop(handle, None)
+            meta = self._meta.pop(handle, None)
+        if meta and meta.get("path"):
+            try:
+                os.remove(meta["path"])
+            except OSError:
+                pass
+
+    def drop_run(self, run_id: Optional[str]) -> None:
+        """Release everything a run stored (memory and spill files)."""
+        if not run_id:
+            return
+        key = _run_key(run_id)
+        with self._lock:
+            for h in [h for h in self._meta if h.startswith(key + "/")]:
+                self._mem.pop(h, None)
+                self._spilling.pop(h, None)
+                self._meta.pop(h, None)
+        shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+
+    def _expire(self) -> None:
+        # runs that never got dropped (crashed workers, abandoned explanations)
+        cutoff = time.time() - self.ttl_s
+        with self._lock:
+            stale = {h.split("/", 1)[0] for h, m in self._meta.items() if m["created_at"] < cutoff}
+        for run_id in stale:
+            logger.info("ArtifactStore: expiring artifacts of run %s", run_id)
+            self.drop_run(run_id)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "artifacts": len(self._meta),
+                "in_memory": len(self._mem),
+                "memory_bytes": sum(self._meta[h]["bytes"] for h in self._mem),
+            }
+
+
+artifact_store = ArtifactStore(
+    root=settings.artifact_dir,
+    memory_bytes=settings.artifact_memory_bytes,
+    run_memory_bytes=settings.artifact_run_memory_bytes,
+    ttl_s=settings.artifact_ttl_s,
+)
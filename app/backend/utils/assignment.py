@@ -0,0 +1,70 @@
+# backend/utils/assignment.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+
+
+@dataclass
+class Assignment:
+    i: int            # row (A column) index
+    j: int            # col (B column) index
+    weight: float
+    gap: float        # weight minus the best competing score for either column
+
+
+def _top2(m: np.ndarray, axis: int) -> np.ndarray:
+    """Two largest values along axis, shape (n, 2) as (best, second)."""
+    n = m.shape[axis]
+    if n == 0:
+        return np.zeros((m.shape[1 - axis], 2))
+    if n == 1:
+        best = m.max(axis=axis)
+        return np.stack([best, np.zeros_like(best)], axis=1)
+    part = -np.partition(-m, 1, axis=axis)
+    part = part[:2] if axis == 0 else part[:, :2]
+    return part.T if axis == 0 else part
+
+
+def max_weight_assignment(weights: np.ndarray, min_weight: float = 0.0) -> List[Assignment]:
+    """
+    One-to-one maximum-weight bipartite matching (rectangular LAPJV via
+    scipy's linear_sum_assignment, O(n^3) worst case in C). Rows and columns
+    with no entry above min_weight are dropped before solving, and pairs that
+    end up with weight <= min_weight are left unmatched.
+
+    Each assignment carries a confidence gap: its weight minus the strongest
+    alternative for the same A column (other B) or the same B column (other A).
+    A small (or negative) gap means the pair won a close contest, or was
+    traded away from its local best to keep the mapping one-to-one.
+    """
+    if weights.size == 0:
+        return []
+
+    w = np.where(weights > min_weight, weights, 0.0)
+    rows = np.flatnonzero(w.max(axis=1) > 0)
+    cols = np.flatnonzero(w.max(axis=0) > 0)
+    if not len(rows) or not len(cols):
+        return []
+
+    sub = w[np.ix_(rows, cols)]
+    r, c = linear_sum_assignment(sub, maximize=True)
+
+    row_top = _top2(weights, axis=1)
+    col_top = _top2(weights, axis=0)
+
+    out: List[Assignment] = []
+    for ri, ci in zip(r, c):
+        weight = float(sub[ri, ci])
+        if weight <= 0:
+            continue
+        i, j = int(rows[ri]), int(cols[ci])
+        # runner-up: best other entry in row i / column j
+        alt_row = row_top[i, 1] if weights[i, j] >= row_top[i, 0] else row_top[i, 0]
+        alt_col = col_top[j, 1] if weights[i, j] >= col_top[j, 0] else col_top[j, 0]
+        out.append(Assignment(i=i, j=j, weight=weight, gap=float(weight - max(alt_row, alt_col))))
+    return out
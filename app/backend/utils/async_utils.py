@@ -0,0 +1,108 @@
+# backend/utils/async_utils.py
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import threading
+from typing import Any, Awaitable, Callable, Coroutine, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+async def bounded_gather(
+    factories: Iterable[Callable[[], Awaitable[T]]],
+    limit: int,
+    return_exceptions: bool = True,
+) -> List[Any]:
+    """
+    asyncio.gather over coroutine factories with at most `limit` in flight.
+    Results keep input order; with return_exceptions the failures are
+    returned in place instead of cancelling the rest.
+    """
+    sem = asyncio.Semaphore(max(1, limit))
+
+    async def _one(factory: Callable[[], Awaitable[T]]) -> T:
+        async with sem:
+            return await factory()
+
+    return await asyncio.gather(*(_one(f) for f in factories), return_exceptions=return_exceptions)
+
+
+def with_context(fn: Callable[..., T]) -> Callable[..., T]:
+    """
+    `fn` bound to the caller's contextvars (run metrics, trace context), for
+    work handed to pool or helper threads, which otherwise start with an
+    empty context. Each call runs in its own copy, so concurrent calls are
+    fine.
+    """
+    ctx = contextvars.copy_context()
+
+    def _run(*args: Any, **kwargs: Any) -> T:
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return _run
+
+
+# -------------------------------------------------------
+# Shared event loop
+# -------------------------------------------------------
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def shared_loop() -> asyncio.AbstractEventLoop:
+    """
+    The process-wide event loop async I/O from synchronous code runs on
+    (started on first use in a daemon thread). Loop-bound resources such as
+    async HTTP connection pools live here and are reused across calls.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-io", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+def on_shared_loop() -> bool:
+    try:
+        return asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        return False
+
+
+def submit(coro: Coroutine[Any, Any, T]) -> "concurrent.futures.Future[T]":
+    """Schedule a coroutine on the shared loop, in the caller's contextvars."""
+    loop = shared_loop()
+    ctx = contextvars.copy_context()
+    fut: "concurrent.futures.Future[T]" = concurrent.futures.Future()
+
+    def _copy(task: "asyncio.Task[T]") -> None:
+        if task.cancelled():
+            fut.cancel()
+        elif task.exception() is not None:
+            fut.set_exception(task.exception())
+        else:
+            fut.set_result(task.result())
+
+    def _start() -> None:
+        # a Task copies the context it is created in (create_task(context=) is 3.11+)
+        ctx.run(loop.create_task, coro).add_done_callback(_copy)
+
+    loop.call_soon_threadsafe(_start)
+    return fut
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code, on the shared
+    loop. Works from plain threads and from under another running event
+    loop (whose thread blocks until the result is in).
+    """
+    if on_shared_loop():
+        coro.close()
+        raise RuntimeError("run_sync() called on the shared loop; await the coroutine instead")
+    return submit(coro).result()
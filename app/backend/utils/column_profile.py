@@ -0,0 +1,311 @@
+# backend/utils/column_profile.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from backend.config import settings
+from backend.utils.sketches import HyperLogLog, MinHash, canonical_values, hash_values
+
+# how many non-null values per batch are inspected for list/array payloads
+_ARRAY_PROBE_ROWS = 1000
+
+# quantile grid kept for numeric columns (distribution sketch)
+QUANTILE_GRID = np.linspace(0.0, 1.0, 21)
+
+
+def _is_array_value(x: Any) -> bool:
+    return isinstance(x, (list, tuple, np.ndarray))
+
+
+def _json_safe(v: Any) -> Any:
+    if v is None:
+        return None
+    if isinstance(v, np.generic):
+        v = v.item()
+    if isinstance(v, (pd.Timestamp, pd.Timedelta)):
+        return v.isoformat()
+    if isinstance(v, float) and not np.isfinite(v):
+        return None
+    if isinstance(v, (int, float, bool)):
+        return v
+    return str(v)[:200]
+
+
+# -------------------------------------------------------
+# Profile containers
+# -------------------------------------------------------
+@dataclass
+class ColumnProfile:
+    name: str
+    dtype: str
+    kind: str = "string"          # numeric | string | array | datetime | boolean
+    rows: int = 0
+    nulls: int = 0
+    min: Any = None
+    max: Any = None
+    len_min: Optional[int] = None
+    len_max: Optional[int] = None
+    len_mean: Optional[float] = None
+    len_count: int = 0
+    integral: Optional[bool] = None   # numeric only: every value is a whole number
+    quantiles: Optional[np.ndarray] = None   # numeric only, on QUANTILE_GRID
+    hll: HyperLogLog = field(default_factory=lambda: HyperLogLog(settings.profile_hll_precision))
+    minhash: MinHash = field(default_factory=lambda: MinHash(settings.profile_minhash_bins))
+
+    @property
+    def null_rate(self) -> float:
+        return self.nulls / self.rows if self.rows else 0.0
+
+    @property
+    def distinct(self) -> int:
+        return self.hll.count()
+
+    @property
+    def uniqueness(self) -> float:
+        """Approximate distinct / non-null rows, clipped to [0, 1]."""
+        non_null = self.rows - self.nulls
+        if non_null <= 0:
+            return 0.0
+        return min(1.0, self.distinct / non_null)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dtype": self.dtype,
+            "kind": self.kind,
+            "null_rate": round(self.null_rate, 6),
+            "distinct": self.distinct,
+            "uniqueness": round(self.uniqueness, 6),
+            "min": _json_safe(self.min),
+            "max": _json_safe(self.max),
+            "len_min": self.len_min,
+            "len_max": self.len_max,
+            "len_mean": None if self.len_mean is None else round(self.len_mean, 3),
+            "integral": self.integral,
+        }
+
+
+@dataclass
+class TableProfile:
+    source_key: Optional[str]
+    rows: int
+    sampled_rows: int
+    columns: Dict[str, ColumnProfile]
+    # bounded sample the profile was computed from; reused for composite-key
+    # and value-overlap checks so nobody has to go back to the full frame
+    sample: Optional[pd.DataFrame] = None
+    created_at: float = field(default_factory=time.time)
+
+    def cols_of_kind(self, kind: str) -> List[str]:
+        return [c for c, p in self.columns.items() if p.kind == kind]
+
+    def kind_of(self, col: str) -> Optional[str]:
+        p = self.columns.get(col)
+        return p.kind if p else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "source_key": self.source_key,
+            "rows": self.rows,
+            "sampled_rows": self.sampled_rows,
+            "columns": {c: p.to_dict() for c, p in self.columns.items()},
+        }
+
+
+# -------------------------------------------------------
+# Profiling (vectorised, batch at a time)
+# -------------------------------------------------------
+def _classify(s: pd.Series) -> str:
+    dt = s.dtype
+    if pd.api.types.is_bool_dtype(dt):
+        return "boolean"
+    if pd.api.types.is_numeric_dtype(dt):
+        return "numeric"
+    if pd.api.types.is_datetime64_any_dtype(dt):
+        return "datetime"
+    if str(dt).startswith("list<"):
+        return "array"
+    probe = s.dropna().iloc[:_ARRAY_PROBE_ROWS]
+    if not probe.empty and probe.map(_is_array_value).any():
+        return "array"
+    return "string"
+
+
+def _merge_quantiles(cp: ColumnProfile, s: pd.Series, count: int) -> None:
+    # count-weighted average of per-batch quantiles: exact for one batch,
+    # a close approximation when the batches are random slices of a sample
+    q = np.quantile(s.dropna().to_numpy(dtype="float64"), QUANTILE_GRID)
+    if cp.quantiles is None:
+        cp.quantiles = q
+        return
+    prev = cp.rows - cp.nulls - count
+    cp.quantiles = (cp.quantiles * prev + q * count) / (prev + count)
+
+
+def _update_column(cp: ColumnProfile, s: pd.Series) -> None:
+    n = len(s)
+    nulls = int(s.isna().sum())
+    cp.rows += n
+    cp.nulls += nulls
+    if n == nulls:
+        return
+
+    if cp.kind in ("numeric", "datetime"):
+        lo, hi = s.min(), s.max()
+        cp.min = lo if cp.min is None else min(cp.min, lo)
+        cp.max = hi if cp.max is None else max(cp.max, hi)
+        if cp.kind == "numeric":
+            whole = True
+            if pd.api.types.is_float_dtype(s.dtype):
+                whole = bool(np.all(np.mod(s.dropna().to_numpy(dtype="float64"), 1) == 0))
+            cp.integral = whole if cp.integral is None else (cp.integral and whole)
+            _merge_quantiles(cp, s, n - nulls)
+        h = hash_values(s)
+        cp.hll.update_hashes(h)
+        cp.minhash.update_hashes(h)
+        return
+
+    if cp.kind == "array":
+        probe = s.dropna().iloc[:_ARRAY_PROBE_ROWS]
+        lengths = probe.map(lambda x: len(x) if _is_array_value(x) else 1)
+        cp.hll.update(probe.map(lambda x: json.dumps(list(x), default=str) if _is_array_value(x) else str(x)))
+    else:
+        vals = canonical_values(s)
+        lengths = vals.str.len()
+        lo, hi = vals.min(), vals.max()
+        cp.min = lo if cp.min is None else min(cp.min, lo)
+        cp.max = hi if cp.max is None else max(cp.max, hi)
+        h = hash_values(s)
+        cp.hll.update_hashes(h)
+        cp.minhash.update_hashes(h)
+
+    if lengths.empty:
+        return
+    b_min, b_max, b_sum = int(lengths.min()), int(lengths.max()), float(lengths.sum())
+    cp.len_min = b_min if cp.len_min is None else min(cp.len_min, b_min)
+    cp.len_max = b_max if cp.len_max is None else max(cp.len_max, b_max)
+    prev_sum = (cp.len_mean or 0.0) * cp.len_count
+    cp.len_count += len(lengths)
+    cp.len_mean = (prev_sum + b_sum) / cp.len_count
+
+
+def profile_batches(
+    batches: Iterable[pd.DataFrame],
+    source_key: Optional[str] = None,
+    total_rows: Optional[int] = None,
+) -> TableProfile:
+    """
+    Profile a stream of DataFrame batches with identical columns.
+    Sketches are merged batch by batch, so memory stays bounded by one batch.
+    """
+    columns: Dict[str, ColumnProfile] = {}
+    seen_rows = 0
+
+    for batch in batches:
+        for c in batch.columns:
+            s = batch[c]
+            cp = columns.get(c)
+            if cp is None:
+                cp = columns[c] = ColumnProfile(name=str(c), dtype=str(s.dtype), kind=_classify(s))
+            _update_column(cp, s)
+        seen_rows += len(batch)
+
+    return TableProfile(
+        source_key=source_key,
+        rows=total_rows if total_rows is not None else seen_rows,
+        sampled_rows=seen_rows,
+        columns=columns,
+    )
+
+
+def profile_dataframe(
+    df: pd.DataFrame,
+    source_key: Optional[str] = None,
+    sample_rows: Optional[int] = None,
+    batch_rows: Optional[int] = None,
+    total_rows: Optional[int] = None,
+) -> TableProfile:
+    """
+    Profile a DataFrame over a bounded random sample, processed in batches.
+    total_rows: size of the source when df is itself only a preview of it.
+    """
+    sample_rows = sample_rows or settings.profile_sample_rows
+    batch_rows = batch_rows or settings.profile_batch_rows
+
+    sample = df
+    if len(df) > sample_rows:
+        sample = df.sample(n=sample_rows, random_state=0)
+
+    batches = (sample.iloc[i:i + batch_rows] for i in range(0, max(len(sample), 1), batch_rows))
+    prof = profile_batches(batches, source_key=source_key, total_rows=max(len(df), total_rows or 0))
+    prof.sample = sample
+    return prof
+
+
+# -------------------------------------------------------
+# Per-source cache
+# -------------------------------------------------------
+_CACHE: "OrderedDict[str, TableProfile]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+_FINGERPRINT_KEYS = (
+    "type", "path", "format", "lines", "host", "port", "database", "service",
+    "table", "table_fqn", "custom_query", "columns", "sample_rows",
+)
+
+
+def source_fingerprint(cfg: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Stable key for a source config. File sources include size + mtime so a
+    re-uploaded file with the same name is profiled again.
+    """
+    if not cfg:
+        return None
+    ident = {k: cfg.get(k) for k in _FINGERPRINT_KEYS if cfg.get(k) is not None}
+    path = cfg.get("path")
+    if path and os.path.exists(path):
+        st = os.stat(path)
+        ident["_stat"] = [st.st_size, st.st_mtime_ns]
+    raw = json.dumps(ident, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def get_or_build_profile(
+    cfg: Optional[Dict[str, Any]],
+    df: Union[pd.DataFrame, Callable[[], pd.DataFrame]],
+    total_rows: Optional[int] = None,
+) -> TableProfile:
+    """
+    Return the cached profile for this source, building it from df on a miss.
+    df may be a zero-argument callable so the frame is only fetched then.
+    """
+    key = source_fingerprint(cfg)
+    frame = df if callable(df) else (lambda: df)
+    if key is None:
+        return profile_dataframe(frame(), total_rows=total_rows)
+
+    now = time.time()
+    with _CACHE_LOCK:
+        prof = _CACHE.get(key)
+        if prof is not None and now - prof.created_at <= settings.profile_cache_ttl_s:
+            _CACHE.move_to_end(key)
+            return prof
+
+    prof = profile_dataframe(frame(), source_key=key, total_rows=total_rows)
+
+    with _CACHE_LOCK:
+        _CACHE[key] = prof
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > settings.profile_cache_size:
+            _CACHE.popitem(last=False)
+    return prof
@@ -0,0 +1,91 @@
+# backend/utils/crosswalk.py
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from backend.config import settings
+
+Pair = Tuple[str, str]
+
+
+def _clusters(edges: List[Pair]) -> Dict[str, str]:
+    """value -> entity key (smallest member) of the connected components of edges."""
+    parent: Dict[str, str] = {}
+
+    def find(v: str) -> str:
+        parent.setdefault(v, v)
+        while parent[v] != v:
+            parent[v] = parent[parent[v]]
+            v = parent[v]
+        return v
+
+    for x, y in edges:
+        rx, ry = find(x), find(y)
+        if rx != ry:
+            parent[max(rx, ry)] = min(rx, ry)
+    return {v: find(v) for v in parent}
+
+
+def build_crosswalks(pairs: List[Dict[str, Any]]) -> Dict[Pair, pd.DataFrame]:
+    """
+    Resolved entity pairs grouped per (a_col, b_col) into crosswalk frames
+    val -> entity_key. Every A and B spelling linked by a resolved pair
+    (directly or through other pairs) shares one key, so both sides are
+    compared through it and no spelling has to win over another.
+
+    Pairs without column information (free-text resolution) cannot be tied
+    to a column and are skipped; identity pairs add nothing and are dropped.
+    """
+    grouped: Dict[Pair, List[Pair]] = {}
+    for p in pairs or []:
+        if not (p.get("a_col") and p.get("b_col")) or p.get("left") is None or p.get("right") is None:
+            continue
+        a_val, b_val = str(p["left"]), str(p["right"])
+        if a_val != b_val:
+            grouped.setdefault((p["a_col"], p["b_col"]), []).append((a_val, b_val))
+
+    return {
+        cols: pd.DataFrame(sorted(_clusters(edges).items()), columns=["val", "entity_key"])
+        for cols, edges in grouped.items()
+    }
+
+
+def _sql_str(v: str) -> str:
+    # BigQuery string literal
+    return "'" + v.replace("\\", "\\\\").replace("'", "\\'").replace("\n", "\\n") + "'"
+
+
+def inline_crosswalk_sql(df: pd.DataFrame) -> str:
+    """Crosswalk as an inline relation, scanned together with the sources."""
+    values = ", ".join(f"({_sql_str(v)}, {_sql_str(k)})" for v, k in zip(df["val"], df["entity_key"]))
+    return f"(SELECT val, entity_key FROM UNNEST(ARRAY<STRUCT<val STRING, entity_key STRING>>[{values}]))"
+
+
+def crosswalk_relations(
+    crosswalks: Dict[Pair, pd.DataFrame],
+    stage: Optional[Callable[[pd.DataFrame, str], str]] = None,
+) -> Tuple[Dict[Pair, str], Dict[str, Any]]:
+    """
+    SQL relation per crosswalk plus a JSON summary.
+
+    Small crosswalks are inlined into the query; larger ones are handed to
+    `stage(df, label)`, which loads them into a staging table and returns
+    its fully-qualified id.
+    """
+    relations: Dict[Pair, str] = {}
+    summary: Dict[str, Any] = {}
+    for (a, b), df in crosswalks.items():
+        if df.empty:
+            continue
+        if len(df) <= settings.crosswalk_inline_max_rows or stage is None:
+            relations[(a, b)] = inline_crosswalk_sql(df)
+            where = "inline"
+        else:
+            fqn = stage(df, f"xw_{a}")
+            relations[(a, b)] = f"`{fqn}`"
+            where = fqn
+        summary[a] = {"b_col": b, "rows": int(len(df)), "source": where}
+    return relations, summary
@@ -0,0 +1,259 @@
+# backend/utils/diagnostics.py
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.config import settings
+
+Pair = Tuple[str, str]
+
+_SCALES = (100, 1000)
+_MAX_TZ_HOURS = 14
+
+
+def _finding(kind: str, a: str, b: Optional[str], rows: int, base: int, message: str, **detail) -> Dict[str, Any]:
+    return {
+        "kind": kind,
+        "a_col": a,
+        "b_col": b,
+        "rows": int(rows),
+        "share": round(rows / base, 4) if base else 0.0,
+        "detail": detail,
+        "message": message,
+    }
+
+
+def _pct(rows: int, base: int) -> str:
+    return f"{100.0 * rows / base:.0f}% ({rows}/{base})"
+
+
+# -------------------------------------------------------
+# Numeric pairs
+# -------------------------------------------------------
+def _numeric_findings(a: str, b: str, x: pd.Series, y: pd.Series, min_share: float) -> List[Dict[str, Any]]:
+    both = x.notna() & y.notna()
+    xv, yv = x[both].to_numpy(dtype=float), y[both].to_numpy(dtype=float)
+    mis = ~np.isclose(xv, yv, rtol=1e-9, atol=1e-12)
+    xv, yv = xv[mis], yv[mis]
+    n = len(xv)
+    if n == 0:
+        return []
+
+    out: List[Dict[str, Any]] = []
+    d = xv - yv
+
+    # sign flips
+    flips = int((np.isclose(xv, -yv, rtol=1e-9) & (xv != 0)).sum())
+    if flips / n >= min_share:
+        out.append(_finding("sign_flip", a, b, flips, n, f"{a} vs {b}: sign flipped in {_pct(flips, n)} of differing rows"))
+
+    # unit scaling in either direction
+    for f in _SCALES:
+        for direction, hits in (
+            (f"A = B x {f}", np.isclose(xv, yv * f, rtol=1e-6) & (yv != 0)),
+            (f"B = A x {f}", np.isclose(yv, xv * f, rtol=1e-6) & (xv != 0)),
+        ):
+            k = int(hits.sum())
+            if k / n >= min_share:
+                out.append(_finding(
+                    "scaling", a, b, k, n, f"{a} vs {b}: {direction} in {_pct(k, n)} of differing rows",
+                    factor=f, direction=direction,
+                ))
+
+    # one constant offset for most rows
+    vc = pd.Series(np.round(d, 6)).value_counts()
+    offset, k = float(vc.index[0]), int(vc.iloc[0])
+    if k >= 2 and k / n >= min_share:
+        out.append(_finding(
+            "offset", a, b, k, n, f"{a} vs {b}: A - B = {offset:g} in {_pct(k, n)} of differing rows",
+            offset=offset,
+        ))
+
+    # differences that vanish at some rounding precision (finest first)
+    absd = np.abs(d)
+    for dec in (4, 3, 2, 1, 0):
+        k = int((absd <= 0.5 * 10.0 ** -dec * (1 + 1e-9)).sum())
+        if k / n >= min_share:
+            side = None
+            for name, v in (("a", xv), ("b", yv)):
+                if np.isclose(v, np.round(v, dec), rtol=0, atol=1e-9).mean() >= 0.95:
+                    side = name
+                    break
+            out.append(_finding(
+                "rounding", a, b, k, n,
+                f"{a} vs {b}: {_pct(k, n)} of differing rows agree when rounded to {dec} decimal(s)"
+                + (f" (side {side.upper()} looks pre-rounded)" if side else ""),
+                decimals=dec, rounded_side=side,
+            ))
+            break
+    return out
+
+
+# -------------------------------------------------------
+# Timestamp pairs
+# -------------------------------------------------------
+def _to_naive_utc(s: pd.Series) -> pd.Series:
+    s = pd.to_datetime(s, errors="coerce", utc=True)
+    return s.dt.tz_localize(None)
+
+
+def _timestamp_findings(a: str, b: str, x: pd.Series, y: pd.Series, min_share: float) -> List[Dict[str, Any]]:
+    x, y = _to_naive_utc(x), _to_naive_utc(y)
+    hours = ((x - y).dt.total_seconds() / 3600.0).dropna()
+    hours = hours[hours != 0]
+    n = len(hours)
+    if n == 0:
+        return []
+
+    # whole or quarter-hour shifts only (covers +05:30, +05:45 zones)
+    vc = (hours * 4).round().div(4).value_counts()
+    shift, k = float(vc.index[0]), int(vc.iloc[0])
+    if shift == 0 or abs(shift) > _MAX_TZ_HOURS or k / n < min_share:
+        return []
+    dst = vc.get(shift + 1.0, 0) + vc.get(shift - 1.0, 0)
+    return [_finding(
+        "timezone_shift", a, b, k, n,
+        f"{a} vs {b}: A is {shift:+g}h from B in {_pct(k, n)} of differing rows"
+        + (" (plus a 1h variant, likely DST)" if dst else ""),
+        hours=shift, dst_variant_rows=int(dst),
+    )]
+
+
+# -------------------------------------------------------
+# Formatting of string pairs
+# -------------------------------------------------------
+def _string_findings(a: str, b: str, x: pd.Series, y: pd.Series, min_share: float) -> List[Dict[str, Any]]:
+    both = x.notna() & y.notna()
+    xs, ys = x[both].astype(str), y[both].astype(str)
+    mis = xs != ys
+    xs, ys = xs[mis], ys[mis]
+    n = len(xs)
+    if n == 0:
+        return []
+
+    def canon(s: pd.Series) -> pd.Series:
+        return s.str.strip().str.lower().str.lstrip("0")
+
+    k = int((canon(xs) == canon(ys)).sum())
+    if k / n < min_share:
+        return []
+    return [_finding(
+        "formatting", a, b, k, n,
+        f"{a} vs {b}: {_pct(k, n)} of differing values only differ by case, padding or leading zeros",
+    )]
+
+
+# -------------------------------------------------------
+# Where mismatches concentrate
+# -------------------------------------------------------
+def _key_shape(s: pd.Series) -> pd.Series:
+    return s.astype(str).str.slice(0, 24).str.replace(r"\d", "9", regex=True)
+
+
+def _cluster_findings(df: pd.DataFrame, key_cols: List[str], skip: set, min_share: float) -> List[Dict[str, Any]]:
+    n = len(df)
+    out: List[Dict[str, Any]] = []
+    top_n = settings.diagnostics_top_n
+
+    for col in key_cols:
+        if col not in df.columns:
+            continue
+        vc = _key_shape(df[col].dropna()).value_counts().head(top_n)
+        if len(vc) < 1:
+            continue
+        clusters = [{"pattern": p, "rows": int(c), "share": round(c / n, 4)} for p, c in vc.items()]
+        p, c = vc.index[0], int(vc.iloc[0])
+        out.append(_finding(
+            "key_cluster", col, None, c, n, f"{_pct(c, n)} of mismatched rows have {col} shaped like '{p}'",
+            clusters=clusters,
+        ))
+
+    checked = 0
+    for col in df.columns:
+        if col in skip or col in key_cols or checked >= 20:
+            continue
+        s = df[col]
+        if not (pd.api.types.is_object_dtype(s) or isinstance(s.dtype, pd.CategoricalDtype)):
+            continue
+        checked += 1
+        vc = s.dropna().astype(str).value_counts()
+        if not 2 <= len(vc) <= 50:
+            continue
+        v, c = vc.index[0], int(vc.iloc[0])
+        if c / n >= min_share:
+            out.append(_finding(
+                "segment", col, None, c, n, f"{_pct(c, n)} of mismatched rows have {col} = {v!r}",
+                value=v, top=[{"value": k, "rows": int(r)} for k, r in vc.head(top_n).items()],
+            ))
+    return out
+
+
+# -------------------------------------------------------
+# Entry point
+# -------------------------------------------------------
+def diagnose(
+    df: Optional[pd.DataFrame],
+    pairs: List[Pair],
+    key_cols: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Structured, deterministic findings over the mismatch rows returned by
+    the reconciliation SQL: per mapped column pair (both columns projected
+    in the result), sign flips, x100/x1000 scaling, constant offsets,
+    rounding precision, timezone shifts and formatting noise; plus the key
+    shapes and categorical segments that most mismatches share.
+
+    Large results are sampled to diagnostics_max_rows.
+    """
+    if df is None or df.empty:
+        return {"rows": 0, "sampled": False, "findings": []}
+
+    total = len(df)
+    sampled = total > settings.diagnostics_max_rows
+    if sampled:
+        df = df.sample(settings.diagnostics_max_rows, random_state=0)
+
+    min_share = settings.diagnostics_min_share
+    findings: List[Dict[str, Any]] = []
+    compared = set()
+
+    for a, b in pairs:
+        # B columns named like a selected A column are projected as <name>_b
+        bc = f"{b}_b" if f"{b}_b" in df.columns else b
+        if a == bc or a not in df.columns or bc not in df.columns:
+            continue
+        x, y = df[a], df[bc]
+        compared.update((a, bc))
+        try:
+            if pd.api.types.is_datetime64_any_dtype(x) or pd.api.types.is_datetime64_any_dtype(y):
+                findings.extend(_timestamp_findings(a, b, x, y, min_share))
+            elif pd.api.types.is_numeric_dtype(x) and pd.api.types.is_numeric_dtype(y):
+                findings.extend(_numeric_findings(a, b, x, y, min_share))
+            elif pd.api.types.is_object_dtype(x) and pd.api.types.is_object_dtype(y):
+                findings.extend(_string_findings(a, b, x, y, min_share))
+        except Exception:  # a single odd column must not hide the rest
+            continue
+
+    metric_cols = {c for c in df.columns if c.endswith(("_abs_diff", "_rel_diff", "_array_score", "_string_recon"))}
+    findings.extend(_cluster_findings(df, list(key_cols or []), compared | metric_cols, min_share))
+
+    # value-level findings first, then by rows affected
+    order = {"key_cluster": 1, "segment": 1}
+    findings.sort(key=lambda f: (order.get(f["kind"], 0), -f["rows"]))
+    return {"rows": total, "sampled": sampled, "findings": findings}
+
+
+def render_findings(diag: Dict[str, Any]) -> str:
+    """Plain bullet list of the findings, used when no LLM phrasing is wanted."""
+    findings = (diag or {}).get("findings") or []
+    if not (diag or {}).get("rows"):
+        return "No reconciliation differences were found, or the query returned no rows."
+    if not findings:
+        return f"{diag['rows']} mismatched row(s); no systematic pattern was detected."
+    lines = [f"{diag['rows']} mismatched row(s)" + (" (diagnosed on a sample)" if diag.get("sampled") else "") + ":"]
+    lines += [f"- {f['message']}" for f in findings]
+    return "\n".join(lines)
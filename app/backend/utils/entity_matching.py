@@ -0,0 +1,283 @@
+# backend/utils/entity_matching.py
+
+from __future__ import annotations
+
+import difflib
+from typing import Iterable, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from backend.config import settings
+
+try:
+    from rapidfuzz.distance import Levenshtein as _rf_levenshtein
+    from rapidfuzz.process import cpdist as _rf_cpdist
+except ImportError:  # optional: difflib fallback below
+    _rf_levenshtein = None
+    _rf_cpdist = None
+
+# legal-form noise that should not decide whether two names are the same;
+# matched together with whitespace runs so one pass also collapses spaces
+_LEGAL_FORMS_OR_SPACE = (
+    r"(?:\s|\b(?:inc|incorporated|ltd|limited|llc|llp|plc|corp|corporation|co|company|"
+    r"gmbh|ag|sa|sas|nv|bv|pty|pte|srl|spa|the)\b)+"
+)
+
+_HASH_DIM = 1 << 20
+_MAX_KEY_CHARS = 64         # names are truncated for n-gram features
+_NGRAM_BATCH = 200_000
+
+
+# -------------------------------------------------------
+# Normalisation
+# -------------------------------------------------------
+def normalize_names(s: pd.Series) -> pd.Series:
+    """
+    Vectorised name key: ASCII-folded, lowercase, punctuation and legal
+    forms removed, whitespace collapsed.
+    """
+    s = s.astype(str)
+    # unicode folding is only needed for the (usually few) non-ASCII names
+    non_ascii = ~s.map(str.isascii)
+    if non_ascii.any():
+        s = s.copy()
+        s[non_ascii] = (
+            s[non_ascii].str.normalize("NFKD").str.encode("ascii", "ignore").str.decode("ascii")
+        )
+    return (
+        s.str.lower()
+        .str.replace(r"[^a-z0-9]+", " ", regex=True)
+        .str.replace(_LEGAL_FORMS_OR_SPACE, " ", regex=True)
+        .str.strip()
+    )
+
+
+# -------------------------------------------------------
+# Blocking
+# -------------------------------------------------------
+def _block_keys(keys: pd.Series, side: str) -> pd.DataFrame:
+    """
+    (row, block) pairs: one block per token, plus a 4-character prefix of
+    the space-free key so single-token names with late typos still meet.
+    Blocks are uint64 hashes, which keeps the joins off string sorting.
+    """
+    tokens = keys.str.split(" ").explode()
+    tokens = tokens[tokens.str.len() > 1]
+    tok = pd.DataFrame({
+        side: tokens.index.to_numpy(),
+        "block": pd.util.hash_array(tokens.to_numpy(dtype=object)),
+    })
+
+    prefix = keys.str.replace(" ", "", regex=False).str[:4]
+    long_enough = (prefix.str.len() >= 3).to_numpy()
+    pre = pd.DataFrame({
+        side: np.flatnonzero(long_enough),
+        # salted so a prefix never shares a block with an equal token
+        "block": pd.util.hash_array(prefix.to_numpy(dtype=object)[long_enough], hash_key="entityprefix0000"),
+    })
+    return pd.concat([tok, pre], ignore_index=True).drop_duplicates()
+
+
+def candidate_pairs(keys_l: pd.Series, keys_r: pd.Series) -> np.ndarray:
+    """
+    (il, ir) index pairs sharing a block. Blocks whose cross product exceeds
+    entity_block_cap (e.g. a token like "bank") are skipped, which keeps the
+    candidate set near-linear in the number of names.
+    """
+    bl = _block_keys(keys_l.reset_index(drop=True), "il")
+    br = _block_keys(keys_r.reset_index(drop=True), "ir")
+    if bl.empty or br.empty:
+        return np.empty((0, 2), dtype=np.int64)
+
+    nl = bl["block"].value_counts(sort=False)
+    nr = br["block"].value_counts(sort=False)
+    sizes = pd.concat([nl.rename("nl"), nr.rename("nr")], axis=1, join="inner")
+    keep = sizes.index[(sizes["nl"] * sizes["nr"]) <= settings.entity_block_cap]
+    if not len(keep):
+        return np.empty((0, 2), dtype=np.int64)
+
+    bl = bl[bl["block"].isin(keep)]
+    pairs = bl.merge(br, on="block")[["il", "ir"]].drop_duplicates()
+    return pairs.to_numpy(dtype=np.int64)
+
+
+# -------------------------------------------------------
+# Similarity
+# -------------------------------------------------------
+def _trigram_features(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hashed character trigrams of " key " for each key, fully vectorised:
+    keys become a fixed-width code-point matrix and every window of three
+    columns is hashed at once. Returns (row index, feature index) arrays.
+    """
+    padded = np.char.add(np.char.add(" ", keys.astype(f"<U{_MAX_KEY_CHARS}")), " ")
+    width = padded.dtype.itemsize // 4
+    codes = padded.view(np.uint32).reshape(len(padded), width).astype(np.uint64)
+    lengths = np.char.str_len(padded)
+
+    prime = np.uint64(1_000_003)
+    h = ((codes[:, :-2] * prime) ^ codes[:, 1:-1]) * prime ^ codes[:, 2:]
+    valid = np.arange(width - 2)[None, :] < (lengths - 2)[:, None]
+    rows, pos = np.nonzero(valid)
+    return rows, (h[rows, pos] % np.uint64(_HASH_DIM)).astype(np.int64)
+
+
+def tfidf_matrix(keys: Iterable[str], idf: np.ndarray = None) -> Tuple[sparse.csr_matrix, np.ndarray]:
+    """
+    L2-normalised character-trigram TF-IDF rows (hashed features, so no
+    vocabulary has to be held for millions of names).
+    """
+    keys = np.asarray(list(keys), dtype=object).astype(str)
+    parts = []
+    for s in range(0, len(keys), _NGRAM_BATCH):
+        rows, cols = _trigram_features(keys[s:s + _NGRAM_BATCH])
+        parts.append(sparse.csr_matrix(
+            (np.ones(len(cols), dtype=np.float32), (rows, cols)),
+            shape=(min(_NGRAM_BATCH, len(keys) - s), _HASH_DIM),
+        ))
+    m = sparse.vstack(parts, format="csr") if parts else sparse.csr_matrix((0, _HASH_DIM), dtype=np.float32)
+    m.sum_duplicates()
+
+    if idf is None:
+        df = np.bincount(m.indices, minlength=_HASH_DIM)
+        idf = (np.log((1.0 + len(keys)) / (1.0 + df)) + 1.0).astype(np.float32)
+    m = m.multiply(idf).tocsr()
+
+    norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    m = sparse.diags(1.0 / norms).dot(m).tocsr()
+    return m, idf
+
+
+def pair_cosine(ml: sparse.csr_matrix, mr: sparse.csr_matrix, pairs: np.ndarray, batch: int = 500_000) -> np.ndarray:
+    out = np.empty(len(pairs), dtype=np.float32)
+    for s in range(0, len(pairs), batch):
+        p = pairs[s:s + batch]
+        out[s:s + batch] = np.asarray(ml[p[:, 0]].multiply(mr[p[:, 1]]).sum(axis=1)).ravel()
+    return out
+
+
+def edit_similarity(a: str, b: str) -> float:
+    """Normalised edit similarity in [0, 1]."""
+    if _rf_levenshtein is not None:
+        return float(_rf_levenshtein.normalized_similarity(a, b))
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+def pair_edit_similarity(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Element-wise edit_similarity (multi-threaded C loop with rapidfuzz)."""
+    if _rf_cpdist is not None:
+        return _rf_cpdist(
+            left, right, scorer=_rf_levenshtein.normalized_similarity, workers=-1, dtype=np.float32
+        ).astype(np.float64)
+    return np.fromiter((edit_similarity(a, b) for a, b in zip(left, right)), dtype=np.float64, count=len(left))
+
+
+# -------------------------------------------------------
+# Matching
+# -------------------------------------------------------
+def _best_candidates(keys_l: pd.Series, keys_r: pd.Series, per: str) -> pd.DataFrame:
+    """
+    (il, ir, score) of the best blocked candidate for each `per` ("il" or
+    "ir") row, at or above entity_review_score. TF-IDF cosine is computed for
+    every candidate (shared IDF over both sides), edit similarity only for
+    each row's top entity_top_k by cosine.
+    """
+    empty = pd.DataFrame({"il": [], "ir": [], "score": []})
+    keys_l, keys_r = keys_l.reset_index(drop=True), keys_r.reset_index(drop=True)
+    pairs = candidate_pairs(keys_l, keys_r)
+    if not len(pairs):
+        return empty
+
+    m_all, _ = tfidf_matrix(pd.concat([keys_l, keys_r], ignore_index=True))
+    ml, mr = m_all[: len(keys_l)], m_all[len(keys_l):]
+    cos = pair_cosine(ml, mr, pairs)
+
+    cand = pd.DataFrame({"il": pairs[:, 0], "ir": pairs[:, 1], "cos": cos})
+    cand = cand[cand["cos"] >= settings.entity_min_cosine]
+    cand = cand.sort_values("cos", ascending=False).groupby(per).head(settings.entity_top_k)
+    if cand.empty:
+        return empty
+
+    kl = keys_l.to_numpy(dtype=object)[cand["il"].to_numpy()]
+    kr = keys_r.to_numpy(dtype=object)[cand["ir"].to_numpy()]
+    ed = pair_edit_similarity(kl, kr)
+    w = settings.entity_cosine_weight
+    cand = cand.assign(score=w * cand["cos"].to_numpy() + (1.0 - w) * ed)
+
+    best = cand.loc[cand.groupby(per)["score"].idxmax(), ["il", "ir", "score"]]
+    return best[best["score"] >= settings.entity_review_score]
+
+
+def match_entities(left: pd.Series, right: pd.Series) -> pd.DataFrame:
+    """
+    Match distinct left names to right names.
+
+    Returns one row per (left name, right spelling): all right names sharing
+    a matched normalised key are listed, since B writes one entity several
+    ways.
+      left, right, score, method
+    where method is "exact" (same normalised key), "similarity"
+    (score >= entity_accept_score) or "review" (in the low-confidence band
+    [entity_review_score, entity_accept_score), to be adjudicated).
+
+    Similarity runs both ways: each left name without an exact match takes
+    its best right key, and each right key no left name shares takes its
+    best left key, so B's typo spellings of an exactly matched entity are
+    linked too.
+    """
+    cols = ["left", "right", "score", "method"]
+    lvals = pd.Series(left.dropna().unique(), dtype=object)
+    rvals = pd.Series(right.dropna().unique(), dtype=object)
+    if lvals.empty or rvals.empty:
+        return pd.DataFrame(columns=cols)
+
+    lk = pd.DataFrame({"left": lvals, "key": normalize_names(lvals)})
+    rk = pd.DataFrame({"right": rvals, "key": normalize_names(rvals)})
+    lk = lk[lk["key"] != ""]
+    rk_all = rk[rk["key"] != ""]
+    # similarity runs once per distinct key
+    rk = rk_all.drop_duplicates("key").reset_index(drop=True)
+
+    # ---- 1) exact normalised-key hash join ----
+    exact = lk.merge(rk_all, on="key")[["left", "right"]]
+    exact = exact.assign(score=1.0, method="exact")
+
+    # ---- 2) A -> B: left names without an exact match, against every right key ----
+    rest = lk[~lk["left"].isin(exact["left"])].reset_index(drop=True)
+    found = []
+    if not rest.empty:
+        best = _best_candidates(rest["key"], rk["key"], per="il")
+        found.append(pd.DataFrame({
+            "left": rest["left"].to_numpy(dtype=object)[best["il"].to_numpy(dtype=np.int64)],
+            "key": rk["key"].to_numpy(dtype=object)[best["ir"].to_numpy(dtype=np.int64)],
+            "score": best["score"].to_numpy(),
+        }))
+
+    # ---- 3) B -> A: right keys no left name shares, against every left key ----
+    orphans = rk[~rk["key"].isin(lk["key"])].reset_index(drop=True)
+    lkeys = lk.drop_duplicates("key").reset_index(drop=True)
+    if not orphans.empty and not lkeys.empty:
+        best = _best_candidates(lkeys["key"], orphans["key"], per="ir")
+        back = pd.DataFrame({
+            "lkey": lkeys["key"].to_numpy(dtype=object)[best["il"].to_numpy(dtype=np.int64)],
+            "key": orphans["key"].to_numpy(dtype=object)[best["ir"].to_numpy(dtype=np.int64)],
+            "score": best["score"].to_numpy(),
+        })
+        # every left spelling of the matched left key
+        back = back.merge(lk.rename(columns={"key": "lkey"}), on="lkey")
+        found.append(back[["left", "key", "score"]])
+
+    fuzzy = pd.concat(found, ignore_index=True) if found else pd.DataFrame(columns=["left", "key", "score"])
+    if fuzzy.empty:
+        return exact[cols].reset_index(drop=True)
+    # a pair found from both sides is listed once
+    fuzzy = fuzzy.sort_values("score", ascending=False).drop_duplicates(["left", "key"])
+    fuzzy = fuzzy.assign(
+        method=np.where(fuzzy["score"].to_numpy(dtype=float) >= settings.entity_accept_score, "similarity", "review")
+    )
+    # every right spelling of the matched key
+    fuzzy = fuzzy.merge(rk_all, on="key")
+    return pd.concat([exact[cols], fuzzy[cols]], ignore_index=True)
@@ -0,0 +1,182 @@
+# backend/utils/join_keys.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from backend.config import settings
+from backend.utils.column_profile import ColumnProfile, TableProfile
+from backend.utils.sketches import HyperLogLog, MinHash, canonical_values, estimate_overlap, hash_values
+
+_KEYABLE_KINDS = {"numeric", "string", "datetime"}
+
+
+@dataclass
+class JoinKeyCandidate:
+    pairs: List[Tuple[str, str]]
+    uniqueness_a: float
+    uniqueness_b: float
+    jaccard: float
+    containment: float        # share of the smaller key set found on the other side
+    est_fanout: float         # expected output rows per matched key (1.0 = one-to-one)
+    est_join_rows: int
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "pairs": [{"a_col": a, "b_col": b} for a, b in self.pairs],
+            "uniqueness_a": round(self.uniqueness_a, 4),
+            "uniqueness_b": round(self.uniqueness_b, 4),
+            "jaccard": round(self.jaccard, 4),
+            "containment": round(self.containment, 4),
+            "est_fanout": round(self.est_fanout, 3),
+            "est_join_rows": self.est_join_rows,
+            "score": round(self.score, 4),
+        }
+
+
+# -------------------------------------------------------
+# Key statistics
+# -------------------------------------------------------
+@dataclass
+class _KeyStats:
+    non_null: int
+    distinct: int
+    minhash: MinHash
+
+    @property
+    def uniqueness(self) -> float:
+        return min(1.0, self.distinct / self.non_null) if self.non_null else 0.0
+
+
+def _single_stats(cp: ColumnProfile) -> _KeyStats:
+    return _KeyStats(non_null=cp.rows - cp.nulls, distinct=cp.distinct, minhash=cp.minhash)
+
+
+def _composite_stats(sample: pd.DataFrame, cols: List[str]) -> _KeyStats:
+    frame = sample[cols].dropna()
+    key = None
+    for c in cols:
+        part = canonical_values(frame[c])
+        key = part if key is None else key + "\x1f" + part
+    hashes = hash_values(key) if key is not None else hash_values(pd.Series([], dtype=object))
+    return _KeyStats(
+        non_null=len(frame),
+        distinct=HyperLogLog(settings.profile_hll_precision).update_hashes(hashes).count(),
+        minhash=MinHash(settings.profile_minhash_bins).update_hashes(hashes),
+    )
+
+
+def _keyable(cp: Optional[ColumnProfile]) -> bool:
+    if cp is None or cp.kind not in _KEYABLE_KINDS:
+        return False
+    # fractional amounts are unique and overlap when they agree,
+    # which makes them look like perfect (and terrible) join keys
+    if cp.kind == "numeric" and cp.integral is False:
+        return False
+    return cp.rows > cp.nulls
+
+
+def _sample_fraction(profile: TableProfile) -> float:
+    return profile.sampled_rows / profile.rows if profile.rows else 1.0
+
+
+def _evaluate(
+    pairs: List[Tuple[str, str]],
+    sa: _KeyStats,
+    sb: _KeyStats,
+    profile_a: TableProfile,
+    profile_b: TableProfile,
+) -> JoinKeyCandidate:
+    jac = sa.minhash.jaccard(sb.minhash)
+    inter = estimate_overlap(jac, sa.distinct, sb.distinct)
+
+    # Independent row samples on both sides only see f_a * f_b of the shared
+    # keys; scale the observed containment back up for the other side's rate.
+    f_a, f_b = _sample_fraction(profile_a), _sample_fraction(profile_b)
+    cont_a = min(1.0, inter / sa.distinct / f_b) if sa.distinct else 0.0
+    cont_b = min(1.0, inter / sb.distinct / f_a) if sb.distinct else 0.0
+    containment = max(cont_a, cont_b)
+
+    dup_a = sa.non_null / sa.distinct if sa.distinct else 1.0
+    dup_b = sb.non_null / sb.distinct if sb.distinct else 1.0
+    fanout = max(1.0, dup_a) * max(1.0, dup_b)
+
+    # matched A rows times the B rows each one fans out to
+    est_rows = int(round(profile_a.rows * cont_a * max(1.0, dup_b)))
+
+    score = containment * min(sa.uniqueness, sb.uniqueness)
+    return JoinKeyCandidate(
+        pairs=pairs,
+        uniqueness_a=sa.uniqueness,
+        uniqueness_b=sb.uniqueness,
+        jaccard=jac,
+        containment=containment,
+        est_fanout=fanout,
+        est_join_rows=est_rows,
+        score=score,
+    )
+
+
+# -------------------------------------------------------
+# Ranking
+# -------------------------------------------------------
+def rank_join_keys(
+    matches: List[Dict[str, Any]],
+    profile_a: TableProfile,
+    profile_b: TableProfile,
+    allow_composite: bool = True,
+) -> List[JoinKeyCandidate]:
+    """
+    Rank mapped column pairs (and pairs of them) as join keys by approximate
+    uniqueness on each side and value overlap between A and B.
+
+    Everything comes from the cached profiles and their bounded samples, so
+    this never touches the full sources.
+    """
+    singles: List[JoinKeyCandidate] = []
+    stats: Dict[Tuple[str, str], Tuple[_KeyStats, _KeyStats]] = {}
+
+    for m in matches:
+        a, b = m.get("a_col"), m.get("b_col")
+        cpa, cpb = profile_a.columns.get(a), profile_b.columns.get(b)
+        if not a or not b or (a, b) in stats or not (_keyable(cpa) and _keyable(cpb)):
+            continue
+        sa, sb = _single_stats(cpa), _single_stats(cpb)
+        stats[(a, b)] = (sa, sb)
+        cand = _evaluate([(a, b)], sa, sb, profile_a, profile_b)
+        # tie-break towards the mapper's confidence
+        cand.score += 0.01 * float(m.get("confidence") or 0.0)
+        singles.append(cand)
+
+    singles.sort(key=lambda c: c.score, reverse=True)
+    ranked = list(singles)
+
+    best_uniq = min(singles[0].uniqueness_a, singles[0].uniqueness_b) if singles else 0.0
+    can_compose = (
+        allow_composite
+        and profile_a.sample is not None
+        and profile_b.sample is not None
+        and best_uniq < settings.join_key_composite_below
+    )
+
+    if can_compose:
+        # only pairs that overlap at all are worth combining
+        base = [c for c in singles if c.containment > 0][: settings.join_key_top_singles]
+        for c1, c2 in combinations(base, 2):
+            (a1, b1), (a2, b2) = c1.pairs[0], c2.pairs[0]
+            if a1 == a2 or b1 == b2:
+                continue
+            sa = _composite_stats(profile_a.sample, [a1, a2])
+            sb = _composite_stats(profile_b.sample, [b1, b2])
+            cand = _evaluate([(a1, b1), (a2, b2)], sa, sb, profile_a, profile_b)
+            # prefer the simpler key when scores tie
+            cand.score -= 0.005
+            ranked.append(cand)
+
+    ranked.sort(key=lambda c: c.score, reverse=True)
+    return ranked
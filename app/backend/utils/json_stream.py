@@ -0,0 +1,165 @@
+# backend/utils/json_stream.py
+
+from __future__ import annotations
+
+import json
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional
+
+from backend.utils.async_utils import with_context
+
+
+class JSONArrayStream:
+    """
+    Incremental parser for the first JSON array in a text stream.
+
+    feed() returns the array elements completed by that chunk, so callers can
+    act on `[{"a": ...}, {"a": ...}, ...` long before the closing bracket.
+    Leading prose / markdown fences before the array are skipped, which also
+    makes `{"pairs": [ ... ]}` yield the elements of the inner array.
+    """
+
+    def __init__(self):
+        self._buf: List[str] = []     # text of the element being read
+        self._started = False         # inside the target array
+        self._done = False
+        self._depth = 0               # nesting inside the current element
+        self._in_str = False
+        self._escape = False
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: str) -> List[Any]:
+        out: List[Any] = []
+        for ch in chunk:
+            if self._done:
+                break
+            if not self._started:
+                if ch == "[":
+                    self._started = True
+                continue
+
+            if self._in_str:
+                self._buf.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_str = False
+                continue
+
+            if ch == '"':
+                self._in_str = True
+                self._buf.append(ch)
+            elif ch in "{[":
+                self._depth += 1
+                self._buf.append(ch)
+            elif ch in "}]":
+                if self._depth == 0:      # closing bracket of the array
+                    self._emit(out)
+                    self._done = True
+                    continue
+                self._depth -= 1
+                self._buf.append(ch)
+                if self._depth == 0:
+                    self._emit(out)
+            elif ch == "," and self._depth == 0:
+                self._emit(out)
+            else:
+                self._buf.append(ch)
+        return out
+
+    def _emit(self, out: List[Any]) -> None:
+        text = "".join(self._buf).strip()
+        self._buf = []
+        if not text:
+            return
+        try:
+            out.append(json.loads(text))
+        except ValueError:
+            pass  # malformed element: skip it, keep streaming
+
+
+@dataclass
+class StreamResult:
+    items: List[Any] = field(default_factory=list)
+    text: str = ""
+    complete: bool = False     # the stream ended (vs. deadline hit)
+    error: Optional[BaseException] = None
+
+
+def stream_json_array(
+    chunks: Iterable[str],
+    deadline_s: Optional[float] = None,
+    on_item: Optional[Callable[[Any], None]] = None,
+) -> StreamResult:
+    """
+    Consume a text stream and collect the elements of its JSON array.
+
+    The stream is drained on a worker thread, so a slow or stalled
+    completion can be cut off at `deadline_s`: the elements received so far
+    are returned with complete=False. A source with cancel() (LLMStream) is
+    cancelled right then, freeing its LLM slot; the worker closes the source
+    once its pending read returns.
+    """
+    q: "queue.Queue" = queue.Queue()
+    stop = threading.Event()
+    _END = object()
+
+    def _pump() -> None:
+        try:
+            for c in chunks:
+                if stop.is_set():
+                    break
+                q.put(c)
+        except BaseException as e:
+            q.put(e)
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            q.put(_END)
+
+    def _stop() -> None:
+        stop.set()
+        cancel = getattr(chunks, "cancel", None)
+        if cancel is not None:
+            cancel()
+
+    threading.Thread(target=with_context(_pump), name="llm-stream", daemon=True).start()
+
+    parser = JSONArrayStream()
+    res = StreamResult()
+    text: List[str] = []
+    end_at = time.monotonic() + deadline_s if deadline_s else None
+
+    while True:
+        timeout = None if end_at is None else end_at - time.monotonic()
+        if timeout is not None and timeout <= 0:
+            _stop()
+            break
+        try:
+            c = q.get(timeout=timeout)
+        except queue.Empty:
+            _stop()
+            break
+        if c is _END:
+            res.complete = True
+            break
+        if isinstance(c, BaseException):
+            res.error = c
+            break
+        text.append(c)
+        for item in parser.feed(c):
+            res.items.append(item)
+            if on_item is not None:
+                on_item(item)
+
+    res.text = "".join(text)
+    return res
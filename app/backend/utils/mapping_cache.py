@@ -0,0 +1,141 @@
+# backend/utils/mapping_cache.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from backend.config import settings
+from backend.utils.column_profile import TableProfile
+from backend.utils.logger import logger
+
+ORIGIN_MAPPER = "mapper"      # produced by SchemaMapperAgent
+ORIGIN_APPROVED = "approved"  # confirmed by a user in node_approval
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schema_mappings (
+    key        TEXT PRIMARY KEY,
+    mapping    TEXT NOT NULL,
+    origin     TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used  REAL NOT NULL,
+    hits       INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def mapping_fingerprint(profile_a: TableProfile, profile_b: TableProfile, strategy: str = "") -> str:
+    """
+    Hash of the sorted (column, profiled kind) lists of A and B (and the
+    match strategy). Row content does not matter, so tomorrow's run of the
+    same source pair hits.
+    """
+    sig = [
+        sorted((c, p.kind) for c, p in profile_a.columns.items()),
+        sorted((c, p.kind) for c, p in profile_b.columns.items()),
+        strategy,
+    ]
+    return hashlib.sha256(json.dumps(sig).encode("utf-8")).hexdigest()
+
+
+class MappingCache:
+    """
+    SQLite-backed schema-mapping cache with TTL expiry and LRU eviction.
+    User-approved mappings are never overwritten by mapper output.
+    """
+
+    def __init__(self, path: str, ttl_s: int, max_entries: int):
+        self.path = path
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._ready = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._ready:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        try:
+            if not self._ready:
+                conn.execute(_SCHEMA)
+                self._ready = True
+            with conn:  # commit / rollback
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT mapping, origin, created_at, hits FROM schema_mappings WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            mapping, origin, created_at, hits = row
+            if now - created_at > self.ttl_s:
+                conn.execute("DELETE FROM schema_mappings WHERE key = ?", (key,))
+                return None
+            conn.execute(
+                "UPDATE schema_mappings SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                (now, key),
+            )
+        return {
+            "mapping": json.loads(mapping),
+            "origin": origin,
+            "created_at": created_at,
+            "hits": hits + 1,
+        }
+
+    def put(self, key: str, mapping: Dict[str, Any], origin: str = ORIGIN_MAPPER) -> None:
+        now = time.time()
+        payload = json.dumps(
+            {k: v for k, v in mapping.items() if k != "provenance"}, default=str
+        )
+        with self._lock, self._connect() as conn:
+            if origin != ORIGIN_APPROVED:
+                existing = conn.execute(
+                    "SELECT origin, created_at FROM schema_mappings WHERE key = ?", (key,)
+                ).fetchone()
+                if existing and existing[0] == ORIGIN_APPROVED and now - existing[1] <= self.ttl_s:
+                    return
+            conn.execute(
+                "INSERT OR REPLACE INTO schema_mappings (key, mapping, origin, created_at, last_used, hits) "
+                "VALUES (?, ?, ?, ?, ?, 0)",
+                (key, payload, origin, now, now),
+            )
+            # LRU eviction beyond max_entries
+            conn.execute(
+                "DELETE FROM schema_mappings WHERE key IN ("
+                " SELECT key FROM schema_mappings ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+
+mapping_cache = MappingCache(
+    path=settings.mapping_cache_path,
+    ttl_s=settings.mapping_cache_ttl_s,
+    max_entries=settings.mapping_cache_max_entries,
+)
+
+
+def seed_approved_mapping(mapping: Dict[str, Any]) -> None:
+    """
+    Store a user-approved mapping under the key the mapper reported in its
+    provenance (no-op when the mapping did not come through the cache layer).
+    """
+    key = (mapping.get("provenance") or {}).get("key")
+    if not key or not mapping.get("matches") or not settings.mapping_cache_enabled:
+        return
+    try:
+        mapping_cache.put(key, mapping, origin=ORIGIN_APPROVED)
+    except Exception as e:
+        logger.error("mapping_cache: failed to store approved mapping: %s", e)
@@ -0,0 +1,224 @@
+# backend/utils/metrics.py
+
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+try:
+    import prometheus_client as prom
+except ImportError:  # optional: a minimal text exposition is rendered instead
+    prom = None
+
+
+# -------------------------------------------------------
+# Memory probes
+# -------------------------------------------------------
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size in bytes (Linux /proc; None elsewhere)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def peak_rss() -> Optional[int]:
+    """Process high-water mark in bytes."""
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+# -------------------------------------------------------
+# Per-node collector
+# -------------------------------------------------------
+class NodeMetrics:
+    """
+    Counters for one graph node. Connector and provider calls made while the
+    node runs add to it through the record_* helpers (the collector travels
+    in a contextvar, so pool threads started with a copied context count too).
+    """
+
+    def __init__(self, node: str):
+        self.node = node
+        self._lock = threading.Lock()
+        self.counters: Dict[str, float] = {
+            "rows_in": 0,
+            "rows_out": 0,
+            "bq_jobs": 0,
+            "bq_bytes_processed": 0,
+            "bq_bytes_billed": 0,
+            "bq_slot_ms": 0,
+            "llm_prompt_tokens": 0,
+            "llm_completion_tokens": 0,
+        }
+        self.wall_s = 0.0
+        self.rss_delta = None
+        self.peak_rss_delta = None
+
+    def add(self, **values: Any) -> None:
+        with self._lock:
+            for k, v in values.items():
+                if v is not None:
+                    self.counters[k] = self.counters.get(k, 0) + v
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            out = {k: int(v) for k, v in self.counters.items()}
+        out.update({
+            "wall_ms": round(self.wall_s * 1000, 1),
+            "rss_delta_bytes": self.rss_delta,
+            "peak_rss_delta_bytes": self.peak_rss_delta,
+        })
+        return out
+
+
+_current: contextvars.ContextVar[Optional[NodeMetrics]] = contextvars.ContextVar("recon_node_metrics", default=None)
+
+
+# -------------------------------------------------------
+# Prometheus
+# -------------------------------------------------------
+if prom is not None:
+    _NODE_SECONDS = prom.Histogram(
+        "recon_node_duration_seconds", "Wall time per graph node", ["node"],
+        buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 900),
+    )
+    _NODE_PEAK_RSS = prom.Gauge("recon_node_peak_rss_delta_bytes", "Peak RSS growth of the last run of a node", ["node"])
+    _ROWS = prom.Counter("recon_rows_total", "Rows read (in) / written (out) by connectors", ["node", "direction"])
+    _BQ_BYTES = prom.Counter("recon_bq_bytes_processed_total", "BigQuery bytes processed", ["node"])
+    _BQ_BILLED = prom.Counter("recon_bq_bytes_billed_total", "BigQuery bytes billed", ["node"])
+    _BQ_SLOT_MS = prom.Counter("recon_bq_slot_ms_total", "BigQuery slot milliseconds", ["node"])
+    _LLM_TOKENS = prom.Counter("recon_llm_tokens_total", "LLM tokens", ["provider", "model", "kind"])
+
+
+class _FallbackRegistry:
+    """In-process totals rendered in Prometheus text format without prometheus_client."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, name: str, labels: Dict[str, str], value: float) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def render(self) -> str:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = []
+        for (name, labels), value in items:
+            lbl = ",".join(f'{k}="{v}"' for k, v in labels)
+            lines.append(f"{name}{{{lbl}}} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+_fallback = _FallbackRegistry()
+
+
+def _inc(name: str, value: Optional[float], **labels: str) -> None:
+    if not value:
+        return
+    if prom is not None:
+        metric = {
+            "recon_bq_bytes_processed_total": _BQ_BYTES,
+            "recon_bq_bytes_billed_total": _BQ_BILLED,
+            "recon_bq_slot_ms_total": _BQ_SLOT_MS,
+            "recon_llm_tokens_total": _LLM_TOKENS,
+            "recon_rows_total": _ROWS,
+        }[name]
+        metric.labels(**labels).inc(value)
+    else:
+        _fallback.inc(name, labels, value)
+
+
+def render_prometheus() -> tuple:
+    """(body, content type) for the /metrics endpoint."""
+    if prom is not None:
+        return prom.generate_latest(), prom.CONTENT_TYPE_LATEST
+    return _fallback.render().encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+
+
+# -------------------------------------------------------
+# Recording helpers (safe to call anywhere)
+# -------------------------------------------------------
+def _node_label() -> str:
+    m = _current.get()
+    return m.node if m is not None else "none"
+
+
+def record_rows(rows_in: Optional[int] = None, rows_out: Optional[int] = None) -> None:
+    node = _node_label()
+    _inc("recon_rows_total", rows_in, node=node, direction="in")
+    _inc("recon_rows_total", rows_out, node=node, direction="out")
+    m = _current.get()
+    if m is not None:
+        m.add(rows_in=rows_in, rows_out=rows_out)
+
+
+def record_bq_job(stats: Dict[str, Any]) -> None:
+    """stats as returned by bigquery_connector._job_stats."""
+    node = _node_label()
+    _inc("recon_bq_bytes_processed_total", stats.get("bytes_processed"), node=node)
+    _inc("recon_bq_bytes_billed_total", stats.get("bytes_billed"), node=node)
+    _inc("recon_bq_slot_ms_total", stats.get("slot_ms"), node=node)
+    m = _current.get()
+    if m is not None:
+        m.add(bq_jobs=1, bq_bytes_processed=stats.get("bytes_processed"),
+              bq_bytes_billed=stats.get("bytes_billed"), bq_slot_ms=stats.get("slot_ms"))
+
+
+def record_llm_tokens(provider: str, model: str, prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+    _inc("recon_llm_tokens_total", prompt_tokens, provider=provider, model=model or "", kind="prompt")
+    _inc("recon_llm_tokens_total", completion_tokens, provider=provider, model=model or "", kind="completion")
+    m = _current.get()
+    if m is not None:
+        m.add(llm_prompt_tokens=prompt_tokens, llm_completion_tokens=completion_tokens)
+
+
+# -------------------------------------------------------
+# Node scope
+# -------------------------------------------------------
+@contextmanager
+def measure_node(node: str) -> Iterator[NodeMetrics]:
+    """
+    Collect wall time, RSS growth and connector / LLM counters for the
+    code run inside the block (one graph node).
+    """
+    m = NodeMetrics(node)
+    token = _current.set(m)
+    rss0, peak0 = current_rss(), peak_rss()
+    t0 = time.perf_counter()
+    try:
+        yield m
+    finally:
+        m.wall_s = time.perf_counter() - t0
+        rss1, peak1 = current_rss(), peak_rss()
+        if rss0 is not None and rss1 is not None:
+            m.rss_delta = rss1 - rss0
+        if peak0 is not None and peak1 is not None:
+            m.peak_rss_delta = peak1 - peak0
+        _current.reset(token)
+
+        if prom is not None:
+            _NODE_SECONDS.labels(node=node).observe(m.wall_s)
+            if m.peak_rss_delta is not None:
+                _NODE_PEAK_RSS.labels(node=node).set(m.peak_rss_delta)
+        else:
+            _fallback.inc("recon_node_duration_seconds_sum", {"node": node}, m.wall_s)
+            _fallback.inc("recon_node_duration_seconds_count", {"node": node}, 1)
@@ -0,0 +1,170 @@
+# backend/utils/profiling.py
+
+from __future__ import annotations
+
+import cProfile
+import glob
+import io
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from backend.config import settings
+from backend.utils.logger import logger
+
+MODES = ("cprofile", "sample")
+_SUFFIX = {"cprofile": ".pstats", "sample": ".collapsed"}
+_SAFE_ID = re.compile(r"^[A-Za-z0-9_.-]{1,128}$")
+
+# only one deterministic profiler can be attached to the interpreter at a time
+_cprofile_lock = threading.Lock()
+
+
+# -------------------------------------------------------
+# Sampling profiler
+# -------------------------------------------------------
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    # collapsed-stack format: ';' separates frames, the last ' ' precedes the count
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class _Sampler(threading.Thread):
+    """
+    Walks the target thread's stack every `interval` seconds and counts
+    identical stacks (py-spy style, in-process). Work handed to pool threads
+    shows up as the waiting caller frame.
+    """
+
+    def __init__(self, target_ident: int, interval: float):
+        super().__init__(name="recon-profiler", daemon=True)
+        self.target_ident = target_ident
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.target_ident)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+# -------------------------------------------------------
+# Storage
+# -------------------------------------------------------
+def profile_path(run_id: str, mode: str) -> str:
+    if not _SAFE_ID.match(run_id or ""):
+        raise ValueError(f"Invalid run_id for a profile: {run_id!r}")
+    return os.path.join(settings.profile_dir, f"{run_id}{_SUFFIX[mode]}")
+
+
+def find_profile(run_id: str) -> Optional[Dict[str, str]]:
+    """{"mode", "path"} of the latest stored profile of a run, or None."""
+    if not _SAFE_ID.match(run_id or ""):
+        return None
+    found = [{"mode": m, "path": profile_path(run_id, m)} for m in MODES]
+    found = [f for f in found if os.path.exists(f["path"])]
+    return max(found, key=lambda f: os.path.getmtime(f["path"])) if found else None
+
+
+def _prune() -> None:
+    files = sorted(
+        (p for suffix in _SUFFIX.values() for p in glob.glob(os.path.join(settings.profile_dir, f"*{suffix}"))),
+        key=os.path.getmtime,
+    )
+    for path in files[:max(0, len(files) - settings.profile_max_files)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def top_functions(path: str, limit: int = 50) -> str:
+    """Text summary of a .pstats file, sorted by cumulative time."""
+    buf = io.StringIO()
+    pstats.Stats(path, stream=buf).sort_stats("cumulative").print_stats(limit)
+    return buf.getvalue()
+
+
+# -------------------------------------------------------
+# Run scope
+# -------------------------------------------------------
+@contextmanager
+def profile_run(run_id: str, mode: Optional[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Profile the code run inside the block on the calling thread and store
+    the result under settings.profile_dir as <run_id>.pstats ("cprofile")
+    or <run_id>.collapsed ("sample", flamegraph / speedscope input).
+
+    Yields a dict that is filled with {"mode", "path", "bytes", ...} once
+    the block exits; it stays empty when mode is None, profiling is disabled,
+    or a deterministic profiler is already busy with another run.
+    """
+    info: Dict[str, Any] = {}
+    if not mode or not settings.profiling_enabled:
+        yield info
+        return
+    if mode not in MODES:
+        raise ValueError(f"profile must be one of {', '.join(MODES)}")
+    path = profile_path(run_id, mode)
+
+    profiler: Any = None
+    if mode == "cprofile":
+        if _cprofile_lock.acquire(blocking=False):
+            profiler = cProfile.Profile()
+        else:
+            logger.warning("Run %s not profiled: another cProfile run is active", run_id)
+            yield info
+            return
+    else:
+        profiler = _Sampler(threading.get_ident(), settings.profile_sample_interval_s)
+
+    t0 = time.perf_counter()
+    try:
+        if mode == "cprofile":
+            profiler.enable()
+        else:
+            profiler.start()
+        yield info
+    finally:
+        wall_s = time.perf_counter() - t0
+        try:
+            if mode == "cprofile":
+                try:
+                    profiler.disable()
+                finally:
+                    _cprofile_lock.release()
+            else:
+                profiler.stop()
+            os.makedirs(settings.profile_dir, exist_ok=True)
+            if mode == "cprofile":
+                profiler.dump_stats(path)
+            else:
+                with open(path, "w") as f:
+                    f.write(profiler.collapsed())
+                info["samples"] = profiler.samples
+            _prune()
+            info.update({"mode": mode, "path": path, "bytes": os.path.getsize(path), "wall_s": round(wall_s, 3)})
+        except Exception as e:
+            logger.warning("Storing the profile of run %s failed: %s", run_id, e)
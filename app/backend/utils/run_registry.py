@@ -0,0 +1,176 @@
+# backend/utils/run_registry.py
+
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.utils.artifact_store import artifact_store
+
+
+class RunRegistry:
+    """
+    In-process progress board for reconciliation runs, keyed by run_id.
+    Nodes and agents post their stage and counters; the UI polls
+    GET /api/runs/{run_id}. Old runs are dropped by age and count.
+
+    Each run also keeps an ordered event log (node start/end, explanation,
+    run end) that SSE clients follow with `wait_events`, and the final
+    result once the run is done. That result is a summary without rows
+    (they stay in the artifact store); on_evict(run_id) is called for every
+    run dropped from the board, to release what it still holds there.
+    """
+
+    def __init__(self, max_runs: int = 500, ttl_s: int = 3600,
+                 on_evict: Optional[Callable[[str], None]] = None):
+        self.max_runs = max_runs
+        self.ttl_s = ttl_s
+        self.on_evict = on_evict
+        self._runs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._events: Dict[str, List[Dict[str, Any]]] = {}
+        self._results: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    @staticmethod
+    def new_id() -> str:
+        return uuid.uuid4().hex
+
+    def start(self, run_id: str, **info: Any) -> None:
+        now = time.time()
+        with self._lock:
+            live = self._runs.get(run_id)
+            if live is not None and live["status"] == "RUNNING":
+                # registered up front (e.g. by a streaming route); keep its log
+                live.update(info)
+                live["updated_at"] = now
+                return
+            self._runs[run_id] = {
+                "run_id": run_id,
+                "status": "RUNNING",
+                "stage": None,
+                "started_at": now,
+                "updated_at": now,
+                "progress": {},
+                **info,
+            }
+            self._runs.move_to_end(run_id)
+            self._events[run_id] = []
+            self._results.pop(run_id, None)
+            self._append(run_id, "run_start", {})
+            evicted = self._evict(now)
+        # file I/O stays outside the lock
+        if self.on_evict is not None:
+            for old_id in evicted:
+                self.on_evict(old_id)
+
+    def update(self, run_id: Optional[str], stage: Optional[str] = None, **progress: Any) -> None:
+        if not run_id:
+            return
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                return
+            if stage is not None:
+                run["stage"] = stage
+            if progress:
+                run["progress"].setdefault(run["stage"] or "run", {}).update(progress)
+            run["updated_at"] = time.time()
+
+    def finish(self, run_id: Optional[str], status: str, result: Any = None, **info: Any) -> None:
+        if not run_id:
+            return
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                return
+            run.update(info)
+            run["status"] = status
+            run["updated_at"] = time.time()
+            if result is not None:
+                self._results[run_id] = result
+            self._append(run_id, "run_end", {"status": status, **info})
+
+    def annotate(self, run_id: Optional[str], **info: Any) -> None:
+        """Attach top-level fields (e.g. a background explanation) to a run."""
+        if not run_id:
+            return
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                return
+            run.update(info)
+            run["updated_at"] = time.time()
+            for key, value in info.items():
+                self._append(run_id, key, value if isinstance(value, dict) else {"value": value})
+
+    # -------------------------------------------------------
+    # Event log
+    # -------------------------------------------------------
+    def _append(self, run_id: str, event: str, data: Dict[str, Any]) -> None:
+        # caller holds self._lock
+        log = self._events.setdefault(run_id, [])
+        log.append({"seq": len(log), "event": event, "ts": time.time(), **data})
+        self._changed.notify_all()
+
+    def emit(self, run_id: Optional[str], event: str, **data: Any) -> None:
+        if not run_id:
+            return
+        with self._lock:
+            if run_id in self._runs:
+                self._append(run_id, event, data)
+
+    def wait_events(
+        self, run_id: str, after: int = -1, timeout: float = 15.0
+    ) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+        """
+        (events with seq > after, done) for a run, blocking up to `timeout`
+        for new ones. done is True once the run has ended and no background
+        explanation is pending. None for an unknown run.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                run = self._runs.get(run_id)
+                if run is None:
+                    return None
+                log = self._events.get(run_id, [])
+                done = run["status"] != "RUNNING" and (run.get("explanation") or {}).get("status") != "PENDING"
+                new = log[after + 1:]
+                remaining = deadline - time.monotonic()
+                if new or done or remaining <= 0:
+                    return [dict(e) for e in new], done
+                self._changed.wait(remaining)
+
+    def result(self, run_id: str) -> Any:
+        with self._lock:
+            return self._results.get(run_id)
+
+    def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            run = self._runs.get(run_id)
+            if run is None:
+                return None
+            out = dict(run)
+            out["progress"] = {k: dict(v) for k, v in run["progress"].items()}
+            return out
+
+    def _evict(self, now: float) -> List[str]:
+        # caller holds self._lock; returns the evicted run ids
+        evicted: List[str] = []
+        while self._runs:
+            oldest_id, oldest = next(iter(self._runs.items()))
+            if len(self._runs) > self.max_runs or now - oldest["updated_at"] > self.ttl_s:
+                self._runs.popitem(last=False)
+                self._events.pop(oldest_id, None)
+                self._results.pop(oldest_id, None)
+                evicted.append(oldest_id)
+            else:
+                break
+        return evicted
+
+
+run_registry = RunRegistry(on_evict=artifact_store.drop_run)
@@ -0,0 +1,134 @@
+# backend/utils/similarity_matrix.py
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from backend.config import settings
+from backend.utils.similarity import name_similarity, normalize, tokenize
+
+
+# -------------------------------------------------------
+# Featurisation (each name is normalised / tokenised once)
+# -------------------------------------------------------
+def _char_ngrams(name: str, n: int = 2) -> List[str]:
+    s = f" {normalize(name)} "
+    return [s[i:i + n] for i in range(len(s) - n + 1)]
+
+
+def _incidence(features: List[List[str]], vocab: Dict[str, int], binary: bool) -> np.ndarray:
+    m = np.zeros((len(features), len(vocab)), dtype=np.float32)
+    for i, feats in enumerate(features):
+        for f in feats:
+            if binary:
+                m[i, vocab[f]] = 1.0
+            else:
+                m[i, vocab[f]] += 1.0
+    return m
+
+
+def _vocab(*feature_lists: List[List[str]]) -> Dict[str, int]:
+    vocab: Dict[str, int] = {}
+    for features in feature_lists:
+        for feats in features:
+            for f in feats:
+                vocab.setdefault(f, len(vocab))
+    return vocab
+
+
+def _token_jaccard_matrix(names_a: Sequence[str], names_b: Sequence[str]) -> np.ndarray:
+    toks_a = [sorted(set(tokenize(n))) for n in names_a]
+    toks_b = [sorted(set(tokenize(n))) for n in names_b]
+    vocab = _vocab(toks_a, toks_b)
+    ta = _incidence(toks_a, vocab, binary=True)
+    tb = _incidence(toks_b, vocab, binary=True)
+
+    inter = ta @ tb.T
+    union = ta.sum(axis=1)[:, None] + tb.sum(axis=1)[None, :] - inter
+    out = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+    # same convention as jaccard_tokens: two empty token sets are identical
+    out[union == 0] = 1.0
+    return out
+
+
+def _ngram_cosine_matrix(names_a: Sequence[str], names_b: Sequence[str]) -> np.ndarray:
+    grams_a = [_char_ngrams(n) for n in names_a]
+    grams_b = [_char_ngrams(n) for n in names_b]
+    vocab = _vocab(grams_a, grams_b)
+    ga = _incidence(grams_a, vocab, binary=False)
+    gb = _incidence(grams_b, vocab, binary=False)
+
+    for m in (ga, gb):
+        norms = np.linalg.norm(m, axis=1, keepdims=True)
+        np.divide(m, norms, out=m, where=norms > 0)
+    return ga @ gb.T
+
+
+# -------------------------------------------------------
+# All-pairs matrix
+# -------------------------------------------------------
+def _compute(names_a: Tuple[str, ...], names_b: Tuple[str, ...], top_k: int) -> np.ndarray:
+    """
+    Batched approximation (50% token Jaccard + 50% character-bigram cosine)
+    for every pair picks the candidates: each A column's top_k B columns and
+    each B column's top_k A columns. Those cells get the exact
+    name_similarity, so thresholds tuned on it keep their meaning. Every
+    other cell is capped below the exact scores of its row and column, so
+    an approximate score never outranks an exact one at argmax or
+    assignment time.
+    """
+    if not names_a or not names_b:
+        return np.zeros((len(names_a), len(names_b)), dtype=np.float32)
+
+    approx = 0.5 * _token_jaccard_matrix(names_a, names_b) + 0.5 * _ngram_cosine_matrix(names_a, names_b)
+
+    chosen = np.zeros(approx.shape, dtype=bool)
+    ka, kb = min(top_k, len(names_b)), min(top_k, len(names_a))
+    if ka:
+        rows = np.argpartition(-approx, ka - 1, axis=1)[:, :ka]
+        np.put_along_axis(chosen, rows, True, axis=1)
+    if kb:
+        cols = np.argpartition(-approx, kb - 1, axis=0)[:kb, :]
+        np.put_along_axis(chosen, cols, True, axis=0)
+
+    exact = np.full(approx.shape, np.inf, dtype=np.float32)
+    for i, j in zip(*np.nonzero(chosen)):
+        exact[i, j] = name_similarity(names_a[i], names_b[j])
+
+    # other cells keep their approximation, capped at the lowest exact score
+    # in their row and column so they never outrank a candidate there
+    cap = np.minimum(exact.min(axis=1)[:, None], exact.min(axis=0)[None, :])
+    scores = np.where(chosen, exact, np.minimum(approx, cap)).astype(np.float32)
+    scores.setflags(write=False)
+    return scores
+
+
+_CACHE: "OrderedDict[Tuple[Tuple[str, ...], Tuple[str, ...], int], np.ndarray]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def name_similarity_matrix(cols_a: Sequence[str], cols_b: Sequence[str]) -> np.ndarray:
+    """
+    |A| x |B| float32 matrix of name similarities (read-only, cached by the
+    exact column lists); see _compute for which cells are exact.
+    """
+    top_k = settings.name_sim_refine_top_k
+    key = (tuple(map(str, cols_a)), tuple(map(str, cols_b)), top_k)
+
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None:
+            _CACHE.move_to_end(key)
+            return hit
+
+    scores = _compute(key[0], key[1], top_k)
+
+    with _CACHE_LOCK:
+        _CACHE[key] = scores
+        while len(_CACHE) > settings.name_sim_cache_size:
+            _CACHE.popitem(last=False)
+    return scores
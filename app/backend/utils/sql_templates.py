@@ -32,6 +32,7 @@ def basic_reconciliation_sql(
     thresholds: Dict,
     array_pairs: List[Tuple[str, str]] | None = None,
     string_pairs: List[Tuple[str, str]] | None = None,
+    crosswalks: Dict[Tuple[str, str], str] | None = None,
 ) -> str:
     """
     table_a / table_b: fully-qualified table IDs
@@ -39,13 +40,54 @@ def basic_reconciliation_sql(
     numeric_pairs: list of (a_col, b_col) numeric comparisons
     array_pairs:   list of (a_col, b_col) array<STRING> comparisons
     string_pairs:  list of (a_col, b_col) string comparisons
+    crosswalks:    (a_col, b_col) -> relation with (val, entity_key) rows;
+                   A and B values are both looked up in it (same scan) and
+                   joined / compared through their entity key. Values not
+                   listed keep their own spelling, and a string pair whose
+                   raw values already match stays a MATCH.
+
+    Only the join and compared columns are selected (never a.* / b.*), so
+    BigQuery scans and returns just those; a B column whose name is also
+    a selected A column comes back as <name>_b.
     """
 
     array_pairs = array_pairs or []
     string_pairs = string_pairs or []
+    crosswalks = crosswalks or {}
+
+    # 0) Entity crosswalks: LEFT JOIN onto A; B is looked up inside its own
+    #    subquery so join conditions can use its key. Unlisted values pass through
+    xw_alias: Dict[Tuple[str, str], str] = {}
+    xw_joins: List[str] = []
+    b_joins: List[str] = []
+    b_keys: List[str] = []
+    for i, ((a, b), rel) in enumerate(crosswalks.items()):
+        alias = f"xw{i}"
+        xw_alias[(a, b)] = alias
+        xw_joins.append(f"    LEFT JOIN {rel} {alias}\n      ON CAST(a.{a} AS STRING) = {alias}.val")
+        b_joins.append(f"        LEFT JOIN {rel} {alias}b\n          ON CAST(b.{b} AS STRING) = {alias}b.val")
+        b_keys.append(f"{alias}b.entity_key AS {alias}_key")
+
+    def a_key(a: str, b: str) -> str:
+        return f"COALESCE({xw_alias[(a, b)]}.entity_key, CAST(a.{a} AS STRING))"
+
+    def b_key(a: str, b: str) -> str:
+        return f"COALESCE(b.{xw_alias[(a, b)]}_key, CAST(b.{b} AS STRING))"
+
+    if b_joins:
+        b_block = "\n".join(b_joins)
+        b_from = (
+            f"    JOIN (\n        SELECT b.*, {', '.join(b_keys)}\n"
+            f"        FROM `{table_b}` b\n{b_block}\n    ) b"
+        )
+    else:
+        b_from = f"    JOIN `{table_b}` b"
 
     # 1) JOIN condition
-    join_cond = " AND ".join([f"a.{a} = b.{b}" for (a, b) in join_pairs])
+    join_cond = " AND ".join([
+        f"{a_key(a, b)} = {b_key(a, b)}" if (a, b) in xw_alias else f"a.{a} = b.{b}"
+        for (a, b) in join_pairs
+    ])
 
     abs_thr = thresholds.get("abs", 0.0)
     rel_thr = thresholds.get("rel", 0.0)
@@ -84,36 +126,42 @@ f"""        ABS(a.{a_col} - b.{b_col}) AS {abs_alias},
 
     for (a_col, b_col) in string_pairs:
         recon_alias = f"{a_col}_string_recon"
+        # crosswalk only adds matches: raw equality is checked first
+        entity_case = ""
+        if (a_col, b_col) in xw_alias:
+            entity_case = (
+                f"\n            WHEN LOWER({a_key(a_col, b_col)}) = LOWER({b_key(a_col, b_col)}) THEN 'MATCH'"
+            )
         string_selects.append(
 f"""        CASE
             WHEN a.{a_col} IS NULL AND b.{b_col} IS NULL THEN 'MATCH'
             WHEN a.{a_col} IS NULL OR b.{b_col} IS NULL THEN 'MISMATCH'
-            WHEN LOWER(CAST(a.{a_col} AS STRING)) = LOWER(CAST(b.{b_col} AS STRING)) THEN 'MATCH'
+            WHEN LOWER(CAST(a.{a_col} AS STRING)) = LOWER(CAST(b.{b_col} AS STRING)) THEN 'MATCH'{entity_case}
             ELSE 'MISMATCH'
         END AS {recon_alias}"""
         )
         string_where.append(f"{recon_alias} = 'MISMATCH'")
 
+    # resolved entity key next to the raw value, for review
+    alias_selects = [
+        f"        {alias}.entity_key AS {a}_entity_alias" for (a, _b), alias in xw_alias.items()
+    ]
+
     # 5) WHERE clause: any mismatch (numeric, array, string)
     where_clauses = numeric_where + array_where + string_where
     where_clause = " OR ".join(where_clauses) if where_clauses else "FALSE"
 
-    # 6) Assemble SELECT projection
-    all_metric_selects = numeric_selects + array_selects + string_selects
-    if all_metric_selects:
-        metrics_block = ",\n".join(all_metric_selects)
-        select_body = f"""
-    SELECT
-        a.*,
-        b.*,
-{metrics_block}
-"""
-    else:
-        select_body = """
-    SELECT
-        a.*,
-        b.*
-"""
+    # 6) Assemble SELECT projection: keys + compared columns, then metrics
+    all_pairs = join_pairs + numeric_pairs + array_pairs + string_pairs
+    cols_a = list(dict.fromkeys(a for a, _ in all_pairs))
+    cols_b = list(dict.fromkeys(b for _, b in all_pairs))
+    column_selects = [f"        a.{a}" for a in cols_a] + [
+        f"        b.{b} AS {b}_b" if b in cols_a else f"        b.{b}" for b in cols_b
+    ]
+    all_selects = column_selects + numeric_selects + array_selects + string_selects + alias_selects
+    select_body = "\n    SELECT\n" + ",\n".join(all_selects) + "\n"
+
+    xw_block = "".join(j + "\n" for j in xw_joins)
 
     # 7) Final SQL
     return f"""
@@ -122,7 +170,7 @@ f"""        CASE
 WITH joined AS (
 {select_body}
     FROM `{table_a}` a
-    JOIN `{table_b}` b
+{xw_block}{b_from}
       ON {join_cond}
 )
 SELECT *
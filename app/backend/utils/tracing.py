@@ -0,0 +1,134 @@
+# backend/utils/tracing.py
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+
+from backend.config import settings
+from backend.utils.logger import logger
+
+try:
+    from opentelemetry import trace as _otel_trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor
+except ImportError:  # optional: spans become no-ops
+    _otel_trace = None
+
+_init_lock = threading.Lock()
+_tracer = None
+
+
+class _NoopSpan:
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+def _exporter():
+    kind = (settings.tracing_exporter or "").lower()
+    if kind == "console":
+        return ConsoleSpanExporter(), SimpleSpanProcessor
+    if kind == "file":
+        # one JSON document per line, readable offline
+        out = open(settings.tracing_file_path, "a", buffering=1)
+        return ConsoleSpanExporter(out=out, formatter=lambda s: s.to_json(indent=None) + "\n"), SimpleSpanProcessor
+    if kind == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        kwargs = {"endpoint": settings.otlp_endpoint} if settings.otlp_endpoint else {}
+        return OTLPSpanExporter(**kwargs), BatchSpanProcessor
+    return None, None
+
+
+def get_tracer():
+    """
+    Tracer configured from tracing_exporter ("" off, "console", "file",
+    "otlp"); None when tracing is off or OpenTelemetry is not installed.
+    """
+    global _tracer
+    if _tracer is not None or _otel_trace is None or not settings.tracing_exporter:
+        return _tracer
+    with _init_lock:
+        if _tracer is None:
+            try:
+                exporter, processor = _exporter()
+            except Exception as e:
+                logger.warning("Tracing disabled, exporter setup failed: %s", e)
+                settings.tracing_exporter = ""
+                return None
+            if exporter is None:
+                return None
+            provider = TracerProvider(resource=Resource.create({"service.name": settings.tracing_service_name}))
+            provider.add_span_processor(processor(exporter))
+            _tracer = provider.get_tracer("recon")
+    return _tracer
+
+
+def _clean(value: Any) -> Any:
+    # OTel attributes: str / bool / int / float (or sequences of them)
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    return str(value)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Child span of the current context. Exceptions are recorded and re-raised.
+    Yields an object with set_attribute (a no-op when tracing is off).
+    """
+    tracer = get_tracer()
+    if tracer is None:
+        yield _NOOP
+        return
+    with tracer.start_as_current_span(name) as s:
+        for k, v in attributes.items():
+            if v is not None:
+                s.set_attribute(k, _clean(v))
+        yield s
+
+
+def start_span(name: str, **attributes: Any) -> Any:
+    """
+    Span under the current context that is NOT made current; the caller
+    ends it. For generators, whose frames can resume in other contexts.
+    """
+    tracer = get_tracer()
+    if tracer is None:
+        return _NOOP
+    s = tracer.start_span(name)
+    for k, v in attributes.items():
+        if v is not None:
+            s.set_attribute(k, _clean(v))
+    return s
+
+
+def set_attributes(**attributes: Any) -> None:
+    """Annotate the current span (e.g. token counts known only after a call)."""
+    if _otel_trace is None or get_tracer() is None:
+        return
+    s = _otel_trace.get_current_span()
+    for k, v in attributes.items():
+        if v is not None:
+            s.set_attribute(k, _clean(v))
+
+
+def trace_ids() -> Dict[str, str]:
+    """Trace / span id of the current span, for logs and run results."""
+    if _otel_trace is None or get_tracer() is None:
+        return {}
+    ctx = _otel_trace.get_current_span().get_span_context()
+    if not ctx.is_valid:
+        return {}
+    return {"trace_id": format(ctx.trace_id, "032x"), "span_id": format(ctx.span_id, "016x")}
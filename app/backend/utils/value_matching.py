@@ -0,0 +1,183 @@
+# backend/utils/value_matching.py
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.config import settings
+from backend.utils.column_profile import QUANTILE_GRID, ColumnProfile, TableProfile
+from backend.utils.sketches import EMPTY_BIN
+
+# kinds whose values can be compared across sides by set overlap
+_SET_KINDS = {"numeric", "string", "datetime", "boolean"}
+
+_Q25, _Q50, _Q75 = (int(np.searchsorted(QUANTILE_GRID, q)) for q in (0.25, 0.5, 0.75))
+
+
+# -------------------------------------------------------
+# Signature matrices
+# -------------------------------------------------------
+def _signatures(profile: TableProfile, cols: List[str]) -> np.ndarray:
+    if not cols:
+        return np.empty((0, settings.profile_minhash_bins), dtype=np.uint64)
+    return np.vstack([profile.columns[c].minhash.signature for c in cols])
+
+
+def _band_keys(sig: np.ndarray, bands: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hash each band of each signature to one uint64 key.
+    Returns (keys[n_cols, bands], usable[n_cols, bands]); a band that is
+    entirely empty carries no evidence and is not indexed.
+    """
+    n, k = sig.shape
+    rows = k // bands
+    view = sig[:, : bands * rows].reshape(n, bands, rows)
+    usable = ~np.all(view == EMPTY_BIN, axis=2)
+    mult = (np.arange(1, rows + 1, dtype=np.uint64) * np.uint64(0x9E3779B97F4A7C15)) | np.uint64(1)
+    keys = (view * mult).sum(axis=2, dtype=np.uint64)
+    return keys, usable
+
+
+def _signature_jaccard(sa: np.ndarray, sb: np.ndarray) -> np.ndarray:
+    # row-wise one-permutation MinHash estimate for aligned pairs
+    filled = (sa != EMPTY_BIN) | (sb != EMPTY_BIN)
+    same = filled & (sa == sb)
+    n = filled.sum(axis=1)
+    out = np.zeros(len(sa), dtype=np.float64)
+    np.divide(same.sum(axis=1), n, out=out, where=n > 0)
+    return out
+
+
+# -------------------------------------------------------
+# Candidate generation
+# -------------------------------------------------------
+def _lsh_pairs(sig_a: np.ndarray, sig_b: np.ndarray, bands: int) -> np.ndarray:
+    """
+    Column index pairs (ia, ib) sharing at least one LSH bucket.
+    Bucket join via pandas merge, so cost is ~ O((|A|+|B|) * bands + hits).
+    """
+    if not len(sig_a) or not len(sig_b):
+        return np.empty((0, 2), dtype=np.int64)
+
+    def frame(sig: np.ndarray, side: str) -> pd.DataFrame:
+        keys, usable = _band_keys(sig, bands)
+        idx, band = np.nonzero(usable)
+        return pd.DataFrame({side: idx, "band": band, "key": keys[idx, band]})
+
+    fa, fb = frame(sig_a, "ia"), frame(sig_b, "ib")
+    return _bucket_join(fa, fb, ["band", "key"])
+
+
+def _bucket_join(fa: pd.DataFrame, fb: pd.DataFrame, on: List[str]) -> np.ndarray:
+    # very popular buckets (e.g. many boolean-like columns) would turn this
+    # back into a cross product; those are left to name matching
+    na = fa.groupby(on).size().rename("na")
+    nb = fb.groupby(on).size().rename("nb")
+    sizes = pd.concat([na, nb], axis=1, join="inner")
+    keep = sizes.index[(sizes["na"] * sizes["nb"]) <= settings.value_match_bucket_cap]
+    if not len(keep):
+        return np.empty((0, 2), dtype=np.int64)
+
+    keep_df = keep.to_frame(index=False)
+    hits = fa.merge(keep_df, on=on).merge(fb, on=on)[["ia", "ib"]].drop_duplicates()
+    return hits.to_numpy(dtype=np.int64)
+
+
+def _distribution_pairs(qa: np.ndarray, qb: np.ndarray) -> np.ndarray:
+    """
+    Numeric columns bucketed by order of magnitude of their median and spread;
+    only columns in the same bucket are compared.
+    """
+    def bucket(q: np.ndarray) -> pd.DataFrame:
+        med = q[:, _Q50]
+        iqr = q[:, _Q75] - q[:, _Q25]
+        return pd.DataFrame({
+            "m": np.round(np.sign(med) * np.log10(np.abs(med) + 1.0)).astype(np.int64),
+            "s": np.round(np.log10(np.abs(iqr) + 1.0)).astype(np.int64),
+        })
+
+    if not len(qa) or not len(qb):
+        return np.empty((0, 2), dtype=np.int64)
+    ba = bucket(qa).assign(ia=np.arange(len(qa)))
+    bb = bucket(qb).assign(ib=np.arange(len(qb)))
+    return _bucket_join(ba, bb, ["m", "s"])
+
+
+def _distribution_similarity(qa: np.ndarray, qb: np.ndarray) -> np.ndarray:
+    """
+    1 - mean |quantile difference| scaled by the pooled range; 1.0 for
+    identical distributions.
+    """
+    lo = np.minimum(qa[:, 0], qb[:, 0])
+    hi = np.maximum(qa[:, -1], qb[:, -1])
+    span = np.where(hi - lo > 0, hi - lo, 1.0)
+    dist = np.abs(qa - qb).mean(axis=1) / span
+    return np.clip(1.0 - dist, 0.0, 1.0)
+
+
+# -------------------------------------------------------
+# Public API
+# -------------------------------------------------------
+def value_match_scores(
+    profile_a: TableProfile,
+    profile_b: TableProfile,
+    cols_a: Optional[List[str]] = None,
+    cols_b: Optional[List[str]] = None,
+) -> Dict[Tuple[str, str], float]:
+    """
+    Content-based column similarity in [0, 1] for candidate pairs proposed by
+    an LSH index over MinHash signatures (value overlap) and by magnitude
+    buckets over numeric quantile sketches (distribution shape).
+
+    Pairs not proposed by either index are absent (treated as no evidence).
+    """
+    cols_a = [c for c in (cols_a or list(profile_a.columns)) if c in profile_a.columns]
+    cols_b = [c for c in (cols_b or list(profile_b.columns)) if c in profile_b.columns]
+
+    parts: List[pd.DataFrame] = []
+
+    # ---- 1) value overlap via MinHash LSH ----
+    set_a = [c for c in cols_a if profile_a.columns[c].kind in _SET_KINDS]
+    set_b = [c for c in cols_b if profile_b.columns[c].kind in _SET_KINDS]
+    sig_a, sig_b = _signatures(profile_a, set_a), _signatures(profile_b, set_b)
+
+    pairs = _lsh_pairs(sig_a, sig_b, settings.value_match_lsh_bands)
+    if len(pairs):
+        parts.append(pd.DataFrame({
+            "a": np.asarray(set_a, dtype=object)[pairs[:, 0]],
+            "b": np.asarray(set_b, dtype=object)[pairs[:, 1]],
+            "score": _signature_jaccard(sig_a[pairs[:, 0]], sig_b[pairs[:, 1]]),
+        }))
+
+    # ---- 2) numeric distribution shape ----
+    def numeric(profile: TableProfile, cols: List[str]) -> List[ColumnProfile]:
+        return [profile.columns[c] for c in cols
+                if profile.columns[c].kind == "numeric" and profile.columns[c].quantiles is not None]
+
+    num_a, num_b = numeric(profile_a, cols_a), numeric(profile_b, cols_b)
+    if num_a and num_b:
+        qa = np.vstack([p.quantiles for p in num_a])
+        qb = np.vstack([p.quantiles for p in num_b])
+        dpairs = _distribution_pairs(qa, qb)
+        if len(dpairs):
+            # shape alone is weaker evidence than shared values
+            sim = _distribution_similarity(qa[dpairs[:, 0]], qb[dpairs[:, 1]])
+            parts.append(pd.DataFrame({
+                "a": np.asarray([p.name for p in num_a], dtype=object)[dpairs[:, 0]],
+                "b": np.asarray([p.name for p in num_b], dtype=object)[dpairs[:, 1]],
+                "score": sim * settings.value_match_distribution_weight,
+            }))
+
+    if not parts:
+        return {}
+
+    df = pd.concat(parts, ignore_index=True)
+    df = df[df["score"] >= settings.value_match_min_score]
+    # best evidence per pair, then the strongest few B candidates per A column
+    df = df.groupby(["a", "b"], as_index=False)["score"].max()
+    df = df.sort_values("score", ascending=False).groupby("a").head(settings.value_match_top_k)
+
+    return {(a, b): float(v) for a, b, v in zip(df["a"], df["b"], df["score"])}
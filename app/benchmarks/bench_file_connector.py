@@ -0,0 +1,60 @@
+# benchmarks/bench_file_connector.py
+"""
+FileConnector.load per format on generated data.
+
+    cd app && python -m benchmarks.bench_file_connector --rows 10000 100000 --formats csv json parquet avro
+
+Files are written once per (rows, format) into --workdir; "load" times the
+read back into pandas, "bytes" is the file size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+from typing import Dict, List
+
+from benchmarks.common import emit, timed
+from benchmarks.synthetic import make_pair, write_pair
+from backend.connectors.file_connector import FileConnector
+
+DEFAULT_FORMATS = ["csv", "json", "parquet", "avro"]
+
+
+def run(rows: int, cols: int, formats: List[str], workdir: str, repeat: int) -> List[Dict]:
+    df, _, _ = make_pair(rows=rows, cols=cols, array_cols=0, seed=rows)
+    out = []
+    fc = FileConnector()
+    for fmt in formats:
+        path = os.path.join(workdir, f"bench_{rows}x{cols}.{fmt}")
+        try:
+            write_pair(df, path, fmt)
+        except ImportError as e:  # e.g. xlsx without openpyxl
+            out.append({"format": fmt, "rows": rows, "skipped": str(e)})
+            continue
+        cfg = {"type": "file", "path": path, "format": fmt, "lines": True}
+        timing, loaded = timed(lambda: fc.load(cfg), repeat)
+        out.append({"format": fmt, "rows": rows, "columns": cols, "bytes": os.path.getsize(path),
+                    "loaded_rows": len(loaded), **timing})
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    ap.add_argument("--cols", type=int, default=20)
+    ap.add_argument("--formats", nargs="+", default=DEFAULT_FORMATS)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--workdir", default=None)
+    ap.add_argument("--out", default=None)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        results = [r for n in args.rows for r in run(n, args.cols, args.formats, workdir, args.repeat)]
+    emit("file_connector", results, args.out, rows=args.rows, cols=args.cols, formats=args.formats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# benchmarks/bench_name_similarity.py
+"""
+Legacy per-pair name_similarity loops vs. the cached similarity matrix.
+
+    cd app && python -m benchmarks.bench_name_similarity --sizes 50 200 1000
+
+Prints one JSON document; "legacy" replays the two |A| x |B| loops that
+SchemaMapperAgent used to run, "matrix_cold" / "matrix_warm" time
+name_similarity_matrix without and with its cache, and "argmax_agreement"
+is the share of A columns whose best B column is the same in both.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Dict, List
+
+from benchmarks.common import emit
+from backend.utils.similarity import name_similarity
+from backend.utils import similarity_matrix
+from backend.utils.similarity_matrix import name_similarity_matrix
+
+_WORDS = [
+    "account", "acct", "amount", "amt", "balance", "city", "code", "counterparty",
+    "created", "currency", "customer", "cust", "date", "desc", "employee", "emp",
+    "entry", "fx", "gl", "id", "ledger", "location", "name", "number", "no", "posted",
+    "rate", "ref", "region", "salary", "status", "trade", "txn", "type", "updated", "value",
+]
+
+
+def make_columns(n: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    cols = set()
+    while len(cols) < n:
+        cols.add("_".join(rng.sample(_WORDS, rng.randint(1, 3))) + f"_{rng.randint(0, n)}")
+    return sorted(cols)
+
+
+def legacy(cols_a: List[str], cols_b: List[str]) -> List[str]:
+    best: List[str] = []
+    for _pass in range(2):  # deterministic candidates + "every A gets a match"
+        best = []
+        for a in cols_a:
+            top_b, top_s = None, 0.0
+            for b in cols_b:
+                s = name_similarity(a, b)
+                if s > top_s:
+                    top_b, top_s = b, s
+            best.append(top_b)
+    return best
+
+
+def run(size: int, skip_legacy_above: int) -> Dict:
+    cols_a, cols_b = make_columns(size, 1), make_columns(size, 2)
+    out: Dict = {"columns": size, "pairs": size * size}
+
+    similarity_matrix._CACHE.clear()
+    t0 = time.perf_counter()
+    m = name_similarity_matrix(cols_a, cols_b)
+    out["matrix_cold_s"] = round(time.perf_counter() - t0, 4)
+
+    t0 = time.perf_counter()
+    name_similarity_matrix(cols_a, cols_b)
+    out["matrix_warm_s"] = round(time.perf_counter() - t0, 6)
+
+    if size <= skip_legacy_above:
+        t0 = time.perf_counter()
+        best = legacy(cols_a, cols_b)
+        out["legacy_s"] = round(time.perf_counter() - t0, 4)
+        matrix_best = [cols_b[j] for j in m.argmax(axis=1)]
+        same = sum(1 for x, y in zip(best, matrix_best) if x == y)
+        out["argmax_agreement"] = round(same / size, 4)
+        out["speedup"] = round(out["legacy_s"] / max(out["matrix_cold_s"], 1e-9), 1)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000, 2000])
+    ap.add_argument("--skip-legacy-above", type=int, default=1000)
+    ap.add_argument("--out", default=None)
+    args = ap.parse_args()
+    emit("name_similarity", [run(n, args.skip_legacy_above) for n in args.sizes], args.out,
+         sizes=args.sizes, skip_legacy_above=args.skip_legacy_above)
+
+
+if __name__ == "__main__":
+    main()
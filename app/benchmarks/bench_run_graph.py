@@ -0,0 +1,87 @@
+# benchmarks/bench_run_graph.py
+"""
+run_graph end to end: mapping pass (PENDING_APPROVAL), then the approved
+pass through entity resolution, SQL synthesis and execution. Uses the mock
+LLM and LocalBigQuery in place of BigQuery, with files written to --workdir.
+
+    cd app && python -m benchmarks.bench_run_graph --rows 1000 100000 --cols 12
+
+Per size: wall time of both passes, the per-node metrics of the approved
+run and the number of mismatching rows returned (with the share caused by
+entity columns, a proxy for resolution accuracy on the synthetic names).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import tempfile
+import time
+from typing import Dict
+
+from benchmarks.common import emit, quiet_caches
+from benchmarks.local_engine import LocalBigQuery
+from benchmarks.synthetic import make_pair, write_pair
+
+
+def run(rows: int, cols: int, fmt: str, workdir: str) -> Dict:
+    from backend.graph.orchestrator_graph import run_graph
+
+    df_a, df_b, truth = make_pair(rows=rows, cols=cols, entity_cols=1, seed=rows)
+    path_a = write_pair(df_a, os.path.join(workdir, f"a_{rows}.{fmt}"), fmt)
+    path_b = write_pair(df_b, os.path.join(workdir, f"b_{rows}.{fmt}"), fmt)
+    payload = {
+        "dataset_a": {"type": "file", "path": path_a, "format": fmt, "lines": True},
+        "dataset_b": {"type": "file", "path": path_b, "format": fmt, "lines": True},
+        "thresholds": {"abs": 0.01, "rel": 0.001},
+        "entities": [a for a, _ in truth.entities],
+    }
+
+    with LocalBigQuery():
+        t0 = time.perf_counter()
+        pending = run_graph(payload)
+        t_map = time.perf_counter() - t0
+
+        approved = [{"a_col": m["a_col"], "b_col": m["b_col"]} for m in pending["schema_mapping"]["matches"]]
+        t0 = time.perf_counter()
+        final = run_graph({**payload, "approval": {"approved_matches": approved}})
+        t_recon = time.perf_counter() - t0
+
+    result = final.get("result") or []
+    return {
+        "rows": rows,
+        "columns": cols,
+        "format": fmt,
+        "mapping_pass_s": round(t_map, 4),
+        "approved_pass_s": round(t_recon, 4),
+        "status": final.get("status"),
+        "result_rows": len(result),
+        "expected_mismatches": len(truth.mismatched_ids),
+        # rows flagged only because entity resolution picked a wrong alias
+        "entity_mismatch_rows": sum(
+            any(r.get(f"{a}_string_recon") == "MISMATCH" for a, _ in truth.entities) for r in result
+        ),
+        "nodes": {k: v.get("wall_ms") for k, v in ((final.get("metrics") or {}).get("nodes") or {}).items()},
+        "peak_rss_delta_bytes": {
+            k: v.get("peak_rss_delta_bytes") for k, v in ((final.get("metrics") or {}).get("nodes") or {}).items()
+        },
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    ap.add_argument("--cols", type=int, default=12)
+    ap.add_argument("--format", default="parquet")
+    ap.add_argument("--workdir", default=None)
+    ap.add_argument("--out", default=None)
+    args = ap.parse_args()
+
+    quiet_caches()
+    with tempfile.TemporaryDirectory() as tmp:
+        results = [run(n, args.cols, args.format, args.workdir or tmp) for n in args.rows]
+    emit("run_graph", results, args.out, rows=args.rows, cols=args.cols, format=args.format)
+
+
+if __name__ == "__main__":
+    main()
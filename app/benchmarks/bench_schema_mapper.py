@@ -0,0 +1,58 @@
+# benchmarks/bench_schema_mapper.py
+"""
+SchemaMapperAgent.run on generated wide schemas (mock LLM, caches off).
+
+    cd app && python -m benchmarks.bench_schema_mapper --columns 10 100 1000 5000
+
+"accuracy" is the share of generated A columns mapped to their intended
+B column; "llm_columns" counts the columns that were sent to the LLM.
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Dict
+
+from benchmarks.common import emit, quiet_caches, timed
+from benchmarks.synthetic import make_pair
+
+
+def run(columns: int, rows: int, repeat: int) -> Dict:
+    from backend.agents.schema_mapper import SchemaMapperAgent
+    from backend.utils import similarity_matrix
+
+    df_a, df_b, truth = make_pair(rows=rows, cols=columns, mismatch_rate=0.0, seed=columns)
+    agent = SchemaMapperAgent()
+
+    def once():
+        similarity_matrix._CACHE.clear()
+        return agent.run({"df_a": df_a, "df_b": df_b})
+
+    timing, mapping = timed(once, repeat)
+    got = {m["a_col"]: m["b_col"] for m in mapping.get("matches", [])}
+    hits = sum(1 for a, b in truth.mapping.items() if got.get(a) == b)
+    return {
+        "columns": columns,
+        "rows": rows,
+        "matches": len(got),
+        "accuracy": round(hits / max(1, len(truth.mapping)), 4),
+        "llm_columns": mapping.get("llm_columns", 0),
+        **timing,
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--columns", type=int, nargs="+", default=[10, 100, 1000, 5000])
+    ap.add_argument("--rows", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--out", default=None)
+    args = ap.parse_args()
+
+    quiet_caches()
+    emit("schema_mapper", [run(n, args.rows, args.repeat) for n in args.columns], args.out,
+         columns=args.columns, rows=args.rows)
+
+
+if __name__ == "__main__":
+    main()
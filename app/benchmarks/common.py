@@ -0,0 +1,75 @@
+# benchmarks/common.py
+"""
+Shared helpers for the benchmark scripts: timing, environment stamp and
+JSON output that can be diffed across commits.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# benchmarks never talk to a real model or reuse earlier runs' caches
+os.environ.setdefault("RECON_MODEL_PROVIDER", "mock")
+
+
+def quiet_caches() -> None:
+    """Disable the persistent caches so every timing measures real work."""
+    from backend.config import settings
+
+    settings.mapping_cache_enabled = False
+    settings.llm_cache_enabled = False
+    settings.alias_store_enabled = False
+    settings.explain_async = False
+
+
+def timed(fn: Callable[[], Any], repeat: int = 3) -> Tuple[Dict[str, float], Any]:
+    """Run fn `repeat` times; ({"min_s", "median_s"}, last result)."""
+    times: List[float] = []
+    out = None
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    return {"min_s": round(min(times), 5), "median_s": round(statistics.median(times), 5)}, out
+
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip() or None
+    except Exception:
+        return None
+
+
+def environment() -> Dict[str, Any]:
+    import numpy
+    import pandas
+
+    return {
+        "git_rev": _git_rev(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "pandas": pandas.__version__,
+        "numpy": numpy.__version__,
+    }
+
+
+def emit(benchmark: str, results: Any, out: Optional[str] = None, **params: Any) -> Dict[str, Any]:
+    """Print (and optionally write) one JSON document with a stable key order."""
+    doc = {"benchmark": benchmark, "env": environment(), "params": params, "results": results}
+    text = json.dumps(doc, indent=2, sort_keys=True, default=str)
+    if out:
+        with open(out, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return doc
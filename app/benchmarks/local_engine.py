@@ -0,0 +1,234 @@
+# benchmarks/local_engine.py
+"""
+A local stand-in for BigQuery so run_graph can be benchmarked offline.
+
+LocalBigQuery patches BigQueryConnector: staged DataFrames are kept in
+memory, and run_query evaluates the reconciliation SQL produced by
+sql_templates.basic_reconciliation_sql with pandas. Only that template is
+understood: tables, join pairs, numeric / array / string comparisons,
+thresholds and inline entity crosswalks are read back from it (staged
+crosswalk tables are looked up among the staged frames).
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.connectors import bigquery_connector as bqc
+
+Pair = Tuple[str, str]
+
+_TABLE_A = re.compile(r"FROM `([^`]+)` a\b")
+_TABLE_B = re.compile(r"(?:JOIN|FROM) `([^`]+)` b\b")
+_JOIN = re.compile(r"(?:JOIN `[^`]+`|\)) b\s+ON (.+?)\n\)", re.S)
+_JOIN_PAIR = re.compile(r"a\.(\w+)(?: AS STRING\))?\)? = (?:COALESCE\(b\.\w+, )?(?:CAST\()?b\.(\w+)")
+_NUMERIC = re.compile(r"ABS\(a\.(\w+) - b\.(\w+)\) AS \w+_abs_diff")
+_ARRAY = re.compile(r"ARRAY_DIFF_SCORE\(a\.(\w+), b\.(\w+)\) AS")
+_STRING = re.compile(r"WHEN a\.(\w+) IS NULL AND b\.(\w+) IS NULL THEN 'MATCH'")
+_THRESH = re.compile(r"_abs_diff > ([-\d.eE]+) OR \w+_rel_diff > ([-\d.eE]+)")
+_XW_JOIN = re.compile(r"LEFT JOIN (.+?) (xw\d+)\s+ON CAST\(a\.(\w+) AS STRING\) = xw\d+\.val")
+_XW_B = re.compile(r"ON CAST\(b\.(\w+) AS STRING\) = (xw\d+)b\.val")
+_XW_ROW = re.compile(r"\('((?:[^'\\]|\\.)*)', '((?:[^'\\]|\\.)*)'\)")
+
+
+def _unescape(v: str) -> str:
+    # inverse of crosswalk._sql_str
+    return re.sub(r"\\(.)", lambda m: "\n" if m.group(1) == "n" else m.group(1), v)
+
+
+@dataclass
+class ReconSpec:
+    table_a: str
+    table_b: str
+    join_pairs: List[Pair]
+    numeric_pairs: List[Pair] = field(default_factory=list)
+    array_pairs: List[Pair] = field(default_factory=list)
+    string_pairs: List[Pair] = field(default_factory=list)
+    abs_thr: float = 0.0
+    rel_thr: float = 0.0
+    # a_col -> inline crosswalk {val: entity_key}, or the staged table id
+    crosswalks: Dict[str, object] = field(default_factory=dict)
+    # a_col -> the B column looked up in the same crosswalk
+    crosswalk_b: Dict[str, str] = field(default_factory=dict)
+
+
+def parse_recon_sql(sql: str) -> ReconSpec:
+    ta, tb, join = _TABLE_A.search(sql), _TABLE_B.search(sql), _JOIN.search(sql)
+    if not (ta and tb and join):
+        raise ValueError("LocalBigQuery only understands basic_reconciliation_sql output")
+    thr = _THRESH.search(sql)
+    xw = _XW_JOIN.findall(sql)
+    b_by_alias = {alias: b for b, alias in _XW_B.findall(sql)}
+    return ReconSpec(
+        table_a=ta.group(1),
+        table_b=tb.group(1),
+        join_pairs=_JOIN_PAIR.findall(join.group(1)),
+        numeric_pairs=_NUMERIC.findall(sql),
+        array_pairs=_ARRAY.findall(sql),
+        string_pairs=_STRING.findall(sql),
+        abs_thr=float(thr.group(1)) if thr else 0.0,
+        rel_thr=float(thr.group(2)) if thr else 0.0,
+        crosswalks={
+            a: ({_unescape(x): _unescape(y) for x, y in _XW_ROW.findall(rel)} if rel.startswith("(")
+                else rel.strip("`"))
+            for rel, _alias, a in xw
+        },
+        crosswalk_b={a: b_by_alias[alias] for _rel, alias, a in xw},
+    )
+
+
+def _array_score(a, b) -> float:
+    if a is None or b is None:
+        return 0.0
+    sa, sb = set(map(str, a)), set(map(str, b))
+    union = len(sa | sb)
+    return 1.0 if union == 0 else len(sa & sb) / union
+
+
+def local_reconcile(
+    df_a: pd.DataFrame, df_b: pd.DataFrame, spec: ReconSpec, tables: Optional[Dict[str, pd.DataFrame]] = None
+) -> pd.DataFrame:
+    """pandas evaluation of the reconciliation query: mismatching joined rows."""
+    # the SQL selects only join / compared columns (no a.*, b.*)
+    pairs = spec.join_pairs + spec.numeric_pairs + spec.array_pairs + spec.string_pairs
+    cols_a = list(dict.fromkeys(a for a, _ in pairs))
+    cols_b = list(dict.fromkeys(b for _, b in pairs))
+    b_of = spec.crosswalk_b
+
+    # both sides looked up in the entity crosswalks: entity_key (NaN when unlisted)
+    listed_a: Dict[str, pd.Series] = {}
+    listed_b: Dict[str, pd.Series] = {}
+    for a, xw in spec.crosswalks.items():
+        if not isinstance(xw, dict):
+            staged = (tables or {})[xw]
+            xw = dict(zip(staged["val"].astype(str), staged["entity_key"].astype(str)))
+        listed_a[a] = df_a[a].astype(str).map(xw).where(df_a[a].notna())
+        listed_b[a] = df_b[b_of[a]].astype(str).map(xw).where(df_b[b_of[a]].notna())
+
+    def key(df: pd.DataFrame, col: str, listed: pd.Series) -> pd.Series:
+        # COALESCE(xw.entity_key, CAST(col AS STRING))
+        return listed.fillna(df[col].astype(str)).where(df[col].notna())
+
+    keys_a = [key(df_a, a, listed_a[a]) if a in listed_a else df_a[a] for a, _ in spec.join_pairs]
+    keys_b = [key(df_b, b, listed_b[a]) if a in listed_a else df_b[b] for a, b in spec.join_pairs]
+    # BigQuery would reject mismatched key types; compare as strings instead
+    if any(x.dtype != y.dtype for x, y in zip(keys_a, keys_b)):
+        keys_a = [x.astype(str) for x in keys_a]
+        keys_b = [y.astype(str) for y in keys_b]
+    names = [f"__k{i}" for i in range(len(spec.join_pairs))]
+    la = df_a[cols_a].assign(
+        **dict(zip(names, keys_a)), **{f"__xa_{a}": key(df_a, a, t) for a, t in listed_a.items()},
+        **{f"__xl_{a}": t for a, t in listed_a.items()},
+    )
+    rb = df_b[cols_b].assign(
+        **dict(zip(names, keys_b)), **{f"__xb_{a}": key(df_b, b_of[a], t) for a, t in listed_b.items()}
+    )
+    j = la.merge(rb, on=names, suffixes=("", "_b"))
+    j = j.drop(columns=names)
+
+    def bcol(b: str) -> str:
+        # B columns whose names are also selected from A come back as <name>_b
+        return f"{b}_b" if b in cols_a else b
+
+    mismatch = np.zeros(len(j), dtype=bool)
+    for a, b in spec.numeric_pairs:
+        x = pd.to_numeric(j[a], errors="coerce")
+        y = pd.to_numeric(j[bcol(b)], errors="coerce")
+        abs_diff = (x - y).abs()
+        rel_diff = abs_diff / y.abs().replace(0, np.nan)
+        j[f"{a}_abs_diff"], j[f"{a}_rel_diff"] = abs_diff, rel_diff
+        mismatch |= ((abs_diff > spec.abs_thr) | (rel_diff > spec.rel_thr)).fillna(False).to_numpy()
+    for a, b in spec.array_pairs:
+        score = np.fromiter((_array_score(x, y) for x, y in zip(j[a], j[bcol(b)])), dtype=float, count=len(j))
+        j[f"{a}_array_score"] = score
+        mismatch |= score < 1.0
+    for a, b in spec.string_pairs:
+        x, y = j[a], j[bcol(b)]
+        both_null = x.isna() & y.isna()
+        one_null = x.isna() ^ y.isna()
+        same = x.astype(str).str.lower() == y.astype(str).str.lower()
+        if a in listed_a:
+            # the crosswalk only adds matches through the shared entity key
+            same |= j[f"__xa_{a}"].astype(str).str.lower() == j[f"__xb_{a}"].astype(str).str.lower()
+        status = np.where(both_null | (~one_null & same), "MATCH", "MISMATCH")
+        j[f"{a}_string_recon"] = status
+        mismatch |= status == "MISMATCH"
+    for a in listed_a:
+        j[f"{a}_entity_alias"] = j.pop(f"__xl_{a}")
+        j = j.drop(columns=[f"__xa_{a}", f"__xb_{a}"])
+    return j[mismatch].reset_index(drop=True)
+
+
+class LocalBigQuery:
+    """
+    Context manager that swaps BigQueryConnector's I/O for in-memory tables:
+
+        with LocalBigQuery() as bq:
+            run_graph(payload)
+        bq.queries  # SQL strings that were executed
+    """
+
+    def __init__(self, project: str = "local"):
+        self.project = project
+        self.tables: Dict[str, pd.DataFrame] = {}
+        self.queries: List[str] = []
+        self._saved: Dict[str, object] = {}
+
+    def __enter__(self) -> "LocalBigQuery":
+        store = self
+
+        def load_dataframe_to_table(_self, df, dataset, table):
+            fqn = f"{store.project}.{dataset}.{table}"
+            store.tables[fqn] = df.copy()
+            return fqn
+
+        def run_query(_self, query):
+            store.queries.append(query)
+            spec = parse_recon_sql(query)
+            df = local_reconcile(store.tables[spec.table_a], store.tables[spec.table_b], spec, store.tables)
+            _self.last_job_stats = {"job_id": f"local_{len(store.queries)}", "bytes_processed": int(
+                store.tables[spec.table_a].memory_usage(deep=False).sum()
+                + store.tables[spec.table_b].memory_usage(deep=False).sum()
+            ), "bytes_billed": 0, "slot_ms": None, "cache_hit": False}
+            return df
+
+        def load(_self, cfg):
+            df = store.tables[cfg.get("table_fqn") or cfg.get("table")]
+            df = df[cfg["columns"]] if cfg.get("columns") else df
+            return (df.drop_duplicates() if cfg.get("distinct") else df).copy()
+
+        def introspect(_self, cfg, preview_rows=0):
+            table = cfg.get("table_fqn") or cfg.get("table")
+            df = store.tables[table]
+            meta = {
+                "table": table,
+                "columns": [{"name": str(c), "type": str(t), "mode": "NULLABLE"} for c, t in df.dtypes.items()],
+                "num_rows": len(df),
+                "num_bytes": int(df.memory_usage(deep=False).sum()),
+                "partitioning": None,
+                "clustering": [],
+            }
+            return df.head(preview_rows).copy(), meta
+
+        patches = {
+            "load_dataframe_to_table": load_dataframe_to_table,
+            "run_query": run_query,
+            "load": load,
+            "introspect": introspect,
+            "ensure_dataset": lambda _self, dataset: None,
+        }
+        for name, fn in patches.items():
+            self._saved[name] = getattr(bqc.BigQueryConnector, name)
+            setattr(bqc.BigQueryConnector, name, fn)
+        return self
+
+    def __exit__(self, *exc) -> Optional[bool]:
+        for name, fn in self._saved.items():
+            setattr(bqc.BigQueryConnector, name, fn)
+        self._saved.clear()
+        return None
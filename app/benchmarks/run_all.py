@@ -0,0 +1,56 @@
+# benchmarks/run_all.py
+"""
+Every benchmark at a small ("quick") or the default ("full") size, as one
+JSON document to keep per commit and diff:
+
+    cd app && python -m benchmarks.run_all --profile quick --out bench.json
+    diff <(jq .results old.json) <(jq .results bench.json)
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+from typing import Any, Dict
+
+from benchmarks import (
+    bench_file_connector,
+    bench_local_engine,
+    bench_name_similarity,
+    bench_run_graph,
+    bench_schema_mapper,
+)
+from benchmarks.common import emit, quiet_caches
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "quick": {"rows": [10_000], "columns": [10, 100], "sizes": [50, 200], "graph_rows": [1_000], "repeat": 1},
+    "full": {
+        "rows": [10_000, 100_000], "columns": [10, 100, 1000, 5000], "sizes": [50, 200, 1000, 2000],
+        "graph_rows": [1_000, 100_000], "repeat": 3,
+    },
+}
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    ap.add_argument("--out", default=None)
+    args = ap.parse_args()
+    p = PROFILES[args.profile]
+
+    quiet_caches()
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        results["file_connector"] = [
+            r for n in p["rows"]
+            for r in bench_file_connector.run(n, 20, bench_file_connector.DEFAULT_FORMATS, tmp, p["repeat"])
+        ]
+        results["schema_mapper"] = [bench_schema_mapper.run(n, 200, 1) for n in p["columns"]]
+        results["name_similarity"] = [bench_name_similarity.run(n, 1000) for n in p["sizes"]]
+        results["local_engine"] = [bench_local_engine.run(n, 12, 0.05, p["repeat"]) for n in p["rows"]]
+        results["run_graph"] = [bench_run_graph.run(n, 12, "parquet", tmp) for n in p["graph_rows"]]
+    emit("all", results, args.out, profile=args.profile)
+
+
+if __name__ == "__main__":
+    main()
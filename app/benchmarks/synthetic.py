@@ -0,0 +1,206 @@
+# benchmarks/synthetic.py
+"""
+Deterministic A/B dataset generators for the benchmarks.
+
+make_pair() builds two frames describing the same records the way two
+systems would: B renames columns (abbreviations, separators, case),
+shuffles rows, spells entity names differently and disagrees on a chosen
+share of rows (offsets, x100 scaling, sign flips). The returned truth
+records the intended column mapping and the mismatching record ids.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+_WORDS = [
+    "account", "amount", "balance", "city", "code", "counterparty", "created", "currency",
+    "customer", "date", "description", "employee", "entry", "ledger", "location", "name",
+    "number", "posted", "quantity", "rate", "reference", "region", "salary", "status",
+    "trade", "transaction", "type", "updated", "value", "vendor",
+]
+
+# how system B tends to spell the same word
+_ABBREV = {
+    "account": "acct", "amount": "amt", "balance": "bal", "counterparty": "cpty",
+    "currency": "ccy", "customer": "cust", "description": "desc", "employee": "emp",
+    "location": "loc", "number": "no", "quantity": "qty", "reference": "ref",
+    "transaction": "txn", "updated": "upd", "value": "val",
+}
+
+_COMPANIES = [
+    "Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka", "Tyrell",
+    "Cyberdyne", "Soylent", "Vandelay", "Oscorp", "Aperture", "Massive", "Dynamic",
+]
+_SUFFIXES = ["Inc", "Ltd", "LLC", "Corp", "Holdings", "Group", "GmbH", "PLC"]
+_TAGS = ["fx", "rates", "credit", "equity", "ops", "emea", "apac", "amer", "retail", "corp"]
+
+
+@dataclass
+class Truth:
+    key: Tuple[str, str]
+    mapping: Dict[str, str] = field(default_factory=dict)
+    numeric: List[Tuple[str, str]] = field(default_factory=list)
+    entities: List[Tuple[str, str]] = field(default_factory=list)
+    arrays: List[Tuple[str, str]] = field(default_factory=list)
+    mismatched_ids: List[int] = field(default_factory=list)
+
+
+def _column_names(n: int, rng: np.random.Generator) -> List[str]:
+    names, seen = [], set()
+    while len(names) < n:
+        k = int(rng.integers(1, 4))
+        words = list(rng.choice(_WORDS, size=k, replace=False))
+        name = "_".join(words)
+        if name in seen:
+            name = f"{name}_{len(names)}"
+        seen.add(name)
+        names.append(name)
+    return names
+
+
+def b_name(a: str, rng: np.random.Generator) -> str:
+    """How system B would name column `a`."""
+    parts = [_ABBREV.get(p, p) if rng.random() < 0.7 else p for p in a.split("_")]
+    style = rng.integers(0, 3)
+    if style == 0:
+        return "_".join(parts)
+    if style == 1:
+        return parts[0] + "".join(p.title() for p in parts[1:])
+    return "_".join(parts).upper()
+
+
+def company_names(n: int, rng: np.random.Generator) -> np.ndarray:
+    base = rng.choice(_COMPANIES, n)
+    second = rng.choice(_WORDS, n)
+    suffix = rng.choice(_SUFFIXES, n)
+    return np.char.add(np.char.add(np.char.add(base.astype(str), " "), np.char.title(second.astype(str))),
+                       np.char.add(" ", suffix.astype(str)))
+
+
+def fuzz_names(names: np.ndarray, rng: np.random.Generator, rate: float = 0.5) -> np.ndarray:
+    """Case / punctuation / legal-form / single-typo variants of entity names."""
+    out = names.astype(object).copy()
+    for i in np.flatnonzero(rng.random(len(out)) < rate):
+        s = str(out[i])
+        r = rng.integers(0, 4)
+        if r == 0:
+            s = s.upper()
+        elif r == 1:
+            s = s.rsplit(" ", 1)[0] + "."
+        elif r == 2:
+            s = s.replace(" ", ", ", 1)
+        elif len(s) > 4:
+            j = int(rng.integers(1, len(s) - 1))
+            s = s[:j] + s[j + 1:]
+        out[i] = s
+    return out
+
+
+def make_pair(
+    rows: int = 1_000,
+    cols: int = 10,
+    mismatch_rate: float = 0.05,
+    array_cols: int = 1,
+    entity_cols: int = 1,
+    seed: int = 0,
+) -> Tuple[pd.DataFrame, pd.DataFrame, Truth]:
+    """
+    (df_a, df_b, truth). `cols` counts the value columns besides the key;
+    entity and array columns are taken from that budget (wide schemas are
+    just a large `cols`). Numeric columns get the injected mismatches.
+    """
+    rng = np.random.default_rng(seed)
+    truth = Truth(key=("id", "record_id"))
+    ids = np.arange(rows)
+
+    entity_cols = min(entity_cols, cols)
+    array_cols = min(array_cols, cols - entity_cols)
+    n_plain = cols - entity_cols - array_cols
+    names = _column_names(n_plain, rng)
+
+    a: Dict[str, object] = {"id": ids}
+    b: Dict[str, object] = {"record_id": ids}
+    used_b = {"record_id"}
+
+    def add(a_col: str, a_val, b_val) -> str:
+        b_col = b_name(a_col, rng)
+        while b_col in used_b:
+            b_col += "_b"
+        used_b.add(b_col)
+        a[a_col], b[b_col] = a_val, b_val
+        truth.mapping[a_col] = b_col
+        return b_col
+
+    for i, name in enumerate(names):
+        if i % 3 == 2:
+            vals = rng.choice(_TAGS, rows)
+            add(name, vals, vals.copy())
+        else:
+            vals = np.round(rng.uniform(1, 10_000, rows), 2)
+            b_col = add(name, vals, vals.copy())
+            truth.numeric.append((name, b_col))
+
+    for i in range(entity_cols):
+        names_a = company_names(rows, rng)
+        a_col = "counterparty" if i == 0 else f"counterparty_{i}"
+        truth.entities.append((a_col, add(a_col, names_a, fuzz_names(names_a, rng))))
+
+    for i in range(array_cols):
+        tags = [list(rng.choice(_TAGS, int(rng.integers(1, 4)), replace=False)) for _ in range(rows)]
+        a_col = "tags" if i == 0 else f"tags_{i}"
+        truth.arrays.append((a_col, add(a_col, tags, [list(t) for t in tags])))
+
+    df_a, df_b = pd.DataFrame(a), pd.DataFrame(b)
+
+    # inject mismatches into numeric columns of B
+    if truth.numeric and mismatch_rate > 0:
+        bad = np.flatnonzero(rng.random(rows) < mismatch_rate)
+        truth.mismatched_ids = bad.tolist()
+        kinds = rng.integers(0, 3, len(bad))
+        targets = rng.integers(0, len(truth.numeric), len(bad))
+        for row, kind, t in zip(bad, kinds, targets):
+            b_col = truth.numeric[t][1]
+            v = df_b.at[row, b_col]
+            df_b.at[row, b_col] = v + 1.5 if kind == 0 else (v * 100 if kind == 1 else -v)
+
+    df_b = df_b.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+    return df_a, df_b, truth
+
+
+def write_pair(df: pd.DataFrame, path: str, fmt: str) -> str:
+    """Write a generated frame in one of FileConnector's formats."""
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "json":
+        df.to_json(path, orient="records", lines=True)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "avro":
+        import fastavro
+
+        records = df.to_dict(orient="records")
+        fields = []
+        for col in df.columns:
+            s = df[col]
+            if pd.api.types.is_integer_dtype(s):
+                t = "long"
+            elif pd.api.types.is_float_dtype(s):
+                t = "double"
+            elif len(s) and isinstance(s.iloc[0], list):
+                t = {"type": "array", "items": "string"}
+            else:
+                t = "string"
+            fields.append({"name": col, "type": ["null", t]})
+        schema = fastavro.parse_schema({"type": "record", "name": "Row", "fields": fields})
+        with open(path, "wb") as f:
+            fastavro.writer(f, schema, records)
+    elif fmt == "xlsx":
+        df.to_excel(path, index=False)
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+    return path
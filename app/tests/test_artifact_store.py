@@ -0,0 +1,64 @@
+# tests/test_artifact_store.py
+
+import os
+
+import pandas as pd
+
+from backend.utils.artifact_store import ArtifactStore
+
+
+def _frame(n=1_000):
+    return pd.DataFrame({
+        "id": range(n),
+        "name": [f"cp-{i % 37}" for i in range(n)],
+        "amount": [i * 0.5 for i in range(n)],
+        "tags": [["a", str(i)] for i in range(n)],
+    })
+
+
+def test_spilled_frame_reloads_unchanged(tmp_path):
+    store = ArtifactStore(str(tmp_path), memory_bytes=1_000, run_memory_bytes=1_000, ttl_s=60)
+    df = _frame()
+    meta = store.put("run-1", "a", df)
+    assert meta["location"] == "disk" and os.path.exists(meta["path"])
+    back = store.get(meta["handle"])
+    pd.testing.assert_frame_equal(back, df)
+    assert back["tags"].iloc[5] == ["a", "5"]
+    assert store.stats()["disk_hits"] == 1
+
+
+def test_least_recently_used_frame_spills_first(tmp_path):
+    df = _frame()
+    size = int(df.memory_usage(index=True, deep=False).sum())
+    store = ArtifactStore(str(tmp_path), memory_bytes=10 * size, run_memory_bytes=int(2.5 * size), ttl_s=60)
+    handles = [store.put("run-1", name, df)["handle"] for name in ("a", "b")]
+    store.get(handles[0])
+    store.put("run-1", "c", df)
+    assert store.meta(handles[0])["location"] == "memory"
+    assert store.meta(handles[1])["location"] == "disk"
+    pd.testing.assert_frame_equal(store.get(handles[1]), df)
+
+
+def test_mixed_type_columns_fall_back_to_pickle(tmp_path):
+    store = ArtifactStore(str(tmp_path), memory_bytes=1, run_memory_bytes=1, ttl_s=60)
+    df = pd.DataFrame({"v": [1, "x", 2.5, None]})
+    meta = store.put("run-1", "mixed", df)
+    assert meta["path"].endswith(".pkl")
+    pd.testing.assert_frame_equal(store.get(meta["handle"]), df)
+
+
+def test_drop_run_removes_memory_and_spill_files(tmp_path):
+    store = ArtifactStore(str(tmp_path), memory_bytes=1_000, run_memory_bytes=1_000, ttl_s=60)
+    big = store.put("run-1", "a", _frame())
+    small = store.put("run-1", "b", pd.DataFrame({"x": [1]}))
+    other = store.put("run-2", "a", pd.DataFrame({"x": [2]}))
+    store.drop_run("run-1")
+    assert store.get(big["handle"]) is None and store.get(small["handle"]) is None
+    assert not os.path.exists(big["path"])
+    assert store.get(other["handle"])["x"].tolist() == [2]
+
+
+def test_client_run_ids_cannot_escape_the_root(tmp_path):
+    store = ArtifactStore(str(tmp_path / "root"), memory_bytes=1, run_memory_bytes=1, ttl_s=60)
+    meta = store.put("../../etc", "a", pd.DataFrame({"x": [1]}))
+    assert os.path.realpath(meta["path"]).startswith(os.path.realpath(str(tmp_path / "root")) + os.sep)
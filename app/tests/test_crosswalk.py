@@ -0,0 +1,47 @@
+# tests/test_crosswalk.py
+
+import random
+
+import pandas as pd
+
+from backend.utils.crosswalk import build_crosswalks, crosswalk_relations
+from backend.utils.sql_templates import basic_reconciliation_sql
+from benchmarks.local_engine import local_reconcile, parse_recon_sql
+
+SPELLINGS = ["Hooli Counterparty PLC", "HOOLI COUNTERPARTY PLC", "Hooli Counterparty.", "hooli counterparty plc",
+             "Initech Ltd", "INITECH", "Initech Limited", "Globex", "GLOBEX CORP"]
+
+
+def _status(df_a, df_b, crosswalks):
+    relations, _ = crosswalk_relations(crosswalks)
+    sql = basic_reconciliation_sql(
+        "p.d.a", "p.d.b", [("id", "rid")], [], {}, string_pairs=[("cp", "cpty")], crosswalks=relations,
+    )
+    out = local_reconcile(df_a, df_b, parse_recon_sql(sql))
+    return set(out["id"])
+
+
+def test_crosswalk_never_turns_a_match_into_a_mismatch():
+    rng = random.Random(0)
+    for _ in range(50):
+        n = 40
+        df_a = pd.DataFrame({"id": range(n), "cp": [rng.choice(SPELLINGS) for _ in range(n)]})
+        df_b = pd.DataFrame({"rid": range(n), "cpty": [rng.choice(SPELLINGS) for _ in range(n)]})
+        pairs = [
+            {"a_col": "cp", "b_col": "cpty", "left": rng.choice(SPELLINGS), "right": rng.choice(SPELLINGS)}
+            for _ in range(rng.randint(1, 6))
+        ]
+        without = _status(df_a, df_b, {})
+        with_xw = _status(df_a, df_b, build_crosswalks(pairs))
+        assert with_xw <= without
+
+
+def test_crosswalk_matches_every_b_spelling_of_a_resolved_entity():
+    df_a = pd.DataFrame({"id": [1, 2], "cp": ["Hooli Counterparty PLC", "Hooli Counterparty PLC"]})
+    df_b = pd.DataFrame({"rid": [1, 2], "cpty": ["Hooli Counterparty.", "HOOLI CPTY"]})
+    pairs = [
+        {"a_col": "cp", "b_col": "cpty", "left": "Hooli Counterparty PLC", "right": "Hooli Counterparty."},
+        {"a_col": "cp", "b_col": "cpty", "left": "Hooli Counterparty PLC", "right": "HOOLI CPTY"},
+    ]
+    assert _status(df_a, df_b, {}) == {1, 2}
+    assert _status(df_a, df_b, build_crosswalks(pairs)) == set()
@@ -0,0 +1,45 @@
+# tests/test_entity_matching.py
+
+import pandas as pd
+
+from backend.utils.entity_matching import match_entities
+
+
+def _pairs(df):
+    return {(l, r): m for l, r, m in df[["left", "right", "method"]].itertuples(index=False)}
+
+
+def test_typo_spelling_of_an_exactly_matched_entity_is_linked():
+    out = _pairs(match_entities(pd.Series(["Acme Blue Ltd"]), pd.Series(["Acme Blue Ltd", "Acme Bue Ltd"])))
+    assert out[("Acme Blue Ltd", "Acme Blue Ltd")] == "exact"
+    assert ("Acme Blue Ltd", "Acme Bue Ltd") in out
+
+
+def test_exact_match_on_normalized_names():
+    out = _pairs(match_entities(pd.Series(["ACME Corp."]), pd.Series(["Acme Corporation", "Globex"])))
+    assert out == {("ACME Corp.", "Acme Corporation"): "exact"}
+
+
+def test_every_b_variant_of_a_key_is_listed():
+    out = _pairs(match_entities(pd.Series(["Globex"]), pd.Series(["GLOBEX CORP", "Globex, Inc.", "globex"])))
+    assert out == {
+        ("Globex", "GLOBEX CORP"): "exact",
+        ("Globex", "Globex, Inc."): "exact",
+        ("Globex", "globex"): "exact",
+    }
+
+
+def test_typo_above_the_accept_score_is_a_similarity_match():
+    df = match_entities(pd.Series(["Stark International Industries"]), pd.Series(["Stark Internatonal Industries"]))
+    assert df[["right", "method"]].values.tolist() == [["Stark Internatonal Industries", "similarity"]]
+    assert df["score"].iloc[0] >= 0.85
+
+
+def test_weak_pair_lands_in_the_review_band():
+    df = match_entities(pd.Series(["Acme Bleu Ltd"]), pd.Series(["Acme Blue Ltd"]))
+    assert df["method"].tolist() == ["review"]
+    assert 0.6 <= df["score"].iloc[0] < 0.85
+
+
+def test_unrelated_names_do_not_match():
+    assert match_entities(pd.Series(["Globex"]), pd.Series(["Initech"])).empty
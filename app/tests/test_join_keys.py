@@ -0,0 +1,51 @@
+# tests/test_join_keys.py
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.column_profile import profile_dataframe
+from backend.utils.join_keys import rank_join_keys
+
+
+def _frames(n=5_000):
+    rng = np.random.default_rng(0)
+    df_a = pd.DataFrame({
+        "trade_id": [f"T{i:06d}" for i in range(n)],
+        "desk": rng.choice(["rates", "fx", "credit"], n),
+        "qty": rng.integers(1, 50, n),
+    })
+    # B covers most of A's trades (shuffled) plus some of its own
+    ids = [f"T{i:06d}" for i in range(n // 10, n + n // 10)]
+    df_b = pd.DataFrame({
+        "tid": rng.permutation(ids),
+        "book": rng.choice(["rates", "fx", "credit"], n),
+        "quantity": rng.integers(1, 50, n),
+    })
+    return df_a, df_b
+
+
+MATCHES = [
+    {"a_col": "desk", "b_col": "book", "confidence": 0.9},
+    {"a_col": "qty", "b_col": "quantity", "confidence": 0.9},
+    {"a_col": "trade_id", "b_col": "tid", "confidence": 0.6},
+]
+
+
+def test_unique_overlapping_id_is_ranked_first():
+    df_a, df_b = _frames()
+    ranked = rank_join_keys(MATCHES, profile_dataframe(df_a), profile_dataframe(df_b))
+    best = ranked[0]
+    assert best.pairs == [("trade_id", "tid")]
+    assert best.uniqueness_a > 0.95 and best.uniqueness_b > 0.95
+    assert 0.75 <= best.containment <= 1.0
+    assert all(c.score < best.score for c in ranked[1:])
+
+
+def test_composite_key_when_no_single_column_is_unique():
+    n = 2_000
+    df_a = pd.DataFrame({"acct": np.repeat(np.arange(n // 4), 4), "leg": np.tile(np.arange(4), n // 4)})
+    df_b = df_a.rename(columns={"acct": "account", "leg": "leg_no"}).sample(frac=1.0, random_state=1)
+    matches = [{"a_col": "acct", "b_col": "account"}, {"a_col": "leg", "b_col": "leg_no"}]
+    ranked = rank_join_keys(matches, profile_dataframe(df_a), profile_dataframe(df_b))
+    assert ranked[0].pairs == [("acct", "account"), ("leg", "leg_no")]
+    assert rank_join_keys(matches, profile_dataframe(df_a), profile_dataframe(df_b), allow_composite=False)[0].pairs != ranked[0].pairs
@@ -0,0 +1,61 @@
+# tests/test_json_stream.py
+
+import threading
+
+from backend.utils.json_stream import JSONArrayStream, stream_json_array
+
+TEXT = 'Sure, here you go:\n```json\n[{"a": 1, "s": "x, ]}"}, {"a": 2}, {"a": 3}]\n```\nLet me know [1]!'
+
+
+def test_elements_are_emitted_across_arbitrary_chunk_splits():
+    for size in (1, 2, 3, 7, len(TEXT)):
+        p = JSONArrayStream()
+        items = []
+        for i in range(0, len(TEXT), size):
+            items.extend(p.feed(TEXT[i:i + size]))
+        assert items == [{"a": 1, "s": "x, ]}"}, {"a": 2}, {"a": 3}]
+        assert p.done
+
+
+def test_elements_are_emitted_as_soon_as_they_close():
+    p = JSONArrayStream()
+    assert p.feed('[{"a": 1}, {"a"') == [{"a": 1}]
+    assert p.feed(': 2}') == [{"a": 2}]
+
+
+def test_inner_array_of_a_wrapping_object():
+    p = JSONArrayStream()
+    assert p.feed('{"pairs": [{"left": "x"}, {"left": "y"}]}') == [{"left": "x"}, {"left": "y"}]
+
+
+def test_truncated_array_keeps_the_completed_elements():
+    p = JSONArrayStream()
+    assert p.feed('[{"a": 1}, {"a": 2}, {"a": ') == [{"a": 1}, {"a": 2}]
+    assert not p.done
+
+
+def test_malformed_element_is_skipped():
+    p = JSONArrayStream()
+    assert p.feed('[{"a": 1}, {a: 2}, {"a": 3}]') == [{"a": 1}, {"a": 3}]
+
+
+def test_stream_json_array_keeps_items_of_a_truncated_completion():
+    res = stream_json_array(iter(['[{"a": 1},', ' {"a": 2}, {"a"']))
+    assert res.items == [{"a": 1}, {"a": 2}]
+    assert res.complete and res.error is None
+
+
+def test_stream_json_array_returns_partial_items_at_the_deadline():
+    release = threading.Event()
+
+    def stalled():
+        yield '[{"a": 1}, '
+        release.wait(5)
+        yield '{"a": 2}]'
+
+    try:
+        res = stream_json_array(stalled(), deadline_s=0.2)
+    finally:
+        release.set()
+    assert res.items == [{"a": 1}]
+    assert not res.complete
@@ -0,0 +1,61 @@
+# tests/test_mapping_cache.py
+
+import time
+
+from backend.utils.mapping_cache import ORIGIN_APPROVED, ORIGIN_MAPPER, MappingCache
+
+MAPPING = {"matches": [{"a_col": "id", "b_col": "rid", "confidence": 0.9}], "provenance": {"key": "k"}}
+OTHER = {"matches": [{"a_col": "id", "b_col": "other", "confidence": 0.5}]}
+
+
+def test_roundtrip_drops_provenance_and_counts_hits(tmp_path):
+    cache = MappingCache(str(tmp_path / "m.sqlite"), ttl_s=60, max_entries=10)
+    assert cache.get("k") is None
+    cache.put("k", MAPPING)
+    hit = cache.get("k")
+    assert hit["mapping"] == {"matches": MAPPING["matches"]}
+    assert hit["origin"] == ORIGIN_MAPPER and hit["hits"] == 1
+    assert cache.get("k")["hits"] == 2
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    cache = MappingCache(str(tmp_path / "m.sqlite"), ttl_s=0.2, max_entries=10)
+    cache.put("k", MAPPING)
+    assert cache.get("k") is not None
+    time.sleep(0.3)
+    assert cache.get("k") is None
+    # expired rows are deleted, not just hidden
+    cache.ttl_s = 60
+    assert cache.get("k") is None
+
+
+def test_mapper_output_never_overwrites_an_approved_mapping(tmp_path):
+    cache = MappingCache(str(tmp_path / "m.sqlite"), ttl_s=60, max_entries=10)
+    cache.put("k", MAPPING, origin=ORIGIN_APPROVED)
+    cache.put("k", OTHER, origin=ORIGIN_MAPPER)
+    hit = cache.get("k")
+    assert hit["origin"] == ORIGIN_APPROVED
+    assert hit["mapping"]["matches"] == MAPPING["matches"]
+    # a newer approval does replace it
+    cache.put("k", OTHER, origin=ORIGIN_APPROVED)
+    assert cache.get("k")["mapping"] == OTHER
+
+
+def test_expired_approval_can_be_replaced_by_the_mapper(tmp_path):
+    cache = MappingCache(str(tmp_path / "m.sqlite"), ttl_s=0.2, max_entries=10)
+    cache.put("k", MAPPING, origin=ORIGIN_APPROVED)
+    time.sleep(0.3)
+    cache.put("k", OTHER, origin=ORIGIN_MAPPER)
+    assert cache.get("k")["origin"] == ORIGIN_MAPPER
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = MappingCache(str(tmp_path / "m.sqlite"), ttl_s=60, max_entries=2)
+    for key in ("a", "b"):
+        cache.put(key, OTHER)
+        time.sleep(0.01)
+    cache.get("a")
+    time.sleep(0.01)
+    cache.put("c", OTHER)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
@@ -0,0 +1,50 @@
+# tests/test_sketches.py
+
+import numpy as np
+import pandas as pd
+
+from backend.utils.sketches import HyperLogLog, MinHash, estimate_overlap
+
+
+def _ids(start, stop):
+    return pd.Series([f"id-{i}" for i in range(start, stop)])
+
+
+def test_hll_count_is_within_error_bounds():
+    # p=12: ~1.6% standard error; 5% is about three sigma
+    for n in (100, 1_000, 10_000, 100_000):
+        est = HyperLogLog(12).update(_ids(0, n)).count()
+        assert abs(est - n) <= max(2, 0.05 * n), (n, est)
+
+
+def test_hll_ignores_duplicates_and_merges_like_a_union():
+    a = HyperLogLog(12).update(pd.concat([_ids(0, 20_000)] * 3))
+    b = HyperLogLog(12).update(_ids(10_000, 30_000))
+    assert abs(a.count() - 20_000) <= 1_000
+    assert abs(a.merge(b).count() - 30_000) <= 1_500
+
+
+def test_minhash_jaccard_is_within_error_bounds():
+    # 128 bins: standard error sqrt(J(1-J)/128) <= 0.045; 0.15 is over three sigma
+    n = 20_000
+    for shared in (0.0, 0.25, 0.5, 0.9, 1.0):
+        k = int(n * shared)
+        a = MinHash(128).update(_ids(0, n))
+        b = MinHash(128).update(_ids(n - k, 2 * n - k))
+        truth = k / (2 * n - k)
+        assert abs(a.jaccard(b) - truth) <= 0.15, (shared, a.jaccard(b), truth)
+
+
+def test_estimate_overlap_recovers_the_intersection():
+    a = MinHash(128).update(_ids(0, 10_000))
+    b = MinHash(128).update(_ids(5_000, 25_000))
+    inter = estimate_overlap(a.jaccard(b), 10_000, 20_000)
+    assert abs(inter - 5_000) <= 1_500
+    assert estimate_overlap(0.0, 10, 10) == 0.0
+
+
+def test_minhash_of_an_empty_set_overlaps_nothing():
+    a = MinHash(128)
+    b = MinHash(128).update(_ids(0, 100))
+    assert a.is_empty() and a.jaccard(b) == 0.0
+    assert np.array_equal(a.merge(b).signature, b.signature)